@@ -12,6 +12,7 @@ from kivy.uix.gridlayout import GridLayout
 from kivy.uix.scrollview import ScrollView
 from kivy.core.window import Window
 from kivy.metrics import dp
+from kivy.clock import Clock
 from kivy.uix.spinner import Spinner
 
 os.makedirs('data/images', exist_ok=True)
@@ -23,12 +24,24 @@ from models.diagnosis import diagnosis_catalog
 from utils.db_manager import DBManager
 from utils.game_state import GameState
 
+def _update_text_widths(window, width, height):
+    global TEXT_WIDTH, TEXT_WIDTH_70
+    TEXT_WIDTH = width - dp(40)
+    TEXT_WIDTH_70 = width * 0.7 - dp(20)
+
+
+# Label wrap widths shared by the list screens, refreshed on window resize
 try:
     Window.size = (800, 600)
     Window.clearcolor = (0.9, 0.9, 0.9, 1)
+    TEXT_WIDTH = Window.width - dp(40)
+    TEXT_WIDTH_70 = Window.width * 0.7 - dp(20)
+    Window.bind(on_resize=_update_text_widths)
 except AttributeError:
-    # window not available in headless environment
-    pass
+    # window not available in headless environment; use the 800x600 default
+    TEXT_WIDTH = dp(760)
+    TEXT_WIDTH_70 = dp(540)
+
 # Try to register default system fonts if they exist
 try:
     # Common font locations by OS
@@ -148,11 +161,13 @@ class MainMenuScreen(Screen):
         self.rect.size = instance.size
     
     def go_to_specialization(self, instance):
+        App.get_running_app().ensure_screen('specialization')
         self.manager.get_screen('specialization').reset()
         self.manager.current = 'specialization'
     
     def go_to_login(self, instance):
         app = App.get_running_app()
+        app.ensure_screen('dashboard')
         if hasattr(app, 'current_user') and app.current_user:
             # If already logged in, go to dashboard
             self.manager.get_screen('dashboard').update_for_user(app.current_user)
@@ -164,6 +179,7 @@ class MainMenuScreen(Screen):
             self.manager.current = 'login'
     
     def go_to_about(self, instance):
+        App.get_running_app().ensure_screen('about')
         self.manager.current = 'about'
     
     def quit_app(self, instance):
@@ -627,7 +643,7 @@ class TestsScreen(Screen):
                 font_size=16,
                 size_hint_x=0.7,
                 halign='left',
-                text_size=(Window.width * 0.7 - dp(20), dp(50)),
+                text_size=(TEXT_WIDTH_70, dp(50)),
                 color=(0.2, 0.2, 0.2, 1), #Dark gray text
             )
             test_box.add_widget(test_label)
@@ -709,7 +725,7 @@ class TestResultsScreen(Screen):
         
         # Add scrollable content
         scroll_view = ScrollView(size_hint=(1, 0.8))
-        self.results_layout = GridLayout(cols=1, spacing=10, size_hint_y=None)
+        self.results_layout = BoxLayout(orientation='vertical', spacing=10, size_hint_y=None)
         self.results_layout.bind(minimum_height=self.results_layout.setter('height'))
         scroll_view.add_widget(self.results_layout)
         layout.add_widget(scroll_view)
@@ -761,7 +777,7 @@ class TestResultsScreen(Screen):
                 size_hint_y=None,
                 height=dp(40),
                 halign='left',
-                text_size=(Window.width - dp(40), None)
+                text_size=(TEXT_WIDTH, None)
             )
             self.results_layout.add_widget(details_title)
             
@@ -814,7 +830,7 @@ class TestResultsScreen(Screen):
                 size_hint_y=None,
                 height=dp(40),
                 halign='left',
-                text_size=(Window.width - dp(40), None)
+                text_size=(TEXT_WIDTH, None)
             )
             self.results_layout.add_widget(interp_title)
             
@@ -823,7 +839,7 @@ class TestResultsScreen(Screen):
                 font_size=14,
                 size_hint_y=None,
                 halign='left',
-                text_size=(Window.width - dp(40), None)
+                text_size=(TEXT_WIDTH, None)
             )
             interp_label.bind(texture_size=interp_label.setter('size'))
             self.results_layout.add_widget(interp_label)
@@ -847,7 +863,7 @@ class TestResultsScreen(Screen):
                 size_hint_y=None,
                 height=dp(40),
                 halign='left',
-                text_size=(Window.width - dp(40), None)
+                text_size=(TEXT_WIDTH, None)
             )
             self.results_layout.add_widget(rec_title)
             
@@ -857,7 +873,7 @@ class TestResultsScreen(Screen):
                     font_size=14,
                     size_hint_y=None,
                     halign='left',
-                    text_size=(Window.width - dp(40), None)
+                    text_size=(TEXT_WIDTH, None)
                 )
                 rec_label.bind(texture_size=rec_label.setter('size'))
                 self.results_layout.add_widget(rec_label)
@@ -887,7 +903,7 @@ class TreatmentsScreen(Screen):
         
         # Create a scrollview for treatments
         scroll_view = ScrollView(size_hint=(1, 0.8))
-        self.treatments_layout = GridLayout(cols=1, spacing=10, size_hint_y=None)
+        self.treatments_layout = BoxLayout(orientation='vertical', spacing=10, size_hint_y=None)
         self.treatments_layout.bind(minimum_height=self.treatments_layout.setter('height'))
         scroll_view.add_widget(self.treatments_layout)
         layout.add_widget(scroll_view)
@@ -922,7 +938,7 @@ class TreatmentsScreen(Screen):
                 font_size=16,
                 size_hint_x=0.7,
                 halign='left',
-                text_size=(Window.width * 0.7 - dp(20), dp(50))
+                text_size=(TEXT_WIDTH_70, dp(50))
             )
             treatment_box.add_widget(treatment_label)
             
@@ -995,7 +1011,7 @@ class TreatmentResultsScreen(Screen):
         
         # Add scrollable content
         scroll_view = ScrollView(size_hint=(1, 0.8))
-        self.results_layout = GridLayout(cols=1, spacing=10, size_hint_y=None)
+        self.results_layout = BoxLayout(orientation='vertical', spacing=10, size_hint_y=None)
         self.results_layout.bind(minimum_height=self.results_layout.setter('height'))
         scroll_view.add_widget(self.results_layout)
         layout.add_widget(scroll_view)
@@ -1054,7 +1070,7 @@ class TreatmentResultsScreen(Screen):
                     font_size=14,
                     size_hint_y=None,
                     halign='left',
-                    text_size=(Window.width - dp(40), None)
+                    text_size=(TEXT_WIDTH, None)
                 )
                 effect_label.bind(texture_size=effect_label.setter('size'))
                 self.results_layout.add_widget(effect_label)
@@ -1075,7 +1091,7 @@ class TreatmentResultsScreen(Screen):
                     font_size=14,
                     size_hint_y=None,
                     halign='left',
-                    text_size=(Window.width - dp(40), None)
+                    text_size=(TEXT_WIDTH, None)
                 )
                 vital_label.bind(texture_size=vital_label.setter('size'))
                 self.results_layout.add_widget(vital_label)
@@ -1110,13 +1126,13 @@ class DiagnosisScreen(Screen):
             size_hint_y=None,
             height=dp(30),
             halign='left',
-            text_size=(Window.width - dp(40), None)
+            text_size=(TEXT_WIDTH, None)
         )
         layout.add_widget(instructions)
         
         # Create a scrollview for diagnoses
         scroll_view = ScrollView(size_hint=(1, 0.7))
-        self.diagnoses_layout = GridLayout(cols=1, spacing=10, size_hint_y=None)
+        self.diagnoses_layout = BoxLayout(orientation='vertical', spacing=10, size_hint_y=None)
         self.diagnoses_layout.bind(minimum_height=self.diagnoses_layout.setter('height'))
         scroll_view.add_widget(self.diagnoses_layout)
         layout.add_widget(scroll_view)
@@ -1181,7 +1197,7 @@ class DiagnosisScreen(Screen):
                     font_size=16,
                     halign='left',
                     size_hint_y=0.6,
-                    text_size=(Window.width * 0.7 - dp(20), None)
+                    text_size=(TEXT_WIDTH_70, None)
                 )
                 diag_info.add_widget(diag_name)
                 
@@ -1190,7 +1206,7 @@ class DiagnosisScreen(Screen):
                     font_size=14,
                     halign='left',
                     size_hint_y=0.4,
-                    text_size=(Window.width * 0.7 - dp(20), None),
+                    text_size=(TEXT_WIDTH_70, None),
                     color=(0.2, 0.7, 0.2, 1) if confidence > 0.5 else (0.7, 0.7, 0.2, 1)
                 )
                 diag_info.add_widget(diag_conf)
@@ -1228,7 +1244,7 @@ class DiagnosisScreen(Screen):
                     font_size=16,
                     halign='left',
                     size_hint_x=0.7,
-                    text_size=(Window.width * 0.7 - dp(20), dp(50))
+                    text_size=(TEXT_WIDTH_70, dp(50))
                 )
                 diag_box.add_widget(diag_name)
                 
@@ -1318,7 +1334,7 @@ class DiagnosisResultsScreen(Screen):
         
         # Add scrollable content
         scroll_view = ScrollView(size_hint=(1, 0.8))
-        self.results_layout = GridLayout(cols=1, spacing=10, size_hint_y=None)
+        self.results_layout = BoxLayout(orientation='vertical', spacing=10, size_hint_y=None)
         self.results_layout.bind(minimum_height=self.results_layout.setter('height'))
         scroll_view.add_widget(self.results_layout)
         layout.add_widget(scroll_view)
@@ -1355,7 +1371,7 @@ class DiagnosisResultsScreen(Screen):
             text=diagnosis.description,
             font_size=14,
             halign='left',
-            text_size=(Window.width - dp(40), None)
+            text_size=(TEXT_WIDTH, None)
         )
         desc_label.bind(texture_size=desc_label.setter('size'))
         desc_box.add_widget(desc_label)
@@ -1369,7 +1385,7 @@ class DiagnosisResultsScreen(Screen):
                 font_size=16,
                 size_hint_y=None,
                 halign='left',
-                text_size=(Window.width - dp(40), None),
+                text_size=(TEXT_WIDTH, None),
                 color=(0.2, 0.8, 0.2, 1)
             )
             correct_label.bind(texture_size=correct_label.setter('size'))
@@ -1380,7 +1396,7 @@ class DiagnosisResultsScreen(Screen):
                 font_size=16,
                 size_hint_y=None,
                 halign='left',
-                text_size=(Window.width - dp(40), None),
+                text_size=(TEXT_WIDTH, None),
                 color=(0.8, 0.2, 0.2, 1)
             )
             incorrect_label.bind(texture_size=incorrect_label.setter('size'))
@@ -1393,7 +1409,7 @@ class DiagnosisResultsScreen(Screen):
             size_hint_y=None,
             height=dp(40),
             halign='left',
-            text_size=(Window.width - dp(40), None)
+            text_size=(TEXT_WIDTH, None)
         )
         self.results_layout.add_widget(actions_title)
         
@@ -1405,7 +1421,7 @@ class DiagnosisResultsScreen(Screen):
                 size_hint_y=None,
                 height=dp(30),
                 halign='left',
-                text_size=(Window.width - dp(40), None)
+                text_size=(TEXT_WIDTH, None)
             )
             self.results_layout.add_widget(tests_title)
             
@@ -1422,7 +1438,7 @@ class DiagnosisResultsScreen(Screen):
                     size_hint_y=None,
                     height=dp(20),
                     halign='left',
-                    text_size=(Window.width - dp(40), None)
+                    text_size=(TEXT_WIDTH, None)
                 )
                 self.results_layout.add_widget(test_label)
         
@@ -1434,7 +1450,7 @@ class DiagnosisResultsScreen(Screen):
                 size_hint_y=None,
                 height=dp(30),
                 halign='left',
-                text_size=(Window.width - dp(40), None)
+                text_size=(TEXT_WIDTH, None),
                 color = (0, 0, 0, 1)  # Set text color to black
             )
             self.results_layout.add_widget(treatments_title)
@@ -1446,7 +1462,7 @@ class DiagnosisResultsScreen(Screen):
                     size_hint_y=None,
                     height=dp(20),
                     halign='left',
-                    text_size=(Window.width - dp(40), None),
+                    text_size=(TEXT_WIDTH, None),
                     # Some place in hierarhy defines white for text color
                     color=(0, 0, 0, 1)  # Set text color to black
                 )
@@ -1484,31 +1500,63 @@ class VirtualDoctorApp(App):
         print("Loading medical conditions into database...")
         DBManager.initialize_conditions()
         
+        # Only the first screen is built here; the rest are added in stages
+        # from on_start so the main menu is shown without waiting for them
         sm = ScreenManager()
         sm.add_widget(MainMenuScreen(name='main_menu'))
-        sm.add_widget(AboutScreen(name='about'))
-        sm.add_widget(SpecializationScreen(name='specialization'))
-        sm.add_widget(PatientScreen(name='patient'))
-        sm.add_widget(TestsScreen(name='tests'))
-        sm.add_widget(TestResultsScreen(name='test_results'))
-        sm.add_widget(TreatmentsScreen(name='treatments'))
-        sm.add_widget(TreatmentResultsScreen(name='treatment_results'))
-        sm.add_widget(DiagnosisScreen(name='diagnosis'))
-        sm.add_widget(DiagnosisResultsScreen(name='diagnosis_results'))
+        self.screen_manager = sm
         
+        print("VirtualDoctor app initialized with PostgreSQL database")
+        return sm
 
+    def on_start(self):
+        self._load_phases = [
+            self._add_account_screens,
+            self._add_game_screens,
+            self._add_result_screens,
+        ]
+        Clock.schedule_once(self._run_next_phase, 0)
+    
+    def _run_next_phase(self, dt):
+        """Build one group of screens per frame until all are added"""
+        if not self._load_phases:
+            return
+        self._load_phases.pop(0)()
+        if self._load_phases:
+            Clock.schedule_once(self._run_next_phase, 0)
+    
+    def ensure_screen(self, name):
+        """Build the pending screen groups right away until the named screen exists"""
+        while not self.screen_manager.has_screen(name) and self._load_phases:
+            self._load_phases.pop(0)()
+    
+    def _add_account_screens(self):
         from screens.login_screen import LoginScreen
         from screens.register_screen import RegisterScreen
         from screens.dashboard_screen import DashboardScreen
-        from screens.medications_screen import MedicationsScreen
         
+        sm = self.screen_manager
+        sm.add_widget(AboutScreen(name='about'))
         sm.add_widget(LoginScreen(name='login'))
         sm.add_widget(RegisterScreen(name='register'))
         sm.add_widget(DashboardScreen(name='dashboard'))
-        sm.add_widget(MedicationsScreen(name='medications'))
+    
+    def _add_game_screens(self):
+        sm = self.screen_manager
+        sm.add_widget(SpecializationScreen(name='specialization'))
+        sm.add_widget(PatientScreen(name='patient'))
+        sm.add_widget(TestsScreen(name='tests'))
+        sm.add_widget(TreatmentsScreen(name='treatments'))
+        sm.add_widget(DiagnosisScreen(name='diagnosis'))
+    
+    def _add_result_screens(self):
+        from screens.medications_screen import MedicationsScreen
         
-        print("VirtualDoctor app initialized with PostgreSQL database")
-        return sm
+        sm = self.screen_manager
+        sm.add_widget(TestResultsScreen(name='test_results'))
+        sm.add_widget(TreatmentResultsScreen(name='treatment_results'))
+        sm.add_widget(DiagnosisResultsScreen(name='diagnosis_results'))
+        sm.add_widget(MedicationsScreen(name='medications'))
 
 
 if __name__ == '__main__':
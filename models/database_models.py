@@ -278,7 +278,7 @@ class GameProgress(Base):
     __tablename__ = 'game_progress'
     
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
     doctor_id = Column(Integer, ForeignKey('doctors.id'), nullable=False)
     level = Column(Integer, default=1)
     score = Column(Integer, default=0)
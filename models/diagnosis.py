@@ -32,6 +32,11 @@ class Diagnosis:
         self.recommended_tests = recommended_tests or []
         self.recommended_treatments = recommended_treatments or []
         self.severity = max(1, min(10, severity))  # Ensure severity is between 1-10
+        
+        # Set views used by DiagnosisManager.match_diagnosis for fast intersections
+        self.primary_symptoms_set = frozenset(self.primary_symptoms)
+        self.secondary_symptoms_set = frozenset(self.secondary_symptoms)
+        self.recommended_tests_set = frozenset(self.recommended_tests)
     
     def to_dict(self) -> Dict:
         """Convert diagnosis to dictionary for storage."""
@@ -193,21 +198,22 @@ class DiagnosisManager:
         if not symptoms:
             return []
         
-        tests_performed = tests_performed or []
+        symptom_set = frozenset(symptoms)
+        test_set = frozenset(tests_performed or ())
         matches = []
         
+        # Weights for different types of matches
+        primary_weight = 3.0
+        secondary_weight = 1.0
+        test_weight = 2.0
+        
         for diagnosis in self.diagnoses.values():
             # Calculate symptom match score
-            primary_matches = sum(1 for s in diagnosis.primary_symptoms if s in symptoms)
-            secondary_matches = sum(1 for s in diagnosis.secondary_symptoms if s in symptoms)
+            primary_matches = len(diagnosis.primary_symptoms_set & symptom_set)
+            secondary_matches = len(diagnosis.secondary_symptoms_set & symptom_set)
             
             # Calculate test match score
-            test_matches = sum(1 for t in diagnosis.recommended_tests if t in tests_performed)
-            
-            # Weights for different types of matches
-            primary_weight = 3.0
-            secondary_weight = 1.0
-            test_weight = 2.0
+            test_matches = len(diagnosis.recommended_tests_set & test_set)
             
             # Total possible score
             total_possible = (len(diagnosis.primary_symptoms) * primary_weight +
@@ -221,7 +227,7 @@ class DiagnosisManager:
                 
                 # Calculate test confidence if tests were performed
                 test_confidence = 0.0
-                if diagnosis.recommended_tests and tests_performed:
+                if diagnosis.recommended_tests and test_set:
                     test_score = test_matches * test_weight
                     test_possible = len(diagnosis.recommended_tests) * test_weight
                     test_confidence = test_score / test_possible
@@ -1,9 +1,23 @@
+import json
+from operator import attrgetter
 from typing import Dict, List
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Plain fields copied by Doctor.to_dict, read in one attrgetter call
+_DOCTOR_FIELDS = ('name', 'experience', 'patients_treated', 'successful_diagnoses', 'score')
+_get_doctor_fields = attrgetter(*_DOCTOR_FIELDS)
+
 class Specialization:
     """
     Represents a medical specialization with its own set of capabilities and expertise.
     """
+    __slots__ = ('name', 'description', 'available_tests', 'available_treatments',
+                 '_tests_set', '_treatments_set')
+    
     def __init__(self, name: str, description: str, available_tests: List[str], available_treatments: List[str]):
         """
         Initialize a medical specialization.
@@ -18,6 +32,18 @@ class Specialization:
         self.description = description
         self.available_tests = available_tests
         self.available_treatments = available_treatments
+        
+        # Set views for O(1) capability checks; the sequences above keep their order for display
+        self._tests_set = frozenset(available_tests)
+        self._treatments_set = frozenset(available_treatments)
+    
+    def has_test(self, test_name: str) -> bool:
+        """Check if this specialization offers a specific test."""
+        return test_name in self._tests_set
+    
+    def has_treatment(self, treatment_name: str) -> bool:
+        """Check if this specialization offers a specific treatment."""
+        return treatment_name in self._treatments_set
     
     def to_dict(self) -> Dict:
         """Convert specialization to dictionary for storage or transmission."""
@@ -43,6 +69,9 @@ class Doctor:
     """
     Represents the player character as a doctor with specialized skills and experience.
     """
+    __slots__ = ('name', 'specialization', '_experience', '_score_delta_correct',
+                 'patients_treated', 'successful_diagnoses', 'score')
+    
     def __init__(self, name: str, specialization: Specialization = None, experience: int = 1):
         """
         Initialize a doctor character.
@@ -54,11 +83,21 @@ class Doctor:
         """
         self.name = name
         self.specialization = specialization
-        self.experience = max(1, min(5, experience))  # Ensure experience is between 1-5
+        self.experience = experience
         self.patients_treated = 0
         self.successful_diagnoses = 0
         self.score = 0
     
+    @property
+    def experience(self) -> int:
+        """Experience level (1-5, with 5 being highest)"""
+        return self._experience
+    
+    @experience.setter
+    def experience(self, value: int) -> None:
+        self._experience = max(1, min(5, value))  # Ensure experience is between 1-5
+        self._score_delta_correct = 100 * self._experience  # More points for higher experience
+    
     def get_success_rate(self) -> float:
         """Calculate success rate based on diagnoses and patients treated."""
         if self.patients_treated == 0:
@@ -69,13 +108,13 @@ class Doctor:
         """Check if the doctor can perform a specific test based on specialization."""
         if not self.specialization:
             return False
-        return test_name in self.specialization.available_tests
+        return self.specialization.has_test(test_name)
     
     def can_perform_treatment(self, treatment_name: str) -> bool:
         """Check if the doctor can perform a specific treatment based on specialization."""
         if not self.specialization:
             return False
-        return treatment_name in self.specialization.available_treatments
+        return self.specialization.has_treatment(treatment_name)
     
     def diagnose_patient(self, correct_diagnosis: bool) -> None:
         """
@@ -87,7 +126,7 @@ class Doctor:
         self.patients_treated += 1
         if correct_diagnosis:
             self.successful_diagnoses += 1
-            self.score += 100 * self.experience  # More points for higher experience
+            self.score += self._score_delta_correct
         else:
             self.score -= 50  # Penalty for incorrect diagnosis
     
@@ -102,16 +141,16 @@ class Doctor:
     
     def to_dict(self) -> Dict:
         """Convert doctor to dictionary for storage or transmission."""
-        specialization_dict = self.specialization.to_dict() if self.specialization else None
-        
-        return {
-            'name': self.name,
-            'specialization': specialization_dict,
-            'experience': self.experience,
-            'patients_treated': self.patients_treated,
-            'successful_diagnoses': self.successful_diagnoses,
-            'score': self.score
-        }
+        data = dict(zip(_DOCTOR_FIELDS, _get_doctor_fields(self)))
+        data['specialization'] = self.specialization.to_dict() if self.specialization else None
+        return data
+    
+    def to_json(self) -> str:
+        """Serialize doctor to a JSON string, using orjson when it is installed."""
+        data = self.to_dict()
+        if orjson is not None:
+            return orjson.dumps(data).decode('utf-8')
+        return json.dumps(data)
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'Doctor':
@@ -133,7 +172,64 @@ class Doctor:
         return doctor
 
 
-# Define standard specializations
+# Define standard specializations, built once at import time.
+# Test/treatment lists are tuples so the shared instances stay immutable.
+_SPECIALIZATIONS = (
+    Specialization(
+        name="General Practice",
+        description="Non-specialized medicine focusing on whole-person care. "
+                    "Can perform basic examinations and treatments.",
+        available_tests=(
+            "Physical Examination", "Basic Blood Test", "Vital Signs", 
+            "Urinalysis", "Blood Pressure"
+        ),
+        available_treatments=(
+            "Pain Relief", "Antibiotics", "IV Fluids", "Wound Care",
+            "Oxygen Therapy"
+        )
+    ),
+    Specialization(
+        name="Cardiology",
+        description="Specializes in disorders of the heart and circulatory system. "
+                    "Expert in heart-related diagnostics and treatments.",
+        available_tests=(
+            "ECG/EKG", "Echocardiogram", "Stress Test", "Cardiac Enzyme Test",
+            "Blood Pressure", "Cholesterol Panel"
+        ),
+        available_treatments=(
+            "Beta-blockers", "ACE Inhibitors", "Anticoagulants", "Statins",
+            "Defibrillation", "CPR"
+        )
+    ),
+    Specialization(
+        name="Neurology",
+        description="Focuses on the nervous system including the brain and spinal cord. "
+                    "Specializes in neurological disorders and injuries.",
+        available_tests=(
+            "Neurological Examination", "CT Scan", "MRI", "EEG",
+            "Lumbar Puncture", "Reflex Test"
+        ),
+        available_treatments=(
+            "Anticonvulsants", "Pain Management", "Anti-inflammatory Drugs",
+            "Physical Therapy Recommendations", "Cognitive Therapy"
+        )
+    ),
+    Specialization(
+        name="Emergency Medicine",
+        description="Specializes in acute illnesses and injuries requiring immediate attention. "
+                    "Trained to handle a wide variety of emergency situations.",
+        available_tests=(
+            "Trauma Assessment", "Rapid Blood Tests", "X-Ray", "CT Scan",
+            "Toxicology Screen", "Vital Signs Monitoring"
+        ),
+        available_treatments=(
+            "Trauma Care", "Intubation", "Emergency Surgery Preparation",
+            "Defibrillation", "Drug Overdose Treatment", "CPR",
+            "Blood Transfusion", "Wound Care"
+        )
+    )
+)
+
 
 def get_available_specializations() -> List[Specialization]:
     """
@@ -142,58 +238,4 @@ def get_available_specializations() -> List[Specialization]:
     Returns:
         List of Specialization objects
     """
-    return [
-        Specialization(
-            name="General Practice",
-            description="Non-specialized medicine focusing on whole-person care. "
-                        "Can perform basic examinations and treatments.",
-            available_tests=[
-                "Physical Examination", "Basic Blood Test", "Vital Signs", 
-                "Urinalysis", "Blood Pressure"
-            ],
-            available_treatments=[
-                "Pain Relief", "Antibiotics", "IV Fluids", "Wound Care",
-                "Oxygen Therapy"
-            ]
-        ),
-        Specialization(
-            name="Cardiology",
-            description="Specializes in disorders of the heart and circulatory system. "
-                        "Expert in heart-related diagnostics and treatments.",
-            available_tests=[
-                "ECG/EKG", "Echocardiogram", "Stress Test", "Cardiac Enzyme Test",
-                "Blood Pressure", "Cholesterol Panel"
-            ],
-            available_treatments=[
-                "Beta-blockers", "ACE Inhibitors", "Anticoagulants", "Statins",
-                "Defibrillation", "CPR"
-            ]
-        ),
-        Specialization(
-            name="Neurology",
-            description="Focuses on the nervous system including the brain and spinal cord. "
-                        "Specializes in neurological disorders and injuries.",
-            available_tests=[
-                "Neurological Examination", "CT Scan", "MRI", "EEG",
-                "Lumbar Puncture", "Reflex Test"
-            ],
-            available_treatments=[
-                "Anticonvulsants", "Pain Management", "Anti-inflammatory Drugs",
-                "Physical Therapy Recommendations", "Cognitive Therapy"
-            ]
-        ),
-        Specialization(
-            name="Emergency Medicine",
-            description="Specializes in acute illnesses and injuries requiring immediate attention. "
-                        "Trained to handle a wide variety of emergency situations.",
-            available_tests=[
-                "Trauma Assessment", "Rapid Blood Tests", "X-Ray", "CT Scan",
-                "Toxicology Screen", "Vital Signs Monitoring"
-            ],
-            available_treatments=[
-                "Trauma Care", "Intubation", "Emergency Surgery Preparation",
-                "Defibrillation", "Drug Overdose Treatment", "CPR",
-                "Blood Transfusion", "Wound Care"
-            ]
-        )
-    ]
+    return list(_SPECIALIZATIONS)
@@ -1,13 +1,130 @@
 """
 Medication and drug administration models for VirtualDoctor
 """
-from typing import Dict, List, Optional, Tuple
-import random
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, ValuesView
 import json
+import sys
+import numpy as np
+from models.patient import word_tokens
+from models.rng import RNG as _RNG, uniform as _uniform
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Severity levels for side effects that do not define one
+_SEVERITIES = tuple(sys.intern(severity) for severity in ('mild', 'moderate', 'severe'))
+# Object-array view of the same interned strings, indexed with sampled ints
+_SEVERITY_ARRAY = np.array(_SEVERITIES, dtype=object)
+
+# Vital signs in the column order used by the vital-change table
+VITAL_KEYS = ('pulse', 'systolic_bp', 'diastolic_bp', 'temperature', 'respiratory_rate', 'oxygen_saturation')
+
+# Medication category -> row of _VITAL_EFFECTS (0 = no effect on vitals)
+_PAINKILLER, _ANTIBIOTIC, _ANTIHYPERTENSIVE, _BRONCHODILATOR = 1, 2, 3, 4
+_CATEGORY_CODE = {
+    'painkiller': _PAINKILLER,
+    'antibiotic': _ANTIBIOTIC,
+    'antihypertensive': _ANTIHYPERTENSIVE,
+    'bronchodilator': _BRONCHODILATOR
+}
+
+# Change in each vital per unit of effectiveness, one row per category code
+_VITAL_EFFECTS = np.array([
+    # pulse, sys, dia, temp, resp, spo2
+    [0, 0, 0, 0, 0, 0],          # other categories
+    [-5, 0, 0, -0.2, 0, 0],      # painkillers reduce temperature and pulse slightly
+    [0, 0, 0, -0.5, 0, 0],       # antibiotics reduce fever (only when the patient has one)
+    [0, -15, -10, 0, 0, 0],      # blood pressure medications reduce BP
+    [0, 0, 0, 0, -2, 3],         # bronchodilators improve SpO2 and respiration (rate only if > 16)
+], dtype=float)
+_RESPIRATORY_RATE = VITAL_KEYS.index('respiratory_rate')
+
+
+def vital_changes_as_dict(delta: np.ndarray) -> Dict[str, float]:
+    """
+    Convert a vital-change vector to the dictionary form used outside this module
+    
+    Args:
+        delta: Array of changes in VITAL_KEYS order
+        
+    Returns:
+        Dictionary of vital sign changes keyed by vital name
+    """
+    return dict(zip(VITAL_KEYS, delta.tolist()))
+
+
+def _antibiotic_adjustment(delta: np.ndarray, patient) -> None:
+    """Effective antibiotics only reduce an existing fever"""
+    if 'fever' not in patient.current_symptoms_lc:
+        delta[:] = 0.0
+
+
+def _bronchodilator_adjustment(delta: np.ndarray, patient) -> None:
+    """Bronchodilators only lower the respiratory rate when it is above 16"""
+    if patient.vital_signs.respiratory_rate <= 16:
+        delta[_RESPIRATORY_RATE] = 0.0
+
+
+# Patient-dependent corrections to a category's table row, keyed by category code
+_CATEGORY_ADJUSTMENTS = {
+    _ANTIBIOTIC: _antibiotic_adjustment,
+    _BRONCHODILATOR: _bronchodilator_adjustment
+}
+
+
+def _make_vital_delta(code: int) -> Callable[[float, object], np.ndarray]:
+    """
+    Build a vital-change function specialized for one category code
+    
+    The table row and the category's adjustment are resolved here once, so the
+    returned function has no category lookups left. Categories without any effect
+    on vitals get a function that skips the scaling and noise entirely.
+    
+    Args:
+        code: Category code from _CATEGORY_CODE
+        
+    Returns:
+        Function taking (effectiveness, patient) and returning an array of
+        changes in VITAL_KEYS order
+    """
+    effects = _VITAL_EFFECTS[code]
+    size = effects.size
+    
+    if not effects.any():
+        def vital_delta(effectiveness, patient):
+            return np.zeros(size)
+        return vital_delta
+    
+    adjust = _CATEGORY_ADJUSTMENTS.get(code)
+    uniform = _RNG.uniform
+    
+    def vital_delta(effectiveness, patient):
+        delta = effects * effectiveness
+        if adjust:
+            adjust(delta, patient)
+        
+        # Add slight randomness to make it more realistic
+        delta += uniform(-0.2, 0.2, size) * np.abs(delta)
+        return delta
+    
+    return vital_delta
+
+
+# One specialized vital-change function per category code, shared by all medications
+_VITAL_DELTA_FNS = {code: _make_vital_delta(code) for code in range(len(_VITAL_EFFECTS))}
+
 
 class Medication:
     """Represents a medication that can be administered to patients"""
     
+    __slots__ = ('name', 'category', 'description', 'dosages', 'administration_routes',
+                 'indications', 'contraindications', 'side_effects', 'interactions',
+                 '_category_code', '_vital_fn', '_indications_lc', '_indication_tokens',
+                 '_contraindication_tokens', '_se_names', '_se_probs', '_se_severities',
+                 '_cached_dict')
+    
     def __init__(self, 
                 name: str,
                 category: str,
@@ -32,19 +149,47 @@ class Medication:
             side_effects: Possible side effects with their probabilities
             interactions: Other medications this drug interacts with
         """
+        # Category and route names come from a small vocabulary, intern them so
+        # equal values share one object and compare/hash by identity
         self.name = name
-        self.category = category
+        self.category = sys.intern(category)
         self.description = description
         self.dosages = dosages
-        self.administration_routes = administration_routes
+        self.administration_routes = [sys.intern(route) for route in administration_routes]
         self.indications = indications
         self.contraindications = contraindications or []
         self.side_effects = side_effects or []
         self.interactions = interactions or []
-    
-    def to_dict(self) -> Dict:
-        """Convert medication to dictionary for storage/serialization"""
-        return {
+        
+        # Row in the vital-change table for this category
+        self._category_code = _CATEGORY_CODE.get(category.lower(), 0)
+        self._vital_fn = _VITAL_DELTA_FNS[self._category_code]
+        
+        # Lowercased indications for case-insensitive diagnosis/symptom lookups
+        self._indications_lc = tuple(indication.lower() for indication in self.indications)
+        
+        # Word sets for matching against Patient.symptom_tokens / medical_history_tokens
+        self._indication_tokens = frozenset(
+            token for indication in self.indications for token in word_tokens(indication)
+        )
+        self._contraindication_tokens = tuple(
+            frozenset(word_tokens(contra)) for contra in self.contraindications
+        )
+        
+        # Side effects as parallel columns (names, probabilities, fixed severities or None)
+        # so simulation never touches the per-effect dicts; side_effects is kept for to_dict
+        self._se_names = tuple(effect['name'] for effect in self.side_effects)
+        self._se_probs = np.fromiter(
+            (effect.get('probability', 0.1) for effect in self.side_effects),
+            dtype=np.float32, count=len(self.side_effects)
+        )
+        self._se_severities = tuple(
+            sys.intern(effect['severity']) if effect.get('severity') else None
+            for effect in self.side_effects
+        )
+        
+        # Fields are not reassigned after construction, so the serialized form is built once
+        self._cached_dict = {
             'name': self.name,
             'category': self.category,
             'description': self.description,
@@ -56,6 +201,10 @@ class Medication:
             'interactions': self.interactions
         }
     
+    def to_dict(self) -> Dict:
+        """Convert medication to dictionary for storage/serialization"""
+        return dict(self._cached_dict)
+    
     @classmethod
     def from_dict(cls, data: Dict) -> 'Medication':
         """Create a Medication from dictionary data"""
@@ -75,6 +224,16 @@ class Medication:
 class MedicationResponse:
     """Simulates a patient's response to medication"""
     
+    __slots__ = ('patient', 'medication', 'dosage', 'route')
+    
+    # Response opening by effectiveness bucket, checked from the highest threshold down
+    _RESPONSE_TEMPLATES = (
+        (0.8, "The patient responds very well to {}. Symptoms are significantly improving."),
+        (0.5, "The patient shows moderate improvement after receiving {}. "),
+        (0.2, "The patient shows slight improvement after receiving {}. "),
+    )
+    _MINIMAL_RESPONSE = "The patient shows minimal response to {}. "
+    
     def __init__(self, patient, medication, dosage, route):
         """
         Initialize a medication response simulator
@@ -112,10 +271,50 @@ class MedicationResponse:
         return {
             'effectiveness': effectiveness,
             'side_effects': side_effects,
-            'vital_changes': vital_changes,
+            'vital_changes': vital_changes_as_dict(vital_changes),
             'response_text': response_text
         }
     
+    def simulate_batch(self, n: int) -> Dict:
+        """
+        Run n independent Monte Carlo trials of this response in one vectorized pass
+        
+        Args:
+            n: Number of trials to simulate
+            
+        Returns:
+            Dictionary with per-trial effectiveness, a trials x side-effects occurrence
+            mask and the matching side effect names/severities
+        """
+        medication = self.medication
+        k = len(medication._se_names)
+        
+        # Effectiveness: fixed patient/medication part plus per-trial noise
+        effectiveness = np.clip(
+            self._base_effectiveness() + _RNG.uniform(-0.1, 0.1, n), 0.0, 1.0
+        )
+        
+        # Side effects: one draw for every (trial, effect) pair
+        probs = medication._se_probs
+        if self.patient.age > 65:
+            probs = probs * 1.5
+        occurred = _RNG.random((n, k)) < probs
+        
+        # Effects without a fixed severity get one sampled per trial
+        severities = np.empty((n, k), dtype=object)
+        for j, severity in enumerate(medication._se_severities):
+            if severity:
+                severities[:, j] = severity
+            else:
+                severities[:, j] = _SEVERITY_ARRAY[_RNG.integers(len(_SEVERITIES), size=n)]
+        
+        return {
+            'effectiveness': effectiveness,
+            'side_effect_names': list(medication._se_names),
+            'side_effects_occurred': occurred,
+            'side_effect_severities': severities
+        }
+    
     def _calculate_effectiveness(self) -> float:
         """
         Calculate how effective the medication is for the patient's condition
@@ -123,35 +322,42 @@ class MedicationResponse:
         Returns:
             Effectiveness score between 0.0 (not effective) and 1.0 (very effective)
         """
+        effectiveness = self._base_effectiveness()
+        
+        # Add some randomness (±0.1)
+        effectiveness += _uniform(-0.1, 0.1)
+        
+        # Ensure effectiveness is between 0 and 1
+        return max(0.0, min(1.0, effectiveness))
+    
+    def _base_effectiveness(self) -> float:
+        """
+        Deterministic part of the effectiveness score, before randomness and clamping
+        
+        Returns:
+            Unclamped effectiveness score
+        """
         # Base effectiveness - moderate
         effectiveness = 0.5
         
+        indications_lc = self.medication._indications_lc
+        
         # If the patient has a diagnosis and it's in the medication's indications, increase effectiveness
-        if self.patient.diagnosis and any(indication.lower() in self.patient.diagnosis.lower() 
-                                        for indication in self.medication.indications):
-            effectiveness += 0.3
-        
-        # If the patient has symptoms matching the medication's indications, increase effectiveness
-        symptom_match = False
-        for symptom in self.patient.current_symptoms:
-            for indication in self.medication.indications:
-                if symptom.lower() in indication.lower():
-                    symptom_match = True
-                    break
-        
-        if symptom_match:
+        if self.patient.diagnosis:
+            diagnosis_lc = self.patient.diagnosis.lower()
+            if any(indication in diagnosis_lc for indication in indications_lc):
+                effectiveness += 0.3
+        
+        # If the patient has symptoms sharing a word with the medication's indications, increase effectiveness
+        if not self.patient.symptom_tokens.isdisjoint(self.medication._indication_tokens):
             effectiveness += 0.2
         
-        # If the patient has contraindications, decrease effectiveness
-        if any(contraindication.lower() in self.patient.medical_history 
-               for contraindication in self.medication.contraindications):
+        # If every word of a contraindication appears in the patient's history, decrease effectiveness
+        history_tokens = self.patient.medical_history_tokens
+        if any(tokens and tokens <= history_tokens for tokens in self.medication._contraindication_tokens):
             effectiveness -= 0.4
         
-        # Add some randomness (±0.1)
-        effectiveness += random.uniform(-0.1, 0.1)
-        
-        # Ensure effectiveness is between 0 and 1
-        return max(0.0, min(1.0, effectiveness))
+        return effectiveness
     
     def _simulate_side_effects(self) -> List[Dict]:
         """
@@ -160,27 +366,31 @@ class MedicationResponse:
         Returns:
             List of side effects experienced
         """
-        experienced_effects = []
+        medication = self.medication
+        probs = medication._se_probs
         
-        for effect in self.medication.side_effects:
-            # Each side effect has a probability, check if it occurs
-            probability = effect.get('probability', 0.1)
-            
-            # Adjust probability based on patient factors
-            # For example, elderly patients might be more susceptible
-            if self.patient.age > 65:
-                probability *= 1.5
-            
-            # Check if side effect occurs
-            if random.random() < probability:
-                experienced_effects.append({
-                    'name': effect['name'],
-                    'severity': effect.get('severity', random.choice(['mild', 'moderate', 'severe']))
-                })
+        # Adjust probability based on patient factors
+        # For example, elderly patients might be more susceptible
+        if self.patient.age > 65:
+            probs = probs * 1.5
         
-        return experienced_effects
+        # One draw for all side effects, keep the ones that occur
+        occurred = np.flatnonzero(_RNG.random(probs.size) < probs).tolist()
+        
+        # Sample severities in one call, only for occurring effects that have none fixed
+        fixed = medication._se_severities
+        missing = sum(1 for i in occurred if not fixed[i])
+        sampled = iter(_SEVERITY_ARRAY[_RNG.integers(len(_SEVERITIES), size=missing)].tolist())
+        
+        return [
+            {
+                'name': medication._se_names[i],
+                'severity': fixed[i] or next(sampled)
+            }
+            for i in occurred
+        ]
     
-    def _calculate_vital_changes(self, effectiveness: float) -> Dict:
+    def _calculate_vital_changes(self, effectiveness: float) -> np.ndarray:
         """
         Calculate changes to the patient's vital signs based on medication response
         
@@ -188,44 +398,9 @@ class MedicationResponse:
             effectiveness: How effective the medication is (0.0-1.0)
             
         Returns:
-            Dictionary of vital sign changes
+            Array of vital sign changes in VITAL_KEYS order
         """
-        # Initialize with no changes
-        vital_changes = {
-            'pulse': 0,
-            'systolic_bp': 0,
-            'diastolic_bp': 0,
-            'temperature': 0,
-            'respiratory_rate': 0,
-            'oxygen_saturation': 0
-        }
-        
-        # Simulate medication effects on vitals based on category
-        if self.medication.category.lower() == 'painkiller':
-            # Painkillers might reduce temperature and pulse slightly
-            vital_changes['temperature'] = -0.2 * effectiveness
-            vital_changes['pulse'] = -5 * effectiveness
-        
-        elif self.medication.category.lower() == 'antibiotic':
-            # Effective antibiotics reduce fever over time
-            if 'fever' in [s.lower() for s in self.patient.current_symptoms]:
-                vital_changes['temperature'] = -0.5 * effectiveness
-            
-        elif self.medication.category.lower() == 'antihypertensive':
-            # Blood pressure medications reduce BP
-            vital_changes['systolic_bp'] = -15 * effectiveness
-            vital_changes['diastolic_bp'] = -10 * effectiveness
-            
-        elif self.medication.category.lower() == 'bronchodilator':
-            # Respiratory medications improve oxygen saturation and respiration
-            vital_changes['oxygen_saturation'] = 3 * effectiveness
-            vital_changes['respiratory_rate'] = -2 * effectiveness if self.patient.vital_signs.respiratory_rate > 16 else 0
-        
-        # Add slight randomness to make it more realistic
-        for key in vital_changes:
-            vital_changes[key] += random.uniform(-0.2, 0.2) * abs(vital_changes[key])
-        
-        return vital_changes
+        return self.medication._vital_fn(effectiveness, self.patient)
     
     def _generate_response_text(self, effectiveness: float, side_effects: List[Dict]) -> str:
         """
@@ -238,25 +413,21 @@ class MedicationResponse:
         Returns:
             Text description of the patient's response
         """
-        if effectiveness > 0.8:
-            response = f"The patient responds very well to {self.medication.name}. "
-            response += "Symptoms are significantly improving."
-        elif effectiveness > 0.5:
-            response = f"The patient shows moderate improvement after receiving {self.medication.name}. "
-        elif effectiveness > 0.2:
-            response = f"The patient shows slight improvement after receiving {self.medication.name}. "
-        else:
-            response = f"The patient shows minimal response to {self.medication.name}. "
+        template = self._MINIMAL_RESPONSE
+        for threshold, candidate in self._RESPONSE_TEMPLATES:
+            if effectiveness > threshold:
+                template = candidate
+                break
+        parts = [template.format(self.medication.name)]
         
         # Add information about side effects
         if side_effects:
-            response += "\n\nThe following side effects were observed:\n"
-            for effect in side_effects:
-                response += f"- {effect['name']} ({effect['severity']})\n"
+            parts.append("\n\nThe following side effects were observed:\n")
+            parts.extend(f"- {effect['name']} ({effect['severity']})\n" for effect in side_effects)
         else:
-            response += "\nNo side effects observed."
+            parts.append("\nNo side effects observed.")
             
-        return response
+        return "".join(parts)
 
 
 class MedicationCatalog:
@@ -265,6 +436,7 @@ class MedicationCatalog:
     def __init__(self):
         """Initialize the medication catalog with a default set of medications"""
         self.medications = {}
+        self._rebuild_indexes()
         self._initialize_catalog()
     
     def _initialize_catalog(self):
@@ -357,57 +529,118 @@ class MedicationCatalog:
     
     def add_medication(self, medication: Medication):
         """Add a medication to the catalog"""
+        replacing = medication.name in self.medications
         self.medications[medication.name] = medication
+        if replacing:
+            # Drop the old entry from the indexes by rebuilding them
+            self._rebuild_indexes()
+        else:
+            self._index_medication(medication)
+    
+    def _rebuild_indexes(self):
+        """Rebuild the category and indication-token indexes from self.medications"""
+        self._by_category = {}
+        self._by_indication_token = {}
+        self._order = {}
+        for medication in self.iter_medications():
+            self._index_medication(medication)
+    
+    def _index_medication(self, medication: Medication):
+        """Add one medication to the lookup indexes"""
+        self._order[medication.name] = len(self._order)
+        self._by_category.setdefault(medication.category.lower(), []).append(medication)
+        for indication in medication.indications:
+            for token in word_tokens(indication):
+                self._by_indication_token.setdefault(token, set()).add(medication.name)
     
     def get_medication(self, name: str) -> Optional[Medication]:
         """Get a medication by name"""
         return self.medications.get(name)
     
+    def iter_medications(self) -> ValuesView[Medication]:
+        """Get a live view of all medications in the catalog, without copying"""
+        return self.medications.values()
+    
     def get_all_medications(self) -> List[Medication]:
-        """Get all medications in the catalog"""
-        return list(self.medications.values())
+        """
+        Get all medications in the catalog as a new list
+        
+        Deprecated for iteration, use iter_medications() instead.
+        """
+        return list(self.iter_medications())
     
     def get_medications_by_category(self, category: str) -> List[Medication]:
         """Get all medications in a specific category"""
-        return [med for med in self.medications.values() if med.category.lower() == category.lower()]
+        return list(self._by_category.get(category.lower(), []))
     
     def get_medications_for_symptom(self, symptom: str) -> List[Medication]:
         """Get all medications that can treat a specific symptom"""
-        matching_meds = []
-        for med in self.medications.values():
-            for indication in med.indications:
-                if symptom.lower() in indication.lower():
-                    matching_meds.append(med)
-                    break
-        return matching_meds
+        return list(self.find_medications_for_symptom(symptom))
+    
+    def find_medications_for_symptom(self, symptom: str) -> Iterator[Medication]:
+        """
+        Lazily yield medications that can treat a specific symptom, in catalog order
+        
+        Args:
+            symptom: Symptom to search the indications for
+            
+        Returns:
+            Iterator over matching medications, so callers can stop at the first match
+        """
+        symptom_lc = symptom.lower()
+        tokens = word_tokens(symptom_lc)
+        
+        if tokens and all(token in self._by_indication_token for token in tokens):
+            # Whole-word query: only medications sharing every word can match
+            names = set.intersection(*(self._by_indication_token[token] for token in tokens))
+            candidates = [self.medications[name] for name in sorted(names, key=self._order.get)]
+        else:
+            # Partial-word or empty query, fall back to checking every medication
+            candidates = self.iter_medications()
+        
+        for med in candidates:
+            if any(symptom_lc in indication for indication in med._indications_lc):
+                yield med
     
     def to_dict(self) -> Dict:
         """Convert the catalog to a dictionary for serialization"""
-        return {name: med.to_dict() for name, med in self.medications.items()}
+        return {med.name: med.to_dict() for med in self.iter_medications()}
     
     def save_to_file(self, filename: str):
         """Save the medication catalog to a JSON file"""
-        with open(filename, 'w') as f:
-            json.dump(self.to_dict(), f, indent=2)
+        data = self.to_dict()
+        if orjson is not None:
+            # C serializer; output matches the indent=2 layout of the fallback
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w') as f:
+                json.dump(data, f, indent=2)
     
     @classmethod
     def load_from_file(cls, filename: str) -> 'MedicationCatalog':
         """Load a medication catalog from a JSON file"""
         catalog = cls()
-        catalog.medications = {}  # Clear existing medications
         
         try:
-            with open(filename, 'r') as f:
-                data = json.load(f)
-                
-            for name, med_data in data.items():
-                catalog.add_medication(Medication.from_dict(med_data))
-                
+            with open(filename, 'rb') as f:
+                raw = f.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            
+            # Replace the defaults in one go and index once, instead of per add_medication
+            catalog.medications = {name: Medication.from_dict(med_data) for name, med_data in data.items()}
+            catalog._rebuild_indexes()
+            
             return catalog
         except (FileNotFoundError, json.JSONDecodeError):
             # If file doesn't exist or is invalid, return default catalog
             return cls()
 
 
-# Create a global instance of the medication catalog for easy access
-medication_catalog = MedicationCatalog()
\ No newline at end of file
+def __getattr__(name):
+    """Create the global medication_catalog on first access instead of at import"""
+    if name == 'medication_catalog':
+        global medication_catalog
+        medication_catalog = MedicationCatalog()
+        return medication_catalog
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
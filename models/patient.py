@@ -1,11 +1,291 @@
-import random
+import re
+import sys
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+import numpy as np
+# Shared simulation random source; seed_rng stays importable from here
+from models.rng import (RNG as _RNG, seed_rng, random as _random, uniform as _uniform,
+                        randint as _randint, choice as _choice)
+
+# Filler words ignored when matching symptoms/history against medication text
+_STOPWORDS = frozenset(('a', 'an', 'and', 'for', 'in', 'of', 'or', 'the', 'to', 'with'))
+
+# One bit per symptom name, assigned on first sight. Python ints are unbounded, so
+# symptom sets become int masks and group tests a single '&' without capping the vocabulary
+_SYMPTOM_BITS: Dict[str, int] = {}
+
+
+def _symptom_mask(symptoms) -> int:
+    """Return the bitmask of a collection of symptom names."""
+    mask = 0
+    for symptom in symptoms:
+        bit = _SYMPTOM_BITS.get(symptom)
+        if bit is None:
+            bit = _SYMPTOM_BITS[symptom] = 1 << len(_SYMPTOM_BITS)
+        mask |= bit
+    return mask
+
+
+# Symptoms each treatment responds to, and the ones it clears outright
+_PAIN_RELIEF_NAMES = ("Headache", "Pain", "Chest Pain", "Abdominal Pain")
+_PAIN_RELIEF_TARGETS = _symptom_mask(_PAIN_RELIEF_NAMES)
+_PAIN_REMOVE = frozenset(("Headache", "Pain"))
+_ANTIBIOTIC_NAMES = ("Fever", "Cough")
+_ANTIBIOTIC_TARGETS = _symptom_mask(_ANTIBIOTIC_NAMES)
+
+# Symptom groups that steer test results
+_COUGH_FEVER = _symptom_mask(("Cough", "Fever"))
+_RESP_CARDIAC = _symptom_mask(("Shortness of Breath", "Chest Pain"))
+_FATIGUE_HEADACHE = _symptom_mask(("Fatigue", "Headache"))
+_RESP_COUGH = _symptom_mask(("Shortness of Breath", "Cough"))
+
+# Single symptoms tested on their own
+_CHEST_PAIN = _symptom_mask(("Chest Pain",))
+_SHORTNESS_OF_BREATH = _symptom_mask(("Shortness of Breath",))
+_DIZZINESS = _symptom_mask(("Dizziness",))
+_ABDOMINAL_PAIN = _symptom_mask(("Abdominal Pain",))
+
+
+def _clamp_sub(current: int, low: int, high: int, floor: int) -> int:
+    """Lower a value by a random amount in [low, high], not going below floor."""
+    return max(floor, current - _randint(low, high))
+
+
+def _clamp_add(current: int, low: int, high: int, ceiling: int) -> int:
+    """Raise a value by a random amount in [low, high], not going above ceiling."""
+    return min(ceiling, current + _randint(low, high))
+
+
+def _apply_severity_delta(pulse: int, systolic_bp: int, diastolic_bp: int,
+                          oxygen_saturation: int, severity_change: int) -> Tuple[int, int, int, int]:
+    """
+    Vitals after a change in condition severity.
+    
+    Args:
+        pulse: Current pulse
+        systolic_bp: Current systolic blood pressure
+        diastolic_bp: Current diastolic blood pressure
+        oxygen_saturation: Current oxygen saturation
+        severity_change: Non-zero change to condition severity
+        
+    Returns:
+        Tuple of (pulse, systolic_bp, diastolic_bp, oxygen_saturation)
+    """
+    # Simple algorithm for Phase 1 - will be more sophisticated in later phases
+    if severity_change > 0:  # Condition worsening
+        pulse_change = _randint(5, 15)
+        bp_change = _randint(5, 15)
+        return (pulse + pulse_change,
+                systolic_bp + bp_change,
+                diastolic_bp + bp_change // 2,
+                max(70, oxygen_saturation - _randint(1, 5)))
+    # Condition improving
+    pulse_change = _randint(5, 10)
+    bp_change = _randint(5, 10)
+    return (max(60, pulse - pulse_change),
+            max(90, systolic_bp - bp_change),
+            max(60, diastolic_bp - bp_change // 2),
+            min(100, oxygen_saturation + _randint(1, 3)))
+
+
+# Predicted spirometry volumes (L): forced expiratory volume in 1 second, forced vital capacity
+_NORMAL_FEV1 = 3.5
+_NORMAL_FVC = 4.5
+# Percent-of-predicted factors, so reports multiply instead of dividing
+_FEV1_PERCENT = 100.0 / _NORMAL_FEV1
+_FVC_PERCENT = 100.0 / _NORMAL_FVC
+
+
+def _pft_values(abnormal: bool) -> Tuple[float, float, float]:
+    """
+    Draw the numeric results of a pulmonary function test.
+    
+    Args:
+        abnormal: Whether the volumes and diffusing capacity should be reduced
+        
+    Returns:
+        Tuple of (fev1 in L, fvc in L, dlco in % predicted)
+    """
+    if abnormal:
+        return (_NORMAL_FEV1 * _uniform(0.5, 0.8),
+                _NORMAL_FVC * _uniform(0.6, 0.9),
+                _uniform(40, 70))
+    return (_NORMAL_FEV1 * _uniform(0.9, 1.1),
+            _NORMAL_FVC * _uniform(0.9, 1.1),
+            _uniform(70, 100))
+
+
+# utils.image_generator pulls in matplotlib, so it is imported on first use and the
+# outcome (class or None) remembered; _UNLOADED means no import was attempted yet
+_UNLOADED = object()
+_image_generator = _UNLOADED
+
+
+def _get_image_generator():
+    """Return the ImageGenerator class, or None if it cannot be imported."""
+    global _image_generator
+    if _image_generator is _UNLOADED:
+        try:
+            from utils.image_generator import ImageGenerator
+            _image_generator = ImageGenerator
+        except ImportError:
+            _image_generator = None
+    return _image_generator
+
+
+# (second, formatted timestamp) of the last _format_timestamp call
+_timestamp_cache = (None, "")
+
+
+def _format_timestamp(time_ns: int) -> str:
+    """Format a time.time_ns() value as local 'YYYY-mm-dd HH:MM:SS', reusing the last result within a second."""
+    global _timestamp_cache
+    second = time_ns // 1_000_000_000
+    if second != _timestamp_cache[0]:
+        _timestamp_cache = (second, datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S"))
+    return _timestamp_cache[1]
+
+
+def _with_display_time(records: List[Dict]) -> List[Dict]:
+    """
+    Copy history records, giving each a formatted 'time'.
+    
+    Records made during the session carry a raw 'time_ns'; records loaded from
+    the database already have a 'time' string and are copied as is.
+    
+    Args:
+        records: treatments_applied or tests_performed entries
+        
+    Returns:
+        New list of record dicts that all have a 'time' string
+    """
+    display = []
+    for record in records:
+        record = dict(record)
+        if 'time' not in record and 'time_ns' in record:
+            record['time'] = _format_timestamp(record['time_ns'])
+        display.append(record)
+    return display
+
+
+def word_tokens(text: str) -> List[str]:
+    """Split text into lowercase word tokens, dropping filler words."""
+    return [word for word in re.findall(r'\w+', text.lower()) if word not in _STOPWORDS]
+
+
+# (details key, blood result name) for the values summarised by the Basic Blood Test
+_BLOOD_KEYS = (('wbc', 'WBC'), ('rbc', 'RBC'), ('hemoglobin', 'Hemoglobin'),
+               ('platelets', 'Platelets'), ('glucose', 'Glucose'))
+
+# Reference ranges of the basic panel: (details key, analyte, low, high, unit)
+_BLOOD_PANEL = (
+    ('wbc', 'WBC', 4.5, 11.0, 'x10^9/L'),
+    ('rbc', 'RBC', 4.2, 5.8, 'x10^12/L'),
+    ('hemoglobin', 'Hemoglobin', 13.5, 17.5, 'g/dL'),
+    ('platelets', 'Platelets', 150, 400, 'x10^9/L'),
+    ('glucose', 'Glucose', 70, 100, 'mg/dL'),
+)
+
+# Report texts picked at random by perform_test
+_BLOOD_CONDITIONS = ("infection", "anemia", "dehydration", "liver", "kidney")
+_BLOOD_INFECTION = _BLOOD_CONDITIONS.index("infection")
+_BLOOD_ANEMIA = _BLOOD_CONDITIONS.index("anemia")
+_ECG_CHEST_PAIN_FINDINGS = (
+    "ST segment elevation suggestive of myocardial infarction.",
+    "ST depression indicating possible ischemia.",
+    "T wave inversion in leads V3-V5, concerning for ischemia.",
+    "Prolonged QT interval, requiring further evaluation."
+)
+_ECG_OTHER_FINDINGS = (
+    "Non-specific ST-T wave changes.",
+    "Sinus tachycardia.",
+    "Premature ventricular contractions (PVCs).",
+    "Left ventricular hypertrophy pattern."
+)
+_XRAY_PNEUMONIA_FINDINGS = (
+    "Opacity in the right lower lobe consistent with pneumonia.",
+    "Left upper lobe infiltrate suggesting pneumonic process.",
+    "Bilateral patchy infiltrates consistent with pneumonia."
+)
+_XRAY_FRACTURE_FINDINGS = (
+    "Fracture of the 7th rib on the right side.",
+    "Acute fracture of the left 5th rib without displacement.",
+    "Minimally displaced fracture of the right 8th rib."
+)
+_XRAY_CARDIAC_FINDINGS = (
+    "Cardiomegaly with cardiothoracic ratio of 0.65.",
+    "Enlarged cardiac silhouette suggesting cardiomegaly.",
+    "Mild pulmonary vascular congestion suggesting heart failure."
+)
+_XRAY_NORMAL_FINDINGS = (
+    "No significant abnormalities detected.",
+    "Findings within normal limits.",
+    "Normal examination with no pathological findings."
+)
+
+# Pulmonary function report lines, parsed once and bound to str.format
+_PFT_VOLUME_FORMAT = "{:.2f} L ({:d}% predicted)".format
+_PFT_RATIO_FORMAT = "{:.1f}%".format
+_PFT_DLCO_FORMAT = "{:.1f}% predicted".format
+
+# Physical examination findings per (relevant symptom bits, severity), filled on first use
+_PHYS_EXAM_SYMPTOMS = _SHORTNESS_OF_BREATH | _CHEST_PAIN | _ABDOMINAL_PAIN
+_phys_exam_cache: Dict[Tuple[int, int], Dict[str, str]] = {}
+
+# Urinalysis dipstick readings, indexed by whether the finding is present
+_URINE_BLOOD = ("Negative", "Positive")
+_URINE_PROTEIN = ("Negative", "Trace")
+
+# Blood pressure categories, indexed by VitalSigns.classify_bp / classify_bp_batch
+_BP_CATEGORIES = ("Normal", "Elevated", "Stage 1 Hypertension", "Stage 2 Hypertension", "Hypertensive Crisis")
+
+# Recommendation texts, shared between tests and grouped per finding so a branch
+# adds all of its recommendations with one extend()
+_REC_CARDIOLOGY_CONSULT = "Cardiology consultation recommended."
+_REC_LIFESTYLE_MONITORING = "Recommend lifestyle modifications and monitoring."
+_REC_ANTIHYPERTENSIVES = ("Consider anti-hypertensive medications.",
+                          "Recommend lifestyle modifications including diet and exercise.")
+_BP_RECOMMENDATIONS = (
+    (),                                          # Normal
+    (_REC_LIFESTYLE_MONITORING,),                # Elevated
+    _REC_ANTIHYPERTENSIVES,                      # Stage 1 Hypertension
+    _REC_ANTIHYPERTENSIVES,                      # Stage 2 Hypertension
+    ("Immediate medical attention required.",)   # Hypertensive Crisis
+)
+_ECG_CHEST_PAIN_RECOMMENDATIONS = ("Consider cardiac enzymes.", _REC_CARDIOLOGY_CONSULT)
+_XRAY_RECOMMENDATIONS = {
+    "pneumonia": ("Consider antibiotic therapy.", "Follow-up imaging in 2-4 weeks to confirm resolution."),
+    "fracture": ("Pain management as needed.", "Consider orthopedic consultation for rib fractures."),
+    "cardiac": (_REC_CARDIOLOGY_CONSULT, "Consider echocardiogram for further evaluation.")
+}
+_PFT_RECOMMENDATIONS = ("Consider bronchodilator therapy.", "Chest imaging recommended.")
+_PFT_OBSTRUCTIVE_RECOMMENDATIONS = _PFT_RECOMMENDATIONS + ("Consider inhaled corticosteroids.",)
+# Abnormal pulmonary function patterns with their recommendations; inhaled
+# corticosteroids are added for every pattern with an obstructive component
+_PFT_ABNORMAL_PATTERNS = (
+    ("Moderate obstructive pattern consistent with asthma or COPD.", _PFT_OBSTRUCTIVE_RECOMMENDATIONS),
+    ("Restrictive pattern suggesting interstitial lung disease.", _PFT_RECOMMENDATIONS),
+    ("Mixed obstructive and restrictive pattern.", _PFT_OBSTRUCTIVE_RECOMMENDATIONS)
+)
+
+# Vital sign fields in VitalSigns.__init__ order, with the defaults from_dict fills in
+_VITAL_FIELD_NAMES = ('pulse', 'systolic_bp', 'diastolic_bp', 'temperature',
+                      'respiratory_rate', 'oxygen_saturation')
+_VITAL_DEFAULTS = (80, 120, 80, 36.6, 16, 98)
+
+# Attributes VitalSigns.update_vitals is allowed to set
+_VITAL_FIELDS = frozenset(_VITAL_FIELD_NAMES)
+
 
 class VitalSigns:
     """
     Represents patient vital signs like pulse, blood pressure, temperature, etc.
     """
+    __slots__ = ('pulse', 'systolic_bp', 'diastolic_bp', 'temperature', 'respiratory_rate',
+                 'oxygen_saturation', '_bp_key', '_bp_str', '_vitals_key', '_vitals_dict')
+    
     def __init__(self, 
                  pulse: int = 80, 
                  systolic_bp: int = 120, 
@@ -30,20 +310,78 @@ class VitalSigns:
         self.temperature = temperature
         self.respiratory_rate = respiratory_rate
         self.oxygen_saturation = oxygen_saturation
+        
+        # Formatted-output caches, rebuilt when the values they were built from change
+        self._bp_key = None
+        self._bp_str = ""
+        self._vitals_key = None
+        self._vitals_dict = {}
     
     def get_formatted_bp(self) -> str:
         """Return blood pressure in standard format."""
-        return f"{self.systolic_bp}/{self.diastolic_bp} mmHg"
+        key = (self.systolic_bp, self.diastolic_bp)
+        if key != self._bp_key:
+            self._bp_key = key
+            self._bp_str = f"{self.systolic_bp}/{self.diastolic_bp} mmHg"
+        return self._bp_str
     
     def get_vitals_dict(self) -> Dict:
         """Return all vital signs as a dictionary."""
-        return {
-            'pulse': self.pulse,
-            'blood_pressure': self.get_formatted_bp(),
-            'temperature': f"{self.temperature:.1f}°C",
-            'respiratory_rate': self.respiratory_rate,
-            'oxygen_saturation': f"{self.oxygen_saturation}%"
-        }
+        key = (self.pulse, self.systolic_bp, self.diastolic_bp, self.temperature,
+               self.respiratory_rate, self.oxygen_saturation)
+        if key != self._vitals_key:
+            self._vitals_key = key
+            self._vitals_dict = {
+                'pulse': self.pulse,
+                'blood_pressure': self.get_formatted_bp(),
+                'temperature': f"{self.temperature:.1f}°C",
+                'respiratory_rate': self.respiratory_rate,
+                'oxygen_saturation': f"{self.oxygen_saturation}%"
+            }
+        return dict(self._vitals_dict)
+    
+    @staticmethod
+    def classify_bp(systolic: int, diastolic: int) -> int:
+        """
+        Classify a blood pressure reading.
+        
+        Args:
+            systolic: Systolic blood pressure in mmHg
+            diastolic: Diastolic blood pressure in mmHg
+            
+        Returns:
+            Index into _BP_CATEGORIES
+        """
+        if systolic >= 180 or diastolic >= 120:
+            return 4
+        if systolic >= 140 or diastolic >= 90:
+            return 3
+        if systolic >= 130 or diastolic >= 80:
+            return 2
+        if systolic >= 120:
+            return 1
+        return 0
+    
+    @staticmethod
+    def classify_bp_batch(systolic: np.ndarray, diastolic: np.ndarray) -> np.ndarray:
+        """
+        Classify many blood pressure readings at once, matching classify_bp.
+        
+        Args:
+            systolic: Array of systolic pressures in mmHg
+            diastolic: Array of diastolic pressures in mmHg
+            
+        Returns:
+            int8 array of indexes into _BP_CATEGORIES
+        """
+        return np.select(
+            [(systolic >= 180) | (diastolic >= 120),
+             (systolic >= 140) | (diastolic >= 90),
+             (systolic >= 130) | (diastolic >= 80),
+             systolic >= 120],
+            [4, 3, 2, 1],
+            default=0
+        ).astype(np.int8)
     
     def update_vitals(self, **kwargs) -> None:
         """
@@ -53,15 +391,43 @@ class VitalSigns:
             **kwargs: Vital signs to update
         """
         for key, value in kwargs.items():
-            if hasattr(self, key):
+            if key in _VITAL_FIELDS:
                 setattr(self, key, value)
 
 
+@dataclass(slots=True)
+class TreatmentResult:
+    """
+    Outcome of a single apply_treatment call, filled in by the treatment handlers.
+    """
+    success: bool = True
+    message: str = ""
+    effects: List[str] = field(default_factory=list)
+    severity_change: int = 0
+    vital_changes: Dict[str, str] = field(default_factory=dict)
+    
+    def as_dict(self) -> Dict:
+        """Return the result in the dictionary shape callers of apply_treatment expect."""
+        return {
+            'success': self.success,
+            'message': self.message,
+            'effects': self.effects,
+            'severity_change': self.severity_change,
+            'vital_changes': self.vital_changes
+        }
+
+
 class Patient:
     """
     Represents a patient in the medical simulation with personal info, 
     medical history, symptoms, vital signs, and current condition.
     """
+    __slots__ = ('patient_id', 'name', 'age', 'gender', 'medical_history', '_current_symptoms',
+                 '_symptom_set', '_symptom_mask', 'vital_signs', 'diagnosis', 'condition_severity',
+                 'admission_time', 'treatments_applied', 'tests_performed', '_symptom_tokens_key',
+                 '_symptom_tokens', '_symptoms_lc_key', '_symptoms_lc', '_history_tokens_key',
+                 '_history_tokens')
+    
     def __init__(self, 
                  patient_id: str,
                  name: str,
@@ -98,16 +464,68 @@ class Patient:
         self.admission_time = datetime.now()
         self.treatments_applied = []
         self.tests_performed = []
+        
+        # Word-token caches, refreshed when the underlying list changes
+        self._symptom_tokens_key = None
+        self._symptom_tokens = frozenset()
+        self._symptoms_lc_key = None
+        self._symptoms_lc = frozenset()
+        self._history_tokens_key = None
+        self._history_tokens = frozenset()
+    
+    @property
+    def current_symptoms(self) -> List[str]:
+        """Current symptoms in display order; use add_symptom/remove_symptom to change them."""
+        return self._current_symptoms
+    
+    @current_symptoms.setter
+    def current_symptoms(self, symptoms: List[str]) -> None:
+        self._current_symptoms = symptoms
+        # Set and bitmask sidecars for fast membership/group tests, kept in sync by the mutators below
+        self._symptom_set = set(symptoms)
+        self._symptom_mask = _symptom_mask(self._symptom_set)
+    
+    @property
+    def symptom_tokens(self) -> frozenset:
+        """Lowercase words of the current symptoms, cached until the symptoms change."""
+        key = tuple(self.current_symptoms)
+        if key != self._symptom_tokens_key:
+            self._symptom_tokens_key = key
+            self._symptom_tokens = frozenset(token for symptom in key for token in word_tokens(symptom))
+        return self._symptom_tokens
+    
+    @property
+    def current_symptoms_lc(self) -> frozenset:
+        """Lowercased current symptoms, cached until the symptoms change."""
+        key = tuple(self.current_symptoms)
+        if key != self._symptoms_lc_key:
+            self._symptoms_lc_key = key
+            self._symptoms_lc = frozenset(symptom.lower() for symptom in key)
+        return self._symptoms_lc
+    
+    @property
+    def medical_history_tokens(self) -> frozenset:
+        """Lowercase words of the medical history, cached until the history changes."""
+        key = tuple(self.medical_history)
+        if key != self._history_tokens_key:
+            self._history_tokens_key = key
+            self._history_tokens = frozenset(token for condition in key for token in word_tokens(condition))
+        return self._history_tokens
     
     def add_symptom(self, symptom: str) -> None:
         """Add a new symptom to the patient."""
-        if symptom not in self.current_symptoms:
-            self.current_symptoms.append(symptom)
+        if symptom not in self._symptom_set:
+            self._current_symptoms.append(symptom)
+            self._symptom_set.add(symptom)
+            self._symptom_mask |= _symptom_mask((symptom,))
     
     def remove_symptom(self, symptom: str) -> None:
         """Remove a symptom from the patient."""
-        if symptom in self.current_symptoms:
-            self.current_symptoms.remove(symptom)
+        if symptom in self._symptom_set:
+            self._current_symptoms.remove(symptom)
+            if symptom not in self._current_symptoms:
+                self._symptom_set.discard(symptom)
+                self._symptom_mask &= ~_SYMPTOM_BITS[symptom]
     
     def get_patient_info(self) -> Dict:
         """Return basic patient information as a dictionary."""
@@ -120,6 +538,14 @@ class Patient:
             'admission_time': self.admission_time.strftime("%Y-%m-%d %H:%M")
         }
     
+    def get_treatments_display(self) -> List[Dict]:
+        """Return the applied treatments with their times formatted for display."""
+        return _with_display_time(self.treatments_applied)
+    
+    def get_tests_display(self) -> List[Dict]:
+        """Return the performed tests with their times formatted for display."""
+        return _with_display_time(self.tests_performed)
+    
     def apply_treatment(self, treatment: str) -> Dict:
         """
         Apply a treatment to the patient and record its effects.
@@ -132,193 +558,214 @@ class Patient:
         """
         self.treatments_applied.append({
             'treatment': treatment,
-            'time': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            'time_ns': time.time_ns()
         })
         
         # Phase 2: Implement treatment effects
-        result = {
-            'success': True,
-            'message': f"Treatment '{treatment}' applied.",
-            'effects': [],
-            'severity_change': 0,
-            'vital_changes': {}
-        }
+        result = TreatmentResult(message=f"Treatment '{treatment}' applied.")
         
         # Define medication effects
-        if treatment == "Pain Relief":
-            # Pain relievers
-            if any(s in self.current_symptoms for s in ["Headache", "Pain", "Chest Pain", "Abdominal Pain"]):
-                result['effects'].append("Pain reduced")
-                self.current_symptoms = [s for s in self.current_symptoms if s not in ["Headache", "Pain"]]
-                
-                if "Chest Pain" in self.current_symptoms:
-                    result['effects'].append("Chest pain partially relieved but not eliminated")
-                
-                result['severity_change'] = -1
-                
-        elif treatment == "Antibiotics":
-            # Simulate antibiotic effects based on condition
-            if any(s in self.current_symptoms for s in ["Fever", "Cough"]):
-                # Simulate gradual improvement
-                if random.random() < 0.7:  # 70% chance of improvement
-                    result['effects'].append("Antibiotic appears to be effective")
-                    result['severity_change'] = -2
-                    
-                    # Temperature reduction
-                    if self.vital_signs.temperature > 37.5:
-                        new_temp = max(36.8, self.vital_signs.temperature - random.uniform(0.5, 1.2))
-                        self.vital_signs.temperature = new_temp
-                        result['vital_changes']['temperature'] = f"Decreased to {new_temp:.1f}°C"
-                else:
-                    result['effects'].append("Patient's response to antibiotics is still developing")
-                    result['severity_change'] = -1
-            else:
-                result['effects'].append("No immediate effect observed")
-                
-        elif treatment == "Beta-blockers":
-            # Primarily affects heart rate and blood pressure
-            if self.vital_signs.pulse > 90:
-                new_pulse = max(70, self.vital_signs.pulse - random.randint(10, 25))
-                self.vital_signs.pulse = new_pulse
-                result['vital_changes']['heart_rate'] = f"Decreased to {new_pulse} BPM"
-                result['effects'].append("Heart rate decreased")
+        handler = self._TREATMENT_HANDLERS.get(treatment, Patient._tx_generic)
+        handler(self, result)
+        
+        # Apply the overall severity change
+        if result.severity_change != 0:
+            self.update_condition(result.severity_change)
             
-            if self.vital_signs.systolic_bp > 140 or self.vital_signs.diastolic_bp > 90:
-                new_systolic = max(120, self.vital_signs.systolic_bp - random.randint(15, 30))
-                new_diastolic = max(80, self.vital_signs.diastolic_bp - random.randint(5, 15))
-                self.vital_signs.systolic_bp = new_systolic
-                self.vital_signs.diastolic_bp = new_diastolic
-                result['vital_changes']['blood_pressure'] = f"Decreased to {new_systolic}/{new_diastolic} mmHg"
-                result['effects'].append("Blood pressure reduced")
-                
-            if 'Chest Pain' in self.current_symptoms:
-                if random.random() < 0.6:  # 60% chance of improvement
-                    self.current_symptoms.remove('Chest Pain')
-                    result['effects'].append("Chest pain relieved")
-                else:
-                    result['effects'].append("Chest pain partially improved")
-                    
-            result['severity_change'] = -2 if result['effects'] else -1
+            if result.severity_change < 0:
+                result.message = f"Treatment '{treatment}' applied successfully. Patient's condition is improving."
+            elif result.severity_change > 0:
+                result.message = f"Treatment '{treatment}' applied, but patient condition has worsened."
+        
+        return result.as_dict()
+    
+    def _tx_pain_relief(self, result: TreatmentResult) -> None:
+        """Pain Relief: clears headache and general pain, eases other pain."""
+        if self._symptom_mask & _PAIN_RELIEF_TARGETS:
+            result.effects.append("Pain reduced")
+            removed = self._symptom_set & _PAIN_REMOVE
+            if removed:
+                # Update both containers in place; the list is only rebuilt when something goes
+                self._symptom_set -= removed
+                self._symptom_mask &= ~_symptom_mask(removed)
+                self._current_symptoms[:] = [s for s in self._current_symptoms if s not in removed]
+            
+            if self._symptom_mask & _CHEST_PAIN:
+                result.effects.append("Chest pain partially relieved but not eliminated")
+            
+            result.severity_change = -1
+    
+    def _tx_antibiotics(self, result: TreatmentResult) -> None:
+        """Antibiotics: simulate gradual improvement of fever and cough."""
+        if self._symptom_mask & _ANTIBIOTIC_TARGETS:
+            # Simulate gradual improvement
+            if _random() < 0.7:  # 70% chance of improvement
+                result.effects.append("Antibiotic appears to be effective")
+                result.severity_change = -2
                 
-        elif treatment == "ACE Inhibitors":
-            # Blood pressure medication
-            if self.vital_signs.systolic_bp > 130 or self.vital_signs.diastolic_bp > 85:
-                new_systolic = max(120, self.vital_signs.systolic_bp - random.randint(10, 20))
-                new_diastolic = max(80, self.vital_signs.diastolic_bp - random.randint(5, 10))
-                self.vital_signs.systolic_bp = new_systolic
-                self.vital_signs.diastolic_bp = new_diastolic
-                result['vital_changes']['blood_pressure'] = f"Decreased to {new_systolic}/{new_diastolic} mmHg"
-                result['effects'].append("Blood pressure reduced")
-                result['severity_change'] = -1
+                # Temperature reduction
+                if self.vital_signs.temperature > 37.5:
+                    new_temp = max(36.8, self.vital_signs.temperature - _uniform(0.5, 1.2))
+                    self.vital_signs.temperature = new_temp
+                    result.vital_changes['temperature'] = f"Decreased to {new_temp:.1f}°C"
             else:
-                # If BP is already normal or low, could cause hypotension
-                new_systolic = max(90, self.vital_signs.systolic_bp - random.randint(5, 15))
-                new_diastolic = max(60, self.vital_signs.diastolic_bp - random.randint(3, 8))
-                self.vital_signs.systolic_bp = new_systolic
-                self.vital_signs.diastolic_bp = new_diastolic
-                
-                if new_systolic < 100:
-                    result['vital_changes']['blood_pressure'] = f"Decreased to {new_systolic}/{new_diastolic} mmHg"
-                    result['effects'].append("Blood pressure dropped too low - possible hypotension")
-                    if 'Dizziness' not in self.current_symptoms:
-                        self.current_symptoms.append('Dizziness')
-                        result['effects'].append("Patient developed dizziness")
-                    result['severity_change'] = 1  # Worsen condition due to side effect
-                
-        elif treatment == "Oxygen Therapy":
-            # Improve oxygen saturation
-            if self.vital_signs.oxygen_saturation < 95:
-                new_o2 = min(99, self.vital_signs.oxygen_saturation + random.randint(3, 8))
-                self.vital_signs.oxygen_saturation = new_o2
-                result['vital_changes']['oxygen_saturation'] = f"Increased to {new_o2}%"
-                result['effects'].append("Oxygen saturation improved")
-                
-                if 'Shortness of Breath' in self.current_symptoms:
-                    if random.random() < 0.7:  # 70% chance of improvement
-                        self.current_symptoms.remove('Shortness of Breath')
-                        result['effects'].append("Breathing difficulty relieved")
-                    else:
-                        result['effects'].append("Breathing difficulty partially improved")
-                        
-                result['severity_change'] = -2
+                result.effects.append("Patient's response to antibiotics is still developing")
+                result.severity_change = -1
+        else:
+            result.effects.append("No immediate effect observed")
+    
+    def _tx_beta_blockers(self, result: TreatmentResult) -> None:
+        """Beta-blockers: primarily affects heart rate and blood pressure."""
+        vitals = self.vital_signs
+        pulse = vitals.pulse
+        if pulse > 90:
+            pulse = _clamp_sub(pulse, 10, 25, 70)
+            vitals.pulse = pulse
+            result.vital_changes['heart_rate'] = f"Decreased to {pulse} BPM"
+            result.effects.append("Heart rate decreased")
+        
+        systolic, diastolic = vitals.systolic_bp, vitals.diastolic_bp
+        if systolic > 140 or diastolic > 90:
+            systolic = _clamp_sub(systolic, 15, 30, 120)
+            diastolic = _clamp_sub(diastolic, 5, 15, 80)
+            vitals.systolic_bp, vitals.diastolic_bp = systolic, diastolic
+            result.vital_changes['blood_pressure'] = f"Decreased to {systolic}/{diastolic} mmHg"
+            result.effects.append("Blood pressure reduced")
+            
+        if self._symptom_mask & _CHEST_PAIN:
+            if _random() < 0.6:  # 60% chance of improvement
+                self.remove_symptom('Chest Pain')
+                result.effects.append("Chest pain relieved")
             else:
-                result['effects'].append("Oxygen levels already adequate")
+                result.effects.append("Chest pain partially improved")
                 
-        elif treatment == "IV Fluids":
-            # Improve blood pressure if low, help with dehydration
-            if self.vital_signs.systolic_bp < 100:
-                new_systolic = min(120, self.vital_signs.systolic_bp + random.randint(10, 20))
-                new_diastolic = min(80, self.vital_signs.diastolic_bp + random.randint(5, 10))
-                self.vital_signs.systolic_bp = new_systolic
-                self.vital_signs.diastolic_bp = new_diastolic
-                result['vital_changes']['blood_pressure'] = f"Increased to {new_systolic}/{new_diastolic} mmHg"
-                result['effects'].append("Blood pressure stabilized")
-                
-            # Simulate hydration effects
-            if 'Dizziness' in self.current_symptoms:
-                if random.random() < 0.8:  # 80% chance of improvement
-                    self.current_symptoms.remove('Dizziness')
-                    result['effects'].append("Dizziness relieved")
+        result.severity_change = -2 if result.effects else -1
+    
+    def _tx_ace_inhibitors(self, result: TreatmentResult) -> None:
+        """ACE Inhibitors: blood pressure medication."""
+        vitals = self.vital_signs
+        systolic, diastolic = vitals.systolic_bp, vitals.diastolic_bp
+        if systolic > 130 or diastolic > 85:
+            new_systolic = _clamp_sub(systolic, 10, 20, 120)
+            new_diastolic = _clamp_sub(diastolic, 5, 10, 80)
+            vitals.systolic_bp, vitals.diastolic_bp = new_systolic, new_diastolic
+            result.vital_changes['blood_pressure'] = f"Decreased to {new_systolic}/{new_diastolic} mmHg"
+            result.effects.append("Blood pressure reduced")
+            result.severity_change = -1
+        else:
+            # If BP is already normal or low, could cause hypotension
+            new_systolic = _clamp_sub(systolic, 5, 15, 90)
+            new_diastolic = _clamp_sub(diastolic, 3, 8, 60)
+            vitals.systolic_bp, vitals.diastolic_bp = new_systolic, new_diastolic
             
-            result['severity_change'] = -1
-                
-        elif treatment == "Defibrillation":
-            # Used in cardiac emergencies
-            if self.condition_severity >= 8 and 'Chest Pain' in self.current_symptoms:
-                if random.random() < 0.7:  # 70% success rate
-                    result['effects'].append("Cardiac rhythm restored")
-                    
-                    new_pulse = random.randint(70, 90)
-                    self.vital_signs.pulse = new_pulse
-                    result['vital_changes']['heart_rate'] = f"Stabilized at {new_pulse} BPM"
-                    
-                    result['severity_change'] = -3
+            if new_systolic < 100:
+                result.vital_changes['blood_pressure'] = f"Decreased to {new_systolic}/{new_diastolic} mmHg"
+                result.effects.append("Blood pressure dropped too low - possible hypotension")
+                if not self._symptom_mask & _DIZZINESS:
+                    self.add_symptom('Dizziness')
+                    result.effects.append("Patient developed dizziness")
+                result.severity_change = 1  # Worsen condition due to side effect
+    
+    def _tx_oxygen_therapy(self, result: TreatmentResult) -> None:
+        """Oxygen Therapy: improve oxygen saturation."""
+        if self.vital_signs.oxygen_saturation < 95:
+            new_o2 = _clamp_add(self.vital_signs.oxygen_saturation, 3, 8, 99)
+            self.vital_signs.oxygen_saturation = new_o2
+            result.vital_changes['oxygen_saturation'] = f"Increased to {new_o2}%"
+            result.effects.append("Oxygen saturation improved")
+            
+            if self._symptom_mask & _SHORTNESS_OF_BREATH:
+                if _random() < 0.7:  # 70% chance of improvement
+                    self.remove_symptom('Shortness of Breath')
+                    result.effects.append("Breathing difficulty relieved")
                 else:
-                    result['effects'].append("Defibrillation performed, patient requires continued care")
-                    result['severity_change'] = -1
-            else:
-                result['effects'].append("Defibrillation not indicated for current condition")
-                result['severity_change'] = 0
-                
-        elif treatment == "Intubation":
-            # Emergency airway management
-            if self.vital_signs.oxygen_saturation < 85 or 'Shortness of Breath' in self.current_symptoms and self.condition_severity >= 7:
-                result['effects'].append("Airway secured, ventilation established")
-                
-                new_o2 = min(98, self.vital_signs.oxygen_saturation + random.randint(10, 15))
-                self.vital_signs.oxygen_saturation = new_o2
-                result['vital_changes']['oxygen_saturation'] = f"Increased to {new_o2}%"
+                    result.effects.append("Breathing difficulty partially improved")
+                    
+            result.severity_change = -2
+        else:
+            result.effects.append("Oxygen levels already adequate")
+    
+    def _tx_iv_fluids(self, result: TreatmentResult) -> None:
+        """IV Fluids: improve blood pressure if low, help with dehydration."""
+        vitals = self.vital_signs
+        systolic, diastolic = vitals.systolic_bp, vitals.diastolic_bp
+        if systolic < 100:
+            systolic = _clamp_add(systolic, 10, 20, 120)
+            diastolic = _clamp_add(diastolic, 5, 10, 80)
+            vitals.systolic_bp, vitals.diastolic_bp = systolic, diastolic
+            result.vital_changes['blood_pressure'] = f"Increased to {systolic}/{diastolic} mmHg"
+            result.effects.append("Blood pressure stabilized")
+            
+        # Simulate hydration effects
+        if self._symptom_mask & _DIZZINESS:
+            if _random() < 0.8:  # 80% chance of improvement
+                self.remove_symptom('Dizziness')
+                result.effects.append("Dizziness relieved")
+        
+        result.severity_change = -1
+    
+    def _tx_defibrillation(self, result: TreatmentResult) -> None:
+        """Defibrillation: used in cardiac emergencies."""
+        if self.condition_severity >= 8 and self._symptom_mask & _CHEST_PAIN:
+            if _random() < 0.7:  # 70% success rate
+                result.effects.append("Cardiac rhythm restored")
                 
-                new_resp = 14  # Controlled by ventilator
-                self.vital_signs.respiratory_rate = new_resp
-                result['vital_changes']['respiratory_rate'] = f"Controlled at {new_resp} breaths/min"
+                new_pulse = _randint(70, 90)
+                self.vital_signs.pulse = new_pulse
+                result.vital_changes['heart_rate'] = f"Stabilized at {new_pulse} BPM"
                 
-                result['severity_change'] = -3
+                result.severity_change = -3
             else:
-                result['effects'].append("Intubation not indicated for current condition")
-                result['severity_change'] = 0
-        
+                result.effects.append("Defibrillation performed, patient requires continued care")
+                result.severity_change = -1
         else:
-            # Generic treatment effect
-            symptom_improvement = random.random() < 0.6  # 60% chance of symptom improvement
+            result.effects.append("Defibrillation not indicated for current condition")
+            result.severity_change = 0
+    
+    def _tx_intubation(self, result: TreatmentResult) -> None:
+        """Intubation: emergency airway management."""
+        # Indicated for severe hypoxia, or for breathing difficulty in a severe condition;
+        # the cheap int compare runs first and short-circuits the rest
+        needs_intubation = (self.vital_signs.oxygen_saturation < 85 or
+                            (self._symptom_mask & _SHORTNESS_OF_BREATH and self.condition_severity >= 7))
+        if needs_intubation:
+            result.effects.append("Airway secured, ventilation established")
             
-            if symptom_improvement and self.current_symptoms:
-                symptom_to_remove = random.choice(self.current_symptoms)
-                self.current_symptoms.remove(symptom_to_remove)
-                result['effects'].append(f"{symptom_to_remove} relieved")
-                
-            result['severity_change'] = -1 if symptom_improvement else 0
-        
-        # Apply the overall severity change
-        if result['severity_change'] != 0:
-            self.update_condition(result['severity_change'])
+            new_o2 = _clamp_add(self.vital_signs.oxygen_saturation, 10, 15, 98)
+            self.vital_signs.oxygen_saturation = new_o2
+            result.vital_changes['oxygen_saturation'] = f"Increased to {new_o2}%"
             
-            if result['severity_change'] < 0:
-                result['message'] = f"Treatment '{treatment}' applied successfully. Patient's condition is improving."
-            elif result['severity_change'] > 0:
-                result['message'] = f"Treatment '{treatment}' applied, but patient condition has worsened."
+            new_resp = 14  # Controlled by ventilator
+            self.vital_signs.respiratory_rate = new_resp
+            result.vital_changes['respiratory_rate'] = f"Controlled at {new_resp} breaths/min"
+            
+            result.severity_change = -3
+        else:
+            result.effects.append("Intubation not indicated for current condition")
+            result.severity_change = 0
+    
+    def _tx_generic(self, result: TreatmentResult) -> None:
+        """Fallback for treatments without a specific handler: may relieve one random symptom."""
+        symptom_improvement = _random() < 0.6  # 60% chance of symptom improvement
         
-        return result
+        if symptom_improvement and self.current_symptoms:
+            symptom_to_remove = _choice(self.current_symptoms)
+            self.remove_symptom(symptom_to_remove)
+            result.effects.append(f"{symptom_to_remove} relieved")
+            
+        result.severity_change = -1 if symptom_improvement else 0
+    
+    # Treatment name -> handler; each handler fills in result and mutates the patient
+    _TREATMENT_HANDLERS = {
+        "Pain Relief": _tx_pain_relief,
+        "Antibiotics": _tx_antibiotics,
+        "Beta-blockers": _tx_beta_blockers,
+        "ACE Inhibitors": _tx_ace_inhibitors,
+        "Oxygen Therapy": _tx_oxygen_therapy,
+        "IV Fluids": _tx_iv_fluids,
+        "Defibrillation": _tx_defibrillation,
+        "Intubation": _tx_intubation
+    }
     
     def perform_test(self, test_name: str) -> Dict:
         """
@@ -330,20 +777,13 @@ class Patient:
         Returns:
             Dict with test results
         """
-        from datetime import datetime
-        import random
-        
-        # Try to import the image generator for Phase 3 features
-        try:
-            from utils.image_generator import ImageGenerator
-            has_image_generator = True
-        except ImportError:
-            has_image_generator = False
+        # The same few names are recorded over and over, keep one copy of each
+        test_name = sys.intern(test_name)
         
         # Add to performed tests
         self.tests_performed.append({
             'test': test_name,
-            'time': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            'time_ns': time.time_ns()
         })
         
         # Phase 3: Generate detailed test results with imaging when applicable
@@ -365,445 +805,426 @@ class Patient:
         # Higher chance of abnormal result if condition is severe
         abnormal_chance += min(0.2, self.condition_severity * 0.02)
         
-        is_abnormal = random.random() < abnormal_chance
+        is_abnormal = _random() < abnormal_chance
         result['is_abnormal'] = is_abnormal
         
         # Generate test-specific results
-        if test_name == "Blood Pressure":
-            # Get stored values or generate new ones
-            systolic = self.vital_signs.systolic_bp
-            diastolic = self.vital_signs.diastolic_bp
-            
-            # Classification
-            bp_category = "Normal"
-            if systolic >= 180 or diastolic >= 120:
-                bp_category = "Hypertensive Crisis"
-            elif systolic >= 140 or diastolic >= 90:
-                bp_category = "Stage 2 Hypertension"
-            elif systolic >= 130 or diastolic >= 80:
-                bp_category = "Stage 1 Hypertension"
-            elif systolic >= 120 and systolic < 130 and diastolic < 80:
-                bp_category = "Elevated"
-                
-            result['details'] = {
-                'systolic': systolic,
-                'diastolic': diastolic,
-                'category': bp_category
-            }
+        handler = self._TEST_HANDLERS.get(test_name, Patient._test_generic)
+        handler(self, test_name, result, is_abnormal)
+        
+        return result
+    
+    def _test_blood_pressure(self, test_name: str, result: Dict, is_abnormal: bool) -> None:
+        """Blood Pressure: classify the current reading."""
+        # Get stored values or generate new ones
+        systolic = self.vital_signs.systolic_bp
+        diastolic = self.vital_signs.diastolic_bp
+        
+        # Classification
+        bp_index = VitalSigns.classify_bp(systolic, diastolic)
+        bp_category = _BP_CATEGORIES[bp_index]
             
-            if bp_category != "Normal":
-                result['is_abnormal'] = True
-                result['interpretation'] = f"Patient has {bp_category}."
-                if bp_category == "Hypertensive Crisis":
-                    result['recommendations'].append("Immediate medical attention required.")
-                elif bp_category in ["Stage 1 Hypertension", "Stage 2 Hypertension"]:
-                    result['recommendations'].append("Consider anti-hypertensive medications.")
-                    result['recommendations'].append("Recommend lifestyle modifications including diet and exercise.")
-                else:
-                    result['recommendations'].append("Recommend lifestyle modifications and monitoring.")
+        result['details'] = {
+            'systolic': systolic,
+            'diastolic': diastolic,
+            'category': bp_category
+        }
+        
+        if bp_category != "Normal":
+            result['is_abnormal'] = True
+            result['interpretation'] = f"Patient has {bp_category}."
+            result['recommendations'].extend(_BP_RECOMMENDATIONS[bp_index])
+        else:
+            result['interpretation'] = "Blood pressure is within normal range."
+    
+    def _test_basic_blood_test(self, test_name: str, result: Dict, is_abnormal: bool) -> None:
+        """Basic Blood Test: blood panel, detailed when the image generator is available."""
+        ImageGenerator = _get_image_generator()
+        
+        # Generate blood test results
+        condition = None
+        if is_abnormal:
+            # If we expect abnormal results, pick a condition based on symptoms
+            if self._symptom_mask & _COUGH_FEVER:
+                condition = "infection"
+            elif self._symptom_mask & _RESP_CARDIAC:
+                condition = "cardiac"
+            elif self._symptom_mask & _FATIGUE_HEADACHE:
+                condition = "anemia"
             else:
-                result['interpretation'] = "Blood pressure is within normal range."
-                
-        elif test_name == "Basic Blood Test":
-            # Generate blood test results
-            condition = None
-            if is_abnormal:
-                # If we expect abnormal results, pick a condition based on symptoms
-                if "Fever" in self.current_symptoms or "Cough" in self.current_symptoms:
-                    condition = "infection"
-                elif "Shortness of Breath" in self.current_symptoms or "Chest Pain" in self.current_symptoms:
-                    condition = "cardiac"
-                elif "Fatigue" in self.current_symptoms or "Headache" in self.current_symptoms:
-                    condition = "anemia"
-                else:
-                    # Random abnormality
-                    condition = random.choice(["infection", "anemia", "dehydration", "liver", "kidney"])
-            
-            # Create simulated blood test results
-            blood_results = {
-                'WBC': {'value': random.uniform(4.5, 11.0), 'unit': 'x10^9/L', 'reference_range': '4.5-11.0'},
-                'RBC': {'value': random.uniform(4.2, 5.8), 'unit': 'x10^12/L', 'reference_range': '4.2-5.8'},
-                'Hemoglobin': {'value': random.uniform(13.5, 17.5), 'unit': 'g/dL', 'reference_range': '13.5-17.5'},
-                'Platelets': {'value': random.uniform(150, 400), 'unit': 'x10^9/L', 'reference_range': '150-400'},
-                'Glucose': {'value': random.uniform(70, 100), 'unit': 'mg/dL', 'reference_range': '70-100'}
-            }
-            
-            # If we have the image generator available, use it for more detailed results
-            if has_image_generator:
-                try:
-                    blood_results = ImageGenerator.generate_blood_test_results(self.patient_id, condition)
-                except Exception as e:
-                    print(f"Error generating blood test results: {e}")
+                # Random abnormality
+                condition = _choice(_BLOOD_CONDITIONS)
+        
+        # Create simulated blood test results
+        blood_results = {
+            'WBC': {'value': _uniform(4.5, 11.0), 'unit': 'x10^9/L', 'reference_range': '4.5-11.0'},
+            'RBC': {'value': _uniform(4.2, 5.8), 'unit': 'x10^12/L', 'reference_range': '4.2-5.8'},
+            'Hemoglobin': {'value': _uniform(13.5, 17.5), 'unit': 'g/dL', 'reference_range': '13.5-17.5'},
+            'Platelets': {'value': _uniform(150, 400), 'unit': 'x10^9/L', 'reference_range': '150-400'},
+            'Glucose': {'value': _uniform(70, 100), 'unit': 'mg/dL', 'reference_range': '70-100'}
+        }
+        
+        # If we have the image generator available, use it for more detailed results
+        if ImageGenerator is not None:
+            try:
+                blood_results = ImageGenerator.generate_blood_test_results(self.patient_id, condition)
+            except Exception as e:
+                print(f"Error generating blood test results: {e}")
+        
+        # Extract the most important values for the details
+        result['details'] = {
+            key: f"{(value := blood_results[name])['value']:.1f} {value['unit']}"
+            for key, name in _BLOOD_KEYS
+        }
+        
+        # Store full results in the test_data field
+        full_results = {k: v for k, v in blood_results.items() if k not in ['patient_id', 'timestamp']}
+        result['full_results'] = full_results
+        
+        # Generate interpretation based on abnormal values, noting which tests are off in the same pass
+        abnormal_values = []
+        abnormal_tests = set()
+        for test, data in full_results.items():
+            if isinstance(data, dict) and data.get('abnormal', False):
+                abnormal_values.append((test, data))
+                abnormal_tests.add(test)
+        
+        if abnormal_values:
+            result['is_abnormal'] = True
+            # Only the first three abnormalities are spelled out
+            shown = ", ".join(
+                f"{test} is {data.get('direction', '')} ({data['value']:.1f} {data['unit']})"
+                for test, data in abnormal_values[:3]
+            )
+            interpretation = "Abnormal blood test results: " + shown
+            if len(abnormal_values) > 3:
+                interpretation += f", and {len(abnormal_values) - 3} more abnormalities."
+            result['interpretation'] = interpretation
             
-            # Extract the most important values for the details
-            result['details'] = {
-                'wbc': f"{blood_results['WBC']['value']:.1f} {blood_results['WBC']['unit']}",
-                'rbc': f"{blood_results['RBC']['value']:.1f} {blood_results['RBC']['unit']}",
-                'hemoglobin': f"{blood_results['Hemoglobin']['value']:.1f} {blood_results['Hemoglobin']['unit']}",
-                'platelets': f"{blood_results['Platelets']['value']:.1f} {blood_results['Platelets']['unit']}",
-                'glucose': f"{blood_results['Glucose']['value']:.1f} {blood_results['Glucose']['unit']}"
-            }
+            # Add recommendations
+            recommendations = result['recommendations']
+            if 'WBC' in abnormal_tests:
+                recommendations.append("Consider infection workup.")
+            if 'Hemoglobin' in abnormal_tests or 'RBC' in abnormal_tests:
+                recommendations.append("Evaluate for anemia or blood loss.")
+            if 'Glucose' in abnormal_tests:
+                recommendations.append("Check for diabetes or metabolic disorders.")
+        else:
+            result['interpretation'] = "Blood test results are within normal ranges."
+    
+    @classmethod
+    def batch_basic_blood_test(cls, patients: List['Patient']) -> List[Dict]:
+        """
+        Perform the Basic Blood Test on many patients at once.
+        
+        Each analyte is drawn for the whole batch in one vectorized call, infection and
+        anemia push WBC and Hemoglobin/RBC out of range as the image generator's panel
+        does, and out-of-range values are flagged with boolean masks.
+        
+        Args:
+            patients: Patients to test
             
-            # Store full results in the test_data field
-            full_results = {k: v for k, v in blood_results.items() if k not in ['patient_id', 'timestamp']}
-            result['full_results'] = full_results
+        Returns:
+            List of test result dicts in the same shape as perform_test, one per patient
+        """
+        n = len(patients)
+        if not n:
+            return []
+        test_name = "Basic Blood Test"
+        
+        # Stack the per-patient inputs into arrays
+        symptom_counts = np.fromiter((len(p._current_symptoms) for p in patients), dtype=np.int16, count=n)
+        severity = np.fromiter((p.condition_severity for p in patients), dtype=np.float64, count=n)
+        masks = [p._symptom_mask for p in patients]
+        cough_fever = np.fromiter((m & _COUGH_FEVER != 0 for m in masks), dtype=bool, count=n)
+        resp_cardiac = np.fromiter((m & _RESP_CARDIAC != 0 for m in masks), dtype=bool, count=n)
+        fatigue_headache = np.fromiter((m & _FATIGUE_HEADACHE != 0 for m in masks), dtype=bool, count=n)
+        
+        # Same abnormal chance as perform_test
+        abnormal_chance = 0.2 + np.minimum(0.6, symptom_counts * 0.1) + np.minimum(0.2, severity * 0.02)
+        is_abnormal = _RNG.random(n) < abnormal_chance
+        
+        # Symptom-driven condition, otherwise a random one; only infection and anemia touch this panel
+        random_condition = _RNG.integers(0, len(_BLOOD_CONDITIONS), n)
+        unexplained = ~cough_fever & ~resp_cardiac & ~fatigue_headache
+        infection = is_abnormal & (cough_fever | (unexplained & (random_condition == _BLOOD_INFECTION)))
+        anemia = is_abnormal & ~cough_fever & ~resp_cardiac & (
+            fatigue_headache | (random_condition == _BLOOD_ANEMIA))
+        
+        values = {name: _RNG.uniform(low, high, n) for _, name, low, high, _ in _BLOOD_PANEL}
+        values['WBC'][infection] = _RNG.uniform(11.1, 20.0, np.count_nonzero(infection))
+        n_anemia = np.count_nonzero(anemia)
+        values['Hemoglobin'][anemia] = _RNG.uniform(8.0, 13.0, n_anemia)
+        values['RBC'][anemia] = _RNG.uniform(3.0, 4.1, n_anemia)
+        
+        # Out-of-range masks and formatted detail strings, one column at a time
+        columns = []
+        for key, name, low, high, unit in _BLOOD_PANEL:
+            col = values[name]
+            columns.append((
+                key, name, unit, f"{low}-{high}",
+                col.tolist(),
+                (col < low).tolist(),
+                (col > high).tolist(),
+                list(map(f"%.1f {unit}".__mod__, col.tolist()))
+            ))
+        
+        now = time.time_ns()
+        results = []
+        for i, patient in enumerate(patients):
+            patient.tests_performed.append({'test': test_name, 'time_ns': now})
             
-            # Generate interpretation based on abnormal values
+            details = {}
+            full_results = {}
             abnormal_values = []
-            for test, data in full_results.items():
-                if isinstance(data, dict) and data.get('abnormal', False):
-                    direction = data.get('direction', '')
-                    abnormal_values.append(f"{test} is {direction} ({data['value']:.1f} {data['unit']})")
+            for key, name, unit, reference_range, col, low, high, text in columns:
+                details[key] = text[i]
+                data = {'value': col[i], 'unit': unit, 'reference_range': reference_range,
+                        'abnormal': low[i] or high[i]}
+                if data['abnormal']:
+                    data['direction'] = 'low' if low[i] else 'high'
+                    abnormal_values.append((name, data))
+                full_results[name] = data
             
+            result = {
+                'success': True,
+                'message': f"Test '{test_name}' performed successfully.",
+                'details': details,
+                'interpretation': "Blood test results are within normal ranges.",
+                'is_abnormal': bool(is_abnormal[i]),
+                'recommendations': [],
+                'full_results': full_results
+            }
             if abnormal_values:
                 result['is_abnormal'] = True
-                result['interpretation'] = "Abnormal blood test results: " + ", ".join(abnormal_values[:3])
-                if len(abnormal_values) > 3:
-                    result['interpretation'] += f", and {len(abnormal_values) - 3} more abnormalities."
-                
-                # Add recommendations
-                if any('WBC' in val for val in abnormal_values):
+                result['interpretation'] = "Abnormal blood test results: " + ", ".join(
+                    f"{name} is {data['direction']} ({data['value']:.1f} {data['unit']})"
+                    for name, data in abnormal_values
+                )
+                if full_results['WBC']['abnormal']:
                     result['recommendations'].append("Consider infection workup.")
-                if any('Hemoglobin' in val for val in abnormal_values) or any('RBC' in val for val in abnormal_values):
+                if full_results['Hemoglobin']['abnormal'] or full_results['RBC']['abnormal']:
                     result['recommendations'].append("Evaluate for anemia or blood loss.")
-                if any('Glucose' in val for val in abnormal_values):
-                    result['recommendations'].append("Check for diabetes or metabolic disorders.")
-            else:
-                result['interpretation'] = "Blood test results are within normal ranges."
-                
-        elif test_name == "ECG/EKG":
-            # Determine if ECG should be abnormal based on symptoms
-            is_abnormal_ecg = is_abnormal or "Chest Pain" in self.current_symptoms
-            
-            # Initialize with basic info
-            ecg_image_path = None
-            
-            # Generate ECG image if image generator is available
-            if has_image_generator:
-                try:
-                    ecg_image_path = ImageGenerator.generate_ecg(
-                        self.patient_id,
-                        self.vital_signs.pulse,
-                        abnormal=is_abnormal_ecg
-                    )
-                except Exception as e:
-                    print(f"Error generating ECG image: {e}")
-            
-            # Get interpretation
-            if is_abnormal_ecg:
-                # Simulate an abnormal finding
-                if "Chest Pain" in self.current_symptoms:
-                    interpretation = random.choice([
-                        "ST segment elevation suggestive of myocardial infarction.",
-                        "ST depression indicating possible ischemia.",
-                        "T wave inversion in leads V3-V5, concerning for ischemia.",
-                        "Prolonged QT interval, requiring further evaluation."
-                    ])
-                    
-                    # Add recommendations
-                    result['recommendations'].append("Consider cardiac enzymes.")
-                    result['recommendations'].append("Cardiology consultation recommended.")
-                    if "ST segment elevation" in interpretation:
-                        result['recommendations'].append("Urgent cardiac catheterization may be indicated.")
-                else:
-                    interpretation = random.choice([
-                        "Non-specific ST-T wave changes.",
-                        "Sinus tachycardia.",
-                        "Premature ventricular contractions (PVCs).",
-                        "Left ventricular hypertrophy pattern."
-                    ])
-                    
-                    result['recommendations'].append("Consider cardiac follow-up if clinically indicated.")
-            else:
-                interpretation = "Normal sinus rhythm with no acute ST-T wave changes."
-            
-            result['details'] = {
-                'heart_rate': f"{self.vital_signs.pulse} BPM",
-                'rhythm': "Regular" if not is_abnormal_ecg else "Irregular" if random.random() < 0.5 else "Regular",
-                'intervals': "Normal" if not is_abnormal_ecg else "Abnormal"
-            }
-            
-            # Add image path if available
-            if ecg_image_path:
-                result['details']['image_path'] = ecg_image_path
-            
-            result['interpretation'] = interpretation
-            result['is_abnormal'] = is_abnormal_ecg
-            
-        elif test_name == "Chest X-Ray":
-            # Determine if X-ray should be abnormal based on symptoms
-            is_abnormal_xray = is_abnormal or "Shortness of Breath" in self.current_symptoms or "Chest Pain" in self.current_symptoms
-            
-            # Determine condition for abnormal X-ray
-            condition = None
-            if is_abnormal_xray:
-                if "Cough" in self.current_symptoms and "Fever" in self.current_symptoms:
-                    condition = "pneumonia"
-                elif "Chest Pain" in self.current_symptoms:
-                    if random.random() < 0.5:
-                        condition = "cardiac"
-                    else:
-                        condition = "fracture"
-                elif "Shortness of Breath" in self.current_symptoms:
-                    condition = "cardiac" if random.random() < 0.7 else "pneumonia"
-            
-            # Initialize with empty image path
-            xray_image_path = None
-            
-            # Generate X-ray image if image generator is available
-            if has_image_generator:
-                try:
-                    xray_image_path = ImageGenerator.generate_chest_xray(
-                        self.patient_id,
-                        condition=condition
-                    )
-                except Exception as e:
-                    print(f"Error generating X-ray image: {e}")
-            
-            # Get interpretation text
-            if is_abnormal_xray and condition:
-                if condition == "pneumonia":
-                    interpretation = random.choice([
-                        "Opacity in the right lower lobe consistent with pneumonia.",
-                        "Left upper lobe infiltrate suggesting pneumonic process.",
-                        "Bilateral patchy infiltrates consistent with pneumonia."
-                    ])
-                    
-                    # Add recommendations
-                    result['recommendations'].append("Consider antibiotic therapy.")
-                    result['recommendations'].append("Follow-up imaging in 2-4 weeks to confirm resolution.")
-                elif condition == "fracture":
-                    interpretation = random.choice([
-                        "Fracture of the 7th rib on the right side.",
-                        "Acute fracture of the left 5th rib without displacement.",
-                        "Minimally displaced fracture of the right 8th rib."
-                    ])
-                    
-                    result['recommendations'].append("Pain management as needed.")
-                    result['recommendations'].append("Consider orthopedic consultation for rib fractures.")
-                elif condition == "cardiac":
-                    interpretation = random.choice([
-                        "Cardiomegaly with cardiothoracic ratio of 0.65.",
-                        "Enlarged cardiac silhouette suggesting cardiomegaly.",
-                        "Mild pulmonary vascular congestion suggesting heart failure."
-                    ])
-                    
-                    result['recommendations'].append("Cardiology consultation recommended.")
-                    result['recommendations'].append("Consider echocardiogram for further evaluation.")
-                else:
-                    interpretation = "Abnormal finding of uncertain etiology."
-            else:
-                interpretation = random.choice([
-                    "No significant abnormalities detected.",
-                    "Findings within normal limits.",
-                    "Normal examination with no pathological findings."
-                ])
-            
-            result['details'] = {
-                'findings': interpretation,
-                'quality': "Good" if random.random() < 0.8 else "Limited due to patient positioning"
-            }
-            
-            # Add image path if available
-            if xray_image_path:
-                result['details']['image_path'] = xray_image_path
-            
-            result['interpretation'] = interpretation
-            result['is_abnormal'] = is_abnormal_xray and condition is not None
-            
-        elif test_name == "Pulmonary Function Test":
-            # Generate pulmonary function results
-            normal_fev1 = 3.5  # normal forced expiratory volume in 1 second (L)
-            normal_fvc = 4.5   # normal forced vital capacity (L)
-            
-            # Modify based on symptoms
-            if "Shortness of Breath" in self.current_symptoms or is_abnormal:
-                fev1 = normal_fev1 * random.uniform(0.5, 0.8)  # reduced
-                fvc = normal_fvc * random.uniform(0.6, 0.9)    # reduced
-                interpretation = random.choice([
-                    "Moderate obstructive pattern consistent with asthma or COPD.",
-                    "Restrictive pattern suggesting interstitial lung disease.",
-                    "Mixed obstructive and restrictive pattern."
-                ])
-                result['is_abnormal'] = True
+            results.append(result)
+        
+        return results
+    
+    def _test_ecg(self, test_name: str, result: Dict, is_abnormal: bool) -> None:
+        """ECG/EKG: rhythm interpretation, with a tracing image when available."""
+        ImageGenerator = _get_image_generator()
+        
+        # Determine if ECG should be abnormal based on symptoms
+        is_abnormal_ecg = is_abnormal or bool(self._symptom_mask & _CHEST_PAIN)
+        
+        # Initialize with basic info
+        ecg_image_path = None
+        
+        # Generate ECG image if image generator is available
+        if ImageGenerator is not None:
+            try:
+                ecg_image_path = ImageGenerator.generate_ecg(
+                    self.patient_id,
+                    self.vital_signs.pulse,
+                    abnormal=is_abnormal_ecg
+                )
+            except Exception as e:
+                print(f"Error generating ECG image: {e}")
+        
+        # Get interpretation
+        if is_abnormal_ecg:
+            recommendations = result['recommendations']
+            # Simulate an abnormal finding
+            if self._symptom_mask & _CHEST_PAIN:
+                interpretation = _choice(_ECG_CHEST_PAIN_FINDINGS)
                 
                 # Add recommendations
-                result['recommendations'].append("Consider bronchodilator therapy.")
-                result['recommendations'].append("Chest imaging recommended.")
-                if "obstructive" in interpretation:
-                    result['recommendations'].append("Consider inhaled corticosteroids.")
+                recommendations.extend(_ECG_CHEST_PAIN_RECOMMENDATIONS)
+                if "ST segment elevation" in interpretation:
+                    recommendations.append("Urgent cardiac catheterization may be indicated.")
             else:
-                fev1 = normal_fev1 * random.uniform(0.9, 1.1)  # normal
-                fvc = normal_fvc * random.uniform(0.9, 1.1)    # normal
-                interpretation = "Normal pulmonary function with no evidence of obstruction or restriction."
-            
-            fev1_fvc_ratio = (fev1 / fvc) * 100
-            
-            result['details'] = {
-                'fev1': f"{fev1:.2f} L ({int(fev1/normal_fev1*100)}% predicted)",
-                'fvc': f"{fvc:.2f} L ({int(fvc/normal_fvc*100)}% predicted)",
-                'fev1_fvc_ratio': f"{fev1_fvc_ratio:.1f}%",
-                'dlco': f"{random.uniform(70, 100) if not result['is_abnormal'] else random.uniform(40, 70):.1f}% predicted"
-            }
-            
-            result['interpretation'] = interpretation
-            
-        elif test_name == "Physical Examination":
-            result['details'] = {
-                'general_appearance': 'Alert and oriented' if self.condition_severity < 5 else 'Distressed',
-                'skin': 'Normal' if self.condition_severity < 4 else 'Pale and clammy',
-                'lungs': 'Clear' if 'Shortness of Breath' not in self.current_symptoms else 'Wheezing noted',
-                'heart': 'Regular rhythm' if 'Chest Pain' not in self.current_symptoms else 'Irregular rhythm',
-                'abdomen': 'Soft' if 'Abdominal Pain' not in self.current_symptoms else 'Tender to palpation'
-            }
-            
-            if self.condition_severity > 3:
-                result['is_abnormal'] = True
-                result['interpretation'] = "Abnormal examination findings"
-                
-        elif test_name == "Basic Blood Test":
-            # Generate blood test values based on symptoms and condition
-            wbc = 7.5  # Normal: 4.5-11.0
-            rbc = 4.8  # Normal: 4.5-5.5
-            hgb = 14.0  # Normal: 13.5-17.5
-            hct = 42.0  # Normal: 41-50
-            plt = 250.0  # Normal: 150-450
-            
-            # Adjust values based on conditions
-            if 'Fever' in self.current_symptoms:
-                wbc += random.uniform(3.0, 7.0)  # Elevated WBC in infection
-            
-            if 'Fatigue' in self.current_symptoms:
-                hgb -= random.uniform(2.0, 4.0)  # Lower hemoglobin in anemia
-                hct -= random.uniform(5.0, 8.0)
-            
-            result['details'] = {
-                'WBC': f"{wbc:.1f} x10^9/L",
-                'RBC': f"{rbc:.1f} x10^12/L",
-                'Hemoglobin': f"{hgb:.1f} g/dL",
-                'Hematocrit': f"{hct:.1f}%",
-                'Platelets': f"{plt:.0f} x10^9/L"
-            }
-            
-            # Flag abnormal results
-            abnormal_values = []
-            if wbc > 11.0:
-                abnormal_values.append("Elevated WBC - possible infection or inflammation")
-            if hgb < 13.5:
-                abnormal_values.append("Low hemoglobin - possible anemia")
-            
-            if abnormal_values:
-                result['is_abnormal'] = True
-                result['interpretation'] = "; ".join(abnormal_values)
-                
-        elif test_name == "ECG/EKG":
-            # Generate ECG results based on heart-related symptoms
-            rhythm = "Normal sinus rhythm"
-            rate = self.vital_signs.pulse
-            intervals = "Normal"
-            st_changes = "None"
-            
-            if 'Chest Pain' in self.current_symptoms:
-                if self.condition_severity >= 7:
-                    rhythm = "Sinus tachycardia with ST elevation"
-                    st_changes = "ST elevation in leads V1-V5"
-                    result['is_abnormal'] = True
-                    result['interpretation'] = "Findings consistent with myocardial ischemia/infarction"
-                elif self.condition_severity >= 5:
-                    rhythm = "Sinus tachycardia with ST depression"
-                    st_changes = "ST depression in leads II, III, aVF"
-                    result['is_abnormal'] = True
-                    result['interpretation'] = "Findings suggestive of myocardial ischemia"
-            
-            result['details'] = {
-                'Rhythm': rhythm,
-                'Rate': f"{rate} BPM",
-                'Intervals': intervals,
-                'ST Changes': st_changes
-            }
+                interpretation = _choice(_ECG_OTHER_FINDINGS)
                 
-        elif test_name == "Blood Pressure":
-            systolic = self.vital_signs.systolic_bp
-            diastolic = self.vital_signs.diastolic_bp
-            
-            result['details'] = {
-                'Systolic': f"{systolic} mmHg",
-                'Diastolic': f"{diastolic} mmHg",
-                'Mean Arterial Pressure': f"{int((2*diastolic + systolic)/3)} mmHg"
-            }
-            
-            if systolic >= 140 or diastolic >= 90:
-                result['is_abnormal'] = True
-                result['interpretation'] = "Hypertension"
-            elif systolic <= 90 or diastolic <= 60:
-                result['is_abnormal'] = True
-                result['interpretation'] = "Hypotension"
-                
-        elif test_name == "Urinalysis":
-            # Generate urinalysis results
-            glucose = "Negative"
-            blood = "Negative"
-            protein = "Negative"
-            nitrites = "Negative"
-            leukocytes = "Negative"
-            
-            # Modify based on conditions
-            if self.condition_severity > 5:
-                if random.random() > 0.5:
-                    blood = "Positive"
-                    result['is_abnormal'] = True
-                if random.random() > 0.7:
-                    protein = "Trace"
-                    result['is_abnormal'] = True
-            
-            result['details'] = {
-                'Color': 'Yellow',
-                'Clarity': 'Clear',
-                'Specific Gravity': '1.010',
-                'pH': '6.0',
-                'Glucose': glucose,
-                'Blood': blood,
-                'Protein': protein,
-                'Nitrites': nitrites,
-                'Leukocytes': leukocytes
-            }
-            
-            if result['is_abnormal']:
-                result['interpretation'] = "Abnormal urinalysis findings"
-                
-        elif test_name == "Chest X-Ray":
-            # Generate X-ray results based on respiratory symptoms
-            finding = "Normal lung fields bilaterally. No cardiomegaly."
-            
-            if 'Shortness of Breath' in self.current_symptoms or 'Cough' in self.current_symptoms:
-                if self.condition_severity >= 6:
-                    finding = "Bilateral infiltrates present. Possible pneumonia."
-                    result['is_abnormal'] = True
-                    result['interpretation'] = "Findings consistent with pneumonia"
-                elif self.condition_severity >= 4:
-                    finding = "Mild interstitial changes noted in right lower lobe."
-                    result['is_abnormal'] = True
-                    result['interpretation'] = "Possible early pulmonary infection or inflammation"
+                recommendations.append("Consider cardiac follow-up if clinically indicated.")
+        else:
+            interpretation = "Normal sinus rhythm with no acute ST-T wave changes."
+        
+        details = {
+            'heart_rate': f"{self.vital_signs.pulse} BPM",
+            'rhythm': "Regular" if not is_abnormal_ecg else "Irregular" if _random() < 0.5 else "Regular",
+            'intervals': "Normal" if not is_abnormal_ecg else "Abnormal"
+        }
+        
+        # Add image path if available
+        if ecg_image_path:
+            details['image_path'] = ecg_image_path
+        
+        result['details'] = details
+        result['interpretation'] = interpretation
+        result['is_abnormal'] = is_abnormal_ecg
+    
+    def _test_chest_xray(self, test_name: str, result: Dict, is_abnormal: bool) -> None:
+        """Chest X-Ray: findings driven by respiratory and cardiac symptoms."""
+        ImageGenerator = _get_image_generator()
+        
+        # Determine if X-ray should be abnormal based on symptoms
+        is_abnormal_xray = is_abnormal or bool(self._symptom_mask & _RESP_CARDIAC)
+        
+        # Determine condition for abnormal X-ray
+        condition = None
+        if is_abnormal_xray:
+            if (self._symptom_mask & _COUGH_FEVER) == _COUGH_FEVER:
+                condition = "pneumonia"
+            elif self._symptom_mask & _CHEST_PAIN:
+                if _random() < 0.5:
+                    condition = "cardiac"
+                else:
+                    condition = "fracture"
+            elif self._symptom_mask & _SHORTNESS_OF_BREATH:
+                condition = "cardiac" if _random() < 0.7 else "pneumonia"
+        
+        # Initialize with empty image path
+        xray_image_path = None
+        
+        # Generate X-ray image if image generator is available
+        if ImageGenerator is not None:
+            try:
+                xray_image_path = ImageGenerator.generate_chest_xray(
+                    self.patient_id,
+                    condition=condition
+                )
+            except Exception as e:
+                print(f"Error generating X-ray image: {e}")
+        
+        # Get interpretation text
+        if is_abnormal_xray and condition:
+            if condition == "pneumonia":
+                interpretation = _choice(_XRAY_PNEUMONIA_FINDINGS)
+            elif condition == "fracture":
+                interpretation = _choice(_XRAY_FRACTURE_FINDINGS)
+            else:
+                interpretation = _choice(_XRAY_CARDIAC_FINDINGS)
             
-            result['details'] = {
-                'Findings': finding,
-                'Heart Size': 'Normal' if 'Heart Failure' not in self.medical_history else 'Enlarged',
-                'Lung Fields': 'Clear' if not result['is_abnormal'] else 'Abnormal'
-            }
+            # Add recommendations
+            result['recommendations'].extend(_XRAY_RECOMMENDATIONS[condition])
+        else:
+            interpretation = _choice(_XRAY_NORMAL_FINDINGS)
+        
+        details = {
+            'findings': interpretation,
+            'quality': "Good" if _random() < 0.8 else "Limited due to patient positioning"
+        }
         
+        # Add image path if available
+        if xray_image_path:
+            details['image_path'] = xray_image_path
+        
+        result['details'] = details
+        result['interpretation'] = interpretation
+        result['is_abnormal'] = is_abnormal_xray and condition is not None
+    
+    def _test_pulmonary_function(self, test_name: str, result: Dict, is_abnormal: bool) -> None:
+        """Pulmonary Function Test: spirometry values and pattern."""
+        # Reduced values with breathing difficulty or an abnormal draw
+        abnormal = is_abnormal or bool(self._symptom_mask & _SHORTNESS_OF_BREATH)
+        fev1, fvc, dlco = _pft_values(abnormal)
+        if abnormal:
+            interpretation, recommendations = _choice(_PFT_ABNORMAL_PATTERNS)
+            result['is_abnormal'] = True
+            
+            # Add recommendations
+            result['recommendations'].extend(recommendations)
         else:
-            # Generic test result for tests not specifically implemented
-            result['details'] = {
-                'Test Completed': 'Yes',
-                'Quality': 'Good'
+            interpretation = "Normal pulmonary function with no evidence of obstruction or restriction."
+        
+        fev1_fvc_ratio = (fev1 / fvc) * 100
+        
+        result['details'] = {
+            'fev1': _PFT_VOLUME_FORMAT(fev1, int(fev1 * _FEV1_PERCENT)),
+            'fvc': _PFT_VOLUME_FORMAT(fvc, int(fvc * _FVC_PERCENT)),
+            'fev1_fvc_ratio': _PFT_RATIO_FORMAT(fev1_fvc_ratio),
+            'dlco': _PFT_DLCO_FORMAT(dlco)
+        }
+        
+        result['interpretation'] = interpretation
+    
+    def _test_physical_exam(self, test_name: str, result: Dict, is_abnormal: bool) -> None:
+        """Physical Examination: findings from symptoms and severity."""
+        key = (self._symptom_mask & _PHYS_EXAM_SYMPTOMS, self.condition_severity)
+        details = _phys_exam_cache.get(key)
+        if details is None:
+            mask, severity = key
+            details = _phys_exam_cache[key] = {
+                'general_appearance': 'Alert and oriented' if severity < 5 else 'Distressed',
+                'skin': 'Normal' if severity < 4 else 'Pale and clammy',
+                'lungs': 'Clear' if not mask & _SHORTNESS_OF_BREATH else 'Wheezing noted',
+                'heart': 'Regular rhythm' if not mask & _CHEST_PAIN else 'Irregular rhythm',
+                'abdomen': 'Soft' if not mask & _ABDOMINAL_PAIN else 'Tender to palpation'
             }
-            
-            # Random abnormality based on condition severity
-            if random.random() < (self.condition_severity / 10):
+        result['details'] = details.copy()
+        
+        if self.condition_severity > 3:
+            result['is_abnormal'] = True
+            result['interpretation'] = "Abnormal examination findings"
+    
+    def _test_urinalysis(self, test_name: str, result: Dict, is_abnormal: bool) -> None:
+        """Urinalysis: dipstick results, abnormal more often in severe conditions."""
+        # Generate urinalysis results
+        glucose = "Negative"
+        blood = "Negative"
+        protein = "Negative"
+        nitrites = "Negative"
+        leukocytes = "Negative"
+        
+        # Modify based on conditions
+        if self.condition_severity > 5:
+            # Both draws are taken up front and index the readings directly
+            blood_positive = _random() > 0.5
+            protein_trace = _random() > 0.7
+            blood = _URINE_BLOOD[blood_positive]
+            protein = _URINE_PROTEIN[protein_trace]
+            if blood_positive or protein_trace:
                 result['is_abnormal'] = True
-                result['interpretation'] = f"Abnormal findings on {test_name}"
         
-        return result
+        result['details'] = {
+            'Color': 'Yellow',
+            'Clarity': 'Clear',
+            'Specific Gravity': '1.010',
+            'pH': '6.0',
+            'Glucose': glucose,
+            'Blood': blood,
+            'Protein': protein,
+            'Nitrites': nitrites,
+            'Leukocytes': leukocytes
+        }
+        
+        if result['is_abnormal']:
+            result['interpretation'] = "Abnormal urinalysis findings"
+    
+    def _test_generic(self, test_name: str, result: Dict, is_abnormal: bool) -> None:
+        """Fallback for tests without a specific handler: abnormal with chance severity/10."""
+        # Generic test result for tests not specifically implemented
+        result['details'] = {
+            'Test Completed': 'Yes',
+            'Quality': 'Good'
+        }
+        
+        # Random abnormality based on condition severity
+        if _random() < (self.condition_severity / 10):
+            result['is_abnormal'] = True
+            result['interpretation'] = f"Abnormal findings on {test_name}"
+    
+    # Test name -> handler; each handler fills in result from the patient's state
+    # Keys are interned, and so is every name passing through perform_test, so the
+    # dispatch lookup matches on identity rather than comparing string contents
+    _TEST_HANDLERS = {sys.intern(name): handler for name, handler in {
+        "Blood Pressure": _test_blood_pressure,
+        "Basic Blood Test": _test_basic_blood_test,
+        "ECG/EKG": _test_ecg,
+        "Chest X-Ray": _test_chest_xray,
+        "Pulmonary Function Test": _test_pulmonary_function,
+        "Physical Examination": _test_physical_exam,
+        "Urinalysis": _test_urinalysis
+    }.items()}
     
     def update_condition(self, severity_change: int) -> None:
         """
@@ -816,32 +1237,19 @@ class Patient:
         self.condition_severity = max(1, min(10, new_severity))  # Keep between 1-10
         
         # Update vital signs based on condition change
-        # Simple algorithm for Phase 1 - will be more sophisticated in later phases
-        if severity_change > 0:  # Condition worsening
-            pulse_change = random.randint(5, 15)
-            bp_change = random.randint(5, 15)
-            self.vital_signs.update_vitals(
-                pulse=self.vital_signs.pulse + pulse_change,
-                systolic_bp=self.vital_signs.systolic_bp + bp_change,
-                diastolic_bp=self.vital_signs.diastolic_bp + bp_change // 2,
-                oxygen_saturation=max(70, self.vital_signs.oxygen_saturation - random.randint(1, 5))
-            )
-        elif severity_change < 0:  # Condition improving
-            pulse_change = random.randint(5, 10)
-            bp_change = random.randint(5, 10)
-            self.vital_signs.update_vitals(
-                pulse=max(60, self.vital_signs.pulse - pulse_change),
-                systolic_bp=max(90, self.vital_signs.systolic_bp - bp_change),
-                diastolic_bp=max(60, self.vital_signs.diastolic_bp - bp_change // 2),
-                oxygen_saturation=min(100, self.vital_signs.oxygen_saturation + random.randint(1, 3))
-            )
+        if severity_change:
+            vs = self.vital_signs
+            vs.pulse, vs.systolic_bp, vs.diastolic_bp, vs.oxygen_saturation = _apply_severity_delta(
+                vs.pulse, vs.systolic_bp, vs.diastolic_bp, vs.oxygen_saturation, severity_change)
     
     def is_critical(self) -> bool:
         """Check if patient is in critical condition based on vital signs."""
-        return (self.condition_severity >= 8 or
-                self.vital_signs.pulse > 120 or self.vital_signs.pulse < 50 or
-                self.vital_signs.systolic_bp > 180 or self.vital_signs.systolic_bp < 90 or
-                self.vital_signs.oxygen_saturation < 90)
+        if self.condition_severity >= 8:
+            return True
+        vs = self.vital_signs
+        return (not 50 <= vs.pulse <= 120 or
+                not 90 <= vs.systolic_bp <= 180 or
+                vs.oxygen_saturation < 90)
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'Patient':
@@ -855,26 +1263,267 @@ class Patient:
         Returns:
             Patient instance
         """
+        get = data.get
         vital_signs = None
         if 'vital_signs' in data:
-            v = data['vital_signs']
-            vital_signs = VitalSigns(
-                pulse=v.get('pulse', 80),
-                systolic_bp=v.get('systolic_bp', 120),
-                diastolic_bp=v.get('diastolic_bp', 80),
-                temperature=v.get('temperature', 36.6),
-                respiratory_rate=v.get('respiratory_rate', 16),
-                oxygen_saturation=v.get('oxygen_saturation', 98)
-            )
+            # Positional, in VitalSigns.__init__ order, straight from the schema table
+            vital_signs = VitalSigns(*map(data['vital_signs'].get, _VITAL_FIELD_NAMES, _VITAL_DEFAULTS))
         
         return cls(
-            patient_id=data.get('patient_id', ''),
-            name=data.get('name', ''),
-            age=data.get('age', 30),
-            gender=data.get('gender', ''),
-            medical_history=data.get('medical_history', []),
-            current_symptoms=data.get('current_symptoms', []),
-            vital_signs=vital_signs,
-            diagnosis=data.get('diagnosis', None),
-            condition_severity=data.get('condition_severity', 1)
+            get('patient_id', ''),
+            get('name', ''),
+            get('age', 30),
+            get('gender', ''),
+            get('medical_history', []),
+            get('current_symptoms', []),
+            vital_signs,
+            get('diagnosis', None),
+            get('condition_severity', 1)
         )
+
+class Cohort:
+    """
+    Many patients stored column-wise (one NumPy array per vital sign) so a treatment
+    can be applied to all of them with a few vectorized operations.
+    
+    Only the numeric state is simulated: vitals, severity and symptoms. No per-patient
+    result messages or treatment history are produced; call write_back() to copy the
+    state back onto the Patient objects.
+    """
+    def __init__(self, patients: List[Patient], seed: Optional[int] = None):
+        """
+        Build the column arrays from a list of patients.
+        
+        Args:
+            patients: Patients to simulate together
+            seed: Optional seed for the cohort's random generator
+        """
+        self.patients = patients
+        self.size = len(patients)
+        self.rng = np.random.default_rng(seed)
+        self._load()
+    
+    def _load(self) -> None:
+        """Read the column arrays from the Patient objects."""
+        patients = self.patients
+        vitals = [patient.vital_signs for patient in patients]
+        self.pulse = np.array([v.pulse for v in vitals], dtype=np.int16)
+        self.systolic_bp = np.array([v.systolic_bp for v in vitals], dtype=np.int16)
+        self.diastolic_bp = np.array([v.diastolic_bp for v in vitals], dtype=np.int16)
+        self.temperature = np.array([v.temperature for v in vitals], dtype=np.float64)
+        self.respiratory_rate = np.array([v.respiratory_rate for v in vitals], dtype=np.int16)
+        self.oxygen_saturation = np.array([v.oxygen_saturation for v in vitals], dtype=np.int16)
+        self.severity = np.array([patient.condition_severity for patient in patients], dtype=np.int8)
+        
+        # Symptoms as a patients x symptom-types boolean matrix
+        self.symptom_names = sorted(set().union(*(patient._symptom_set for patient in patients)))
+        self._symptom_index = {name: i for i, name in enumerate(self.symptom_names)}
+        self.symptoms = np.zeros((self.size, len(self.symptom_names)), dtype=bool)
+        for row, patient in enumerate(patients):
+            self.symptoms[row, [self._symptom_index[name] for name in patient._symptom_set]] = True
+    
+    def has_symptom(self, name: str) -> np.ndarray:
+        """Return a boolean mask of the patients that have the symptom."""
+        column = self._symptom_index.get(name)
+        if column is None:
+            return np.zeros(self.size, dtype=bool)
+        return self.symptoms[:, column].copy()
+    
+    def _has_any_symptom(self, names) -> np.ndarray:
+        """Return a boolean mask of the patients that have at least one of the symptoms."""
+        columns = [self._symptom_index[name] for name in names if name in self._symptom_index]
+        return self.symptoms[:, columns].any(axis=1)
+    
+    def _symptom_column(self, name: str) -> int:
+        """Return the matrix column for a symptom, adding one if it is new."""
+        column = self._symptom_index.get(name)
+        if column is None:
+            column = len(self.symptom_names)
+            self.symptom_names.append(name)
+            self._symptom_index[name] = column
+            self.symptoms = np.hstack((self.symptoms, np.zeros((self.size, 1), dtype=bool)))
+        return column
+    
+    def _randint(self, low: int, high: int) -> np.ndarray:
+        """Draw one integer in [low, high] per patient, like random.randint."""
+        return self.rng.integers(low, high + 1, size=self.size)
+    
+    def _relieve(self, name: str, chance: float) -> np.ndarray:
+        """Remove a symptom from each patient that has it with the given chance."""
+        present = self.has_symptom(name)
+        relieved = present & (self.rng.random(self.size) < chance)
+        if relieved.any():
+            self.symptoms[relieved, self._symptom_index[name]] = False
+        return present
+    
+    def apply_treatment(self, treatment: str) -> np.ndarray:
+        """
+        Apply a treatment to every patient in the cohort.
+        
+        Treatments without a vectorized kernel fall back to Patient.apply_treatment
+        on each patient.
+        
+        Args:
+            treatment: Name of the treatment applied
+            
+        Returns:
+            Array with the severity change for each patient
+        """
+        kernel = self._TREATMENT_KERNELS.get(treatment)
+        if kernel is None:
+            self.write_back()
+            changes = np.array([patient.apply_treatment(treatment)['severity_change'] for patient in self.patients],
+                               dtype=np.int8)
+            self._load()
+            return changes
+        
+        changes = kernel(self)
+        self.update_condition(changes)
+        return changes
+    
+    def _tx_beta_blockers(self) -> np.ndarray:
+        """Beta-blockers: lower high heart rate and blood pressure, may relieve chest pain."""
+        fast = self.pulse > 90
+        self.pulse[fast] = np.maximum(70, self.pulse - self._randint(10, 25))[fast]
+        
+        high = (self.systolic_bp > 140) | (self.diastolic_bp > 90)
+        self.systolic_bp[high] = np.maximum(120, self.systolic_bp - self._randint(15, 30))[high]
+        self.diastolic_bp[high] = np.maximum(80, self.diastolic_bp - self._randint(5, 15))[high]
+        
+        chest_pain = self._relieve('Chest Pain', 0.6)
+        return np.where(fast | high | chest_pain, -2, -1).astype(np.int8)
+    
+    def _tx_ace_inhibitors(self) -> np.ndarray:
+        """ACE Inhibitors: lower blood pressure, possibly too far when it is already normal."""
+        high = (self.systolic_bp > 130) | (self.diastolic_bp > 85)
+        systolic = np.where(high,
+                            np.maximum(120, self.systolic_bp - self._randint(10, 20)),
+                            np.maximum(90, self.systolic_bp - self._randint(5, 15)))
+        diastolic = np.where(high,
+                             np.maximum(80, self.diastolic_bp - self._randint(5, 10)),
+                             np.maximum(60, self.diastolic_bp - self._randint(3, 8)))
+        self.systolic_bp[:] = systolic
+        self.diastolic_bp[:] = diastolic
+        
+        # Hypotension side effect causes dizziness and worsens the condition
+        hypotensive = ~high & (systolic < 100)
+        if hypotensive.any():
+            # Resolve the column first: adding it rebinds self.symptoms
+            column = self._symptom_column('Dizziness')
+            self.symptoms[hypotensive, column] = True
+        return np.select([high, hypotensive], [-1, 1], 0).astype(np.int8)
+    
+    def _tx_oxygen_therapy(self) -> np.ndarray:
+        """Oxygen Therapy: raise low oxygen saturation, may relieve shortness of breath."""
+        low = self.oxygen_saturation < 95
+        self.oxygen_saturation[low] = np.minimum(99, self.oxygen_saturation + self._randint(3, 8))[low]
+        
+        relieved = self.has_symptom('Shortness of Breath') & low & (self.rng.random(self.size) < 0.7)
+        if relieved.any():
+            self.symptoms[relieved, self._symptom_index['Shortness of Breath']] = False
+        return np.where(low, -2, 0).astype(np.int8)
+    
+    def _tx_iv_fluids(self) -> np.ndarray:
+        """IV Fluids: raise low blood pressure, may relieve dizziness."""
+        low = self.systolic_bp < 100
+        self.systolic_bp[low] = np.minimum(120, self.systolic_bp + self._randint(10, 20))[low]
+        self.diastolic_bp[low] = np.minimum(80, self.diastolic_bp + self._randint(5, 10))[low]
+        
+        self._relieve('Dizziness', 0.8)
+        return np.full(self.size, -1, dtype=np.int8)
+    
+    def _tx_pain_relief(self) -> np.ndarray:
+        """Pain Relief: clear headache and general pain, ease other pain."""
+        targets = self._has_any_symptom(_PAIN_RELIEF_NAMES)
+        for name in _PAIN_REMOVE:
+            column = self._symptom_index.get(name)
+            if column is not None:
+                self.symptoms[:, column] = False
+        return np.where(targets, -1, 0).astype(np.int8)
+    
+    def _tx_antibiotics(self) -> np.ndarray:
+        """Antibiotics: fever and cough improve, faster where the antibiotic is effective."""
+        targets = self._has_any_symptom(_ANTIBIOTIC_NAMES)
+        effective = targets & (self.rng.random(self.size) < 0.7)
+        
+        feverish = effective & (self.temperature > 37.5)
+        self.temperature[feverish] = np.maximum(
+            36.8, self.temperature - self.rng.uniform(0.5, 1.2, self.size))[feverish]
+        return np.select([effective, targets], [-2, -1], 0).astype(np.int8)
+    
+    def _tx_defibrillation(self) -> np.ndarray:
+        """Defibrillation: restore the rhythm of severe chest-pain patients most of the time."""
+        indicated = (self.severity >= 8) & self.has_symptom('Chest Pain')
+        restored = indicated & (self.rng.random(self.size) < 0.7)
+        self.pulse[restored] = self._randint(70, 90)[restored]
+        return np.select([restored, indicated], [-3, -1], 0).astype(np.int8)
+    
+    def _tx_intubation(self) -> np.ndarray:
+        """Intubation: secure the airway of severely hypoxic or breathless patients."""
+        needed = (self.oxygen_saturation < 85) | (self.has_symptom('Shortness of Breath') & (self.severity >= 7))
+        self.oxygen_saturation[needed] = np.minimum(98, self.oxygen_saturation + self._randint(10, 15))[needed]
+        self.respiratory_rate[needed] = 14  # Controlled by ventilator
+        return np.where(needed, -3, 0).astype(np.int8)
+    
+    # Treatment name -> vectorized kernel returning the per-patient severity change
+    _TREATMENT_KERNELS = {
+        "Pain Relief": _tx_pain_relief,
+        "Antibiotics": _tx_antibiotics,
+        "Beta-blockers": _tx_beta_blockers,
+        "ACE Inhibitors": _tx_ace_inhibitors,
+        "Oxygen Therapy": _tx_oxygen_therapy,
+        "IV Fluids": _tx_iv_fluids,
+        "Defibrillation": _tx_defibrillation,
+        "Intubation": _tx_intubation
+    }
+    
+    def update_condition(self, severity_change: np.ndarray) -> None:
+        """
+        Vectorized Patient.update_condition for every patient in the cohort.
+        
+        Args:
+            severity_change: Per-patient change to condition severity
+        """
+        self.severity[:] = np.clip(self.severity + severity_change, 1, 10)
+        
+        worse = severity_change > 0
+        if worse.any():
+            bp_change = self._randint(5, 15)
+            self.pulse[worse] = (self.pulse + self._randint(5, 15))[worse]
+            self.systolic_bp[worse] = (self.systolic_bp + bp_change)[worse]
+            self.diastolic_bp[worse] = (self.diastolic_bp + bp_change // 2)[worse]
+            self.oxygen_saturation[worse] = np.maximum(70, self.oxygen_saturation - self._randint(1, 5))[worse]
+        
+        better = severity_change < 0
+        if better.any():
+            bp_change = self._randint(5, 10)
+            self.pulse[better] = np.maximum(60, self.pulse - self._randint(5, 10))[better]
+            self.systolic_bp[better] = np.maximum(90, self.systolic_bp - bp_change)[better]
+            self.diastolic_bp[better] = np.maximum(60, self.diastolic_bp - bp_change // 2)[better]
+            self.oxygen_saturation[better] = np.minimum(100, self.oxygen_saturation + self._randint(1, 3))[better]
+    
+    def is_critical(self) -> np.ndarray:
+        """Vectorized Patient.is_critical: a boolean mask of the patients in critical condition."""
+        return ((self.severity >= 8) |
+                (self.pulse > 120) | (self.pulse < 50) |
+                (self.systolic_bp > 180) | (self.systolic_bp < 90) |
+                (self.oxygen_saturation < 90))
+    
+    def write_back(self) -> None:
+        """Copy the cohort state back onto the Patient objects."""
+        columns = zip(self.pulse.tolist(), self.systolic_bp.tolist(), self.diastolic_bp.tolist(),
+                      self.temperature.tolist(), self.respiratory_rate.tolist(),
+                      self.oxygen_saturation.tolist(), self.severity.tolist())
+        names = self.symptom_names
+        for row, (patient, values) in enumerate(zip(self.patients, columns)):
+            vitals = patient.vital_signs
+            (vitals.pulse, vitals.systolic_bp, vitals.diastolic_bp, vitals.temperature,
+             vitals.respiratory_rate, vitals.oxygen_saturation, patient.condition_severity) = values
+            
+            # Keep the existing symptom order, then append symptoms added by the cohort
+            present = {names[i] for i in np.flatnonzero(self.symptoms[row])}
+            if present != patient._symptom_set:
+                kept = [s for s in patient.current_symptoms if s in present]
+                patient.current_symptoms = kept + [name for name in names
+                                                   if name in present and name not in patient._symptom_set]
+
@@ -0,0 +1,40 @@
+"""
+Shared random source for the VirtualDoctor simulation
+"""
+from typing import List, Optional
+import numpy as np
+
+# Generator behind every simulated draw; draws for the scalar helpers are taken from it
+# in batches so the per-call cost is a list pop instead of a trip into the generator
+RNG = np.random.default_rng()
+_BATCH = 1024
+_uniform_buffer: List[float] = []
+
+
+def seed_rng(seed: Optional[int] = None) -> None:
+    """Reseed the simulation random source, e.g. for reproducible runs."""
+    # Reseeded in place so modules holding a reference to RNG follow the new seed
+    RNG.bit_generator.state = np.random.default_rng(seed).bit_generator.state
+    _uniform_buffer.clear()
+
+
+def random() -> float:
+    """Return a uniform float in [0, 1), refilling the buffer from RNG when empty."""
+    if not _uniform_buffer:
+        _uniform_buffer.extend(RNG.random(_BATCH).tolist())
+    return _uniform_buffer.pop()
+
+
+def uniform(low: float, high: float) -> float:
+    """Return a uniform float between low and high, like random.uniform."""
+    return low + (high - low) * random()
+
+
+def randint(low: int, high: int) -> int:
+    """Return a random integer in [low, high], like random.randint."""
+    return low + int(random() * (high - low + 1))
+
+
+def choice(seq):
+    """Return a random element of a non-empty sequence, like random.choice."""
+    return seq[int(random() * len(seq))]
@@ -1,24 +1,96 @@
 """
 Dashboard screen for VirtualDoctor showing user statistics and progress
 """
+from kivy.app import App
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.label import Label
 from kivy.uix.button import Button
 from kivy.uix.scrollview import ScrollView
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
 from kivy.metrics import dp
-from kivy.graphics import Color, Rectangle
+from kivy.graphics import Color, Rectangle, InstructionGroup
+from kivy.properties import StringProperty
+from kivy.utils import escape_markup
 
 from utils.db_manager import DBManager
 
+# Each stats section is one markup Label, so an update re-renders one texture
+_USER_INFO_TEMPLATE = (
+    "[b]Username:[/b]  {username}\n"
+    "[b]Email:[/b]  {email}\n"
+    "[b]Account Created:[/b]  {created}\n"
+    "[b]Last Login:[/b]  {last_login}"
+)
+_GAME_STATS_TEMPLATE = (
+    "[b]Total Patients Treated:[/b]  {patients_treated}\n"
+    "[b]Successful Diagnoses:[/b]  {successful_diagnoses}\n"
+    "[b]Current Level:[/b]  {level}\n"
+    "[b]Score:[/b]  {score}"
+)
+
+
+class ProgressRow(BoxLayout):
+    """One saved game's progress; RecycleView view class, reused across refreshes"""
+    
+    specialization = StringProperty('General')
+    level = StringProperty('1')
+    score = StringProperty('0')
+    completed_cases = StringProperty('0')
+    
+    def __init__(self, **kwargs):
+        kwargs.setdefault('orientation', 'vertical')
+        kwargs.setdefault('padding', dp(10))
+        super(ProgressRow, self).__init__(**kwargs)
+        
+        # Background as one InstructionGroup, added to the canvas exactly once; refreshes
+        # only move and resize the Rectangle, so recycled rows never accumulate instructions
+        self.rect = Rectangle(pos=self.pos, size=self.size)
+        background = InstructionGroup()
+        background.add(Color(0.9, 0.95, 1, 1))  # Light blue
+        background.add(self.rect)
+        self.canvas.before.add(background)
+        self.bind(pos=self.update_rect, size=self.update_rect)
+        
+        # Build the labels once; data updates only change their text
+        self.title_label = Label(text=f"Specialization: {self.specialization}", color=(0, 0, 0, 1), bold=True)
+        self.add_widget(self.title_label)
+        
+        details_grid = GridLayout(cols=2, spacing=dp(5))
+        for caption, prop in (("Level:", 'level'), ("Score:", 'score'), ("Cases Completed:", 'completed_cases')):
+            details_grid.add_widget(Label(text=caption, color=(0, 0, 0, 1), size_hint_x=0.4, halign='right'))
+            value_label = Label(text=getattr(self, prop), color=(0, 0, 0, 1), size_hint_x=0.6, halign='left')
+            self.bind(**{prop: value_label.setter('text')})
+            details_grid.add_widget(value_label)
+        self.add_widget(details_grid)
+    
+    def on_specialization(self, instance, value):
+        self.title_label.text = f"Specialization: {value}"
+    
+    def update_rect(self, instance, value):
+        self.rect.pos = instance.pos
+        self.rect.size = instance.size
+
+
 class DashboardScreen(Screen):
     """User dashboard showing game statistics and progress"""
     
     def __init__(self, **kwargs):
         super(DashboardScreen, self).__init__(**kwargs)
         self.user = None
-        self.create_ui()
+        # The widgets are built on first use rather than at app startup, before login
+        self._ui_built = False
+    
+    def _ensure_ui(self):
+        """Build the dashboard widgets if that has not happened yet"""
+        if not self._ui_built:
+            self._ui_built = True
+            self.create_ui()
+    
+    def on_pre_enter(self, *args):
+        self._ensure_ui()
         
     def create_ui(self):
         # Main layout
@@ -46,22 +118,10 @@ class DashboardScreen(Screen):
         self.dashboard_layout.bind(minimum_height=self.dashboard_layout.setter('height'))
         
         # Stats section
-        self.stats_layout = GridLayout(cols=2, spacing=dp(10), size_hint_y=None, height=dp(200))
-        self.stats_layout.add_widget(Label(text="Username:", color=(0.2, 0.2, 0.2, 1), bold=True, size_hint_x=0.4))
-        self.username_label = Label(text="Loading...", color=(0.2, 0.2, 0.2, 1), size_hint_x=0.6)
-        self.stats_layout.add_widget(self.username_label)
-        
-        self.stats_layout.add_widget(Label(text="Email:", color=(0.2, 0.2, 0.2, 1), bold=True, size_hint_x=0.4))
-        self.email_label = Label(text="Loading...", color=(0.2, 0.2, 0.2, 1), size_hint_x=0.6)
-        self.stats_layout.add_widget(self.email_label)
-        
-        self.stats_layout.add_widget(Label(text="Account Created:", color=(0.2, 0.2, 0.2, 1), bold=True, size_hint_x=0.4))
-        self.created_label = Label(text="Loading...", color=(0.2, 0.2, 0.2, 1), size_hint_x=0.6)
-        self.stats_layout.add_widget(self.created_label)
-        
-        self.stats_layout.add_widget(Label(text="Last Login:", color=(0.2, 0.2, 0.2, 1), bold=True, size_hint_x=0.4))
-        self.last_login_label = Label(text="Loading...", color=(0.2, 0.2, 0.2, 1), size_hint_x=0.6)
-        self.stats_layout.add_widget(self.last_login_label)
+        self.user_info_label = self._make_stats_label(dp(200))
+        self.user_info_label.text = _USER_INFO_TEMPLATE.format(
+            username="Loading...", email="Loading...", created="Loading...", last_login="Loading..."
+        )
         
         # Game progress section
         self.progress_label = Label(
@@ -73,10 +133,31 @@ class DashboardScreen(Screen):
             height=dp(40)
         )
         
-        # Progress container
+        # Progress container: holds either the progress rows or the "no progress" message
         self.progress_container = GridLayout(cols=1, spacing=dp(15), size_hint_y=None)
         self.progress_container.bind(minimum_height=self.progress_container.setter('height'))
         
+        # Progress rows are ProgressRow views recycled by a RecycleView. It sits inside the
+        # dashboard's ScrollView, so it is sized to its full content and does not scroll itself
+        self.progress_view = RecycleView(viewclass=ProgressRow, size_hint_y=None, do_scroll_x=False, do_scroll_y=False)
+        progress_rows = RecycleBoxLayout(
+            orientation='vertical',
+            spacing=dp(15),
+            default_size_hint=(1, None),
+            default_size=(None, dp(100)),
+            size_hint_y=None
+        )
+        progress_rows.bind(minimum_height=progress_rows.setter('height'))
+        progress_rows.bind(minimum_height=self.progress_view.setter('height'))
+        self.progress_view.add_widget(progress_rows)
+        
+        self.no_progress_label = Label(
+            text="No game progress yet. Start playing to see your statistics!",
+            color=(0.2, 0.2, 0.2, 1),
+            size_hint_y=None,
+            height=dp(40)
+        )
+        
         # Add gameplay statistics
         self.stats_box = BoxLayout(orientation='vertical', size_hint_y=None, height=dp(200))
         with self.stats_box.canvas.before:
@@ -93,25 +174,12 @@ class DashboardScreen(Screen):
             height=dp(40)
         )
         
-        self.stats_grid = GridLayout(cols=2, spacing=dp(10), size_hint_y=None, height=dp(150))
-        self.stats_grid.add_widget(Label(text="Total Patients Treated:", color=(0.2, 0.2, 0.2, 1), bold=True, size_hint_x=0.6))
-        self.patients_treated_label = Label(text="0", color=(0.2, 0.2, 0.2, 1), size_hint_x=0.4)
-        self.stats_grid.add_widget(self.patients_treated_label)
-        
-        self.stats_grid.add_widget(Label(text="Successful Diagnoses:", color=(0.2, 0.2, 0.2, 1), bold=True, size_hint_x=0.6))
-        self.successful_diagnoses_label = Label(text="0", color=(0.2, 0.2, 0.2, 1), size_hint_x=0.4)
-        self.stats_grid.add_widget(self.successful_diagnoses_label)
-        
-        self.stats_grid.add_widget(Label(text="Current Level:", color=(0.2, 0.2, 0.2, 1), bold=True, size_hint_x=0.6))
-        self.level_label = Label(text="1", color=(0.2, 0.2, 0.2, 1), size_hint_x=0.4)
-        self.stats_grid.add_widget(self.level_label)
-        
-        self.stats_grid.add_widget(Label(text="Score:", color=(0.2, 0.2, 0.2, 1), bold=True, size_hint_x=0.6))
-        self.score_label = Label(text="0", color=(0.2, 0.2, 0.2, 1), size_hint_x=0.4)
-        self.stats_grid.add_widget(self.score_label)
+        self.game_stats = {'patients_treated': '0', 'successful_diagnoses': '0', 'level': '1', 'score': '0'}
+        self.game_stats_label = self._make_stats_label(dp(150))
+        self.game_stats_label.text = _GAME_STATS_TEMPLATE.format(**self.game_stats)
         
         self.stats_box.add_widget(self.stats_header)
-        self.stats_box.add_widget(self.stats_grid)
+        self.stats_box.add_widget(self.game_stats_label)
         
         # Button layout
         button_layout = BoxLayout(orientation='horizontal', spacing=dp(10), size_hint_y=None, height=dp(50))
@@ -134,7 +202,7 @@ class DashboardScreen(Screen):
         button_layout.add_widget(logout_button)
         
         # Add all elements to layouts
-        self.dashboard_layout.add_widget(self.stats_layout)
+        self.dashboard_layout.add_widget(self.user_info_label)
         self.dashboard_layout.add_widget(self.progress_label)
         self.dashboard_layout.add_widget(self.progress_container)
         self.dashboard_layout.add_widget(self.stats_box)
@@ -145,6 +213,20 @@ class DashboardScreen(Screen):
         
         self.add_widget(self.main_layout)
     
+    def _make_stats_label(self, height):
+        """Left-aligned multi-line markup Label for one stats section"""
+        label = Label(
+            markup=True,
+            color=(0.2, 0.2, 0.2, 1),
+            halign='left',
+            valign='middle',
+            line_height=1.4,
+            size_hint_y=None,
+            height=height
+        )
+        label.bind(size=label.setter('text_size'))
+        return label
+    
     def update_rect(self, instance, value):
         self.rect.pos = instance.pos
         self.rect.size = instance.size
@@ -153,10 +235,20 @@ class DashboardScreen(Screen):
         self.stats_rect.pos = instance.pos
         self.stats_rect.size = instance.size
     
-    def update_for_user(self, user):
-        """Update dashboard with user data"""
+    def update_for_user(self, user, progress_data=None):
+        """
+        Update dashboard with user data
+        
+        Args:
+            user: User dict
+            progress_data: The user's game progress if already loaded (e.g. at login);
+                fetched from DBManager when None
+        """
         if not user:
             return
+        
+        # Called from the login flow before the screen is entered
+        self._ensure_ui()
             
         self.user = user
         
@@ -164,57 +256,51 @@ class DashboardScreen(Screen):
         self.title_label.text = f"Welcome, {user['username']}"
         
         # Update user info
-        self.username_label.text = user['username']
-        self.email_label.text = user['email']
-        self.created_label.text = str(user.get('created_at', 'N/A'))
-        self.last_login_label.text = str(user.get('last_login', 'N/A'))
+        self.user_info_label.text = _USER_INFO_TEMPLATE.format(
+            username=escape_markup(user['username']),
+            email=escape_markup(user['email']),
+            created=escape_markup(str(user.get('created_at', 'N/A'))),
+            last_login=escape_markup(str(user.get('last_login', 'N/A')))
+        )
         
         # Get user progress
-        progress_data = DBManager.get_user_progress(user['id'])
-        
-        # Clear existing progress items
-        self.progress_container.clear_widgets()
+        if progress_data is None:
+            progress_data = DBManager.get_user_progress(user['id'])
         
         if progress_data:
             # Show progress for each saved character/doctor
-            for progress in progress_data:
-                progress_box = BoxLayout(orientation='vertical', size_hint_y=None, height=dp(100), padding=dp(10))
-                with progress_box.canvas.before:
-                    Color(0.9, 0.95, 1, 1)  # Light blue
-                    Rectangle(pos=progress_box.pos, size=progress_box.size)
-                
-                progress_box.add_widget(Label(
-                    text=f"Specialization: {progress.get('current_specialization', 'General')}",
-                    color=(0, 0, 0, 1),
-                    bold=True
-                ))
-                
-                details_grid = GridLayout(cols=2, spacing=dp(5))
-                details_grid.add_widget(Label(text="Level:", color=(0, 0, 0, 1), size_hint_x=0.4, halign='right'))
-                details_grid.add_widget(Label(text=str(progress.get('level', 1)), color=(0, 0, 0, 1), size_hint_x=0.6, halign='left'))
-                
-                details_grid.add_widget(Label(text="Score:", color=(0, 0, 0, 1), size_hint_x=0.4, halign='right'))
-                details_grid.add_widget(Label(text=str(progress.get('score', 0)), color=(0, 0, 0, 1), size_hint_x=0.6, halign='left'))
-                
-                details_grid.add_widget(Label(text="Cases Completed:", color=(0, 0, 0, 1), size_hint_x=0.4, halign='right'))
-                details_grid.add_widget(Label(text=str(progress.get('completed_cases', 0)), color=(0, 0, 0, 1), size_hint_x=0.6, halign='left'))
-                
-                progress_box.add_widget(details_grid)
-                self.progress_container.add_widget(progress_box)
-                
-                # Update the global stats
-                self.patients_treated_label.text = str(progress.get('completed_cases', 0))
-                self.level_label.text = str(progress.get('level', 1))
-                self.score_label.text = str(progress.get('score', 0))
+            rows = [
+                {
+                    'specialization': str(progress.get('current_specialization', 'General')),
+                    'level': str(progress.get('level', 1)),
+                    'score': str(progress.get('score', 0)),
+                    'completed_cases': str(progress.get('completed_cases', 0))
+                }
+                for progress in progress_data
+            ]
+            # Reassigning data refreshes every row view, so only do it when a value changed
+            if rows != self.progress_view.data:
+                self.progress_view.data = rows
+            self._show_progress_widget(self.progress_view)
+            
+            # Update the global stats from the last saved game
+            latest = progress_data[-1]
+            self.game_stats.update(
+                patients_treated=str(latest.get('completed_cases', 0)),
+                level=str(latest.get('level', 1)),
+                score=str(latest.get('score', 0))
+            )
+            self.game_stats_label.text = _GAME_STATS_TEMPLATE.format(**self.game_stats)
         else:
             # No progress yet
-            no_progress = Label(
-                text="No game progress yet. Start playing to see your statistics!",
-                color=(0.2, 0.2, 0.2, 1),
-                size_hint_y=None,
-                height=dp(40)
-            )
-            self.progress_container.add_widget(no_progress)
+            self.progress_view.data = []
+            self._show_progress_widget(self.no_progress_label)
+    
+    def _show_progress_widget(self, widget):
+        """Put the rows or the empty message in the progress container, if not already there"""
+        if widget.parent is not self.progress_container:
+            self.progress_container.clear_widgets()
+            self.progress_container.add_widget(widget)
     
     def continue_game(self, instance):
         """Continue the game from where the user left off"""
@@ -223,7 +309,7 @@ class DashboardScreen(Screen):
     
     def logout(self, instance):
         """Log out the user"""
-        app = self.get_root_window().children[0]
+        app = App.get_running_app()
         app.current_user = None
         
         self.manager.transition.direction = 'right'
@@ -5,10 +5,31 @@ from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
-from kivy.uix.scrollview import ScrollView
-from kivy.uix.gridlayout import GridLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
 from kivy.app import App
 from kivy.metrics import dp
+from kivy.properties import StringProperty, ObjectProperty
+
+from utils.db_manager import invalidate_user_progress
+
+
+class DiagnosisButton(Button):
+    """A selectable diagnosis; RecycleView view class, reused as the list changes"""
+    
+    diagnosis = StringProperty('')
+    callback = ObjectProperty(None, allownone=True)
+    
+    def __init__(self, **kwargs):
+        kwargs.setdefault('size_hint_y', None)
+        kwargs.setdefault('height', dp(50))
+        kwargs.setdefault('background_color', (0.2, 0.6, 0.8, 1))
+        super(DiagnosisButton, self).__init__(**kwargs)
+    
+    def on_press(self):
+        if self.callback:
+            self.callback(self)
+
 
 class DiagnosisScreen(Screen):
     def __init__(self, **kwargs):
@@ -28,17 +49,19 @@ class DiagnosisScreen(Screen):
         )
         layout.add_widget(title)
         
-        # Scrollable area for diagnoses
-        scroll = ScrollView()
-        self.diagnoses_grid = GridLayout(
-            cols=1,
+        # Scrollable list of diagnoses; only the visible buttons exist, recycled as it scrolls
+        self.diagnoses_view = RecycleView(viewclass=DiagnosisButton)
+        diagnoses_layout = RecycleBoxLayout(
+            orientation='vertical',
             spacing=10,
-            size_hint_y=None,
-            padding=10
+            padding=10,
+            default_size_hint=(1, None),
+            default_size=(None, dp(50)),
+            size_hint_y=None
         )
-        self.diagnoses_grid.bind(minimum_height=self.diagnoses_grid.setter('height'))
-        scroll.add_widget(self.diagnoses_grid)
-        layout.add_widget(scroll)
+        diagnoses_layout.bind(minimum_height=diagnoses_layout.setter('height'))
+        self.diagnoses_view.add_widget(diagnoses_layout)
+        layout.add_widget(self.diagnoses_view)
         
         # Back button
         back_btn = Button(
@@ -51,28 +74,36 @@ class DiagnosisScreen(Screen):
         layout.add_widget(back_btn)
         
         self.add_widget(layout)
+        
+        # Key (patient, tests performed, symptoms) of the list currently shown
+        self._diagnoses_key = None
+    
+    def invalidate_diagnoses(self):
+        """Forget the shown list so the next update_diagnoses rebuilds it"""
+        self._diagnoses_key = None
     
     def update_diagnoses(self):
         """Update the list of possible diagnoses"""
-        self.diagnoses_grid.clear_widgets()
-        
         app = App.get_running_app()
-        if not app.game_state.current_patient:
+        patient = app.game_state.current_patient
+        if not patient:
+            self.diagnoses_view.data = []
+            self._diagnoses_key = None
             return
         
+        # The candidates only change with the patient, their tests and their symptoms
+        key = (patient, len(patient.tests_performed), tuple(patient.current_symptoms))
+        if key == self._diagnoses_key:
+            return
+        self._diagnoses_key = key
+        
         # Get possible diagnoses based on symptoms and tests
         possible_diagnoses = app.game_state.get_possible_diagnoses()
         
-        for diagnosis in possible_diagnoses:
-            btn = Button(
-                text=diagnosis,
-                size_hint_y=None,
-                height=dp(50),
-                background_color=(0.2, 0.6, 0.8, 1)
-            )
-            btn.diagnosis = diagnosis
-            btn.bind(on_press=self.make_diagnosis)
-            self.diagnoses_grid.add_widget(btn)
+        self.diagnoses_view.data = [
+            {'text': diagnosis, 'diagnosis': diagnosis, 'callback': self.make_diagnosis}
+            for diagnosis in possible_diagnoses
+        ]
     
     def make_diagnosis(self, instance):
         """Make the selected diagnosis"""
@@ -171,6 +202,13 @@ class DiagnosisResultsScreen(Screen):
         app.game_state.complete_current_case()
         app.game_state.load_random_patient()
         
+        # The finished case changes the user's progress; let the dashboard re-read it
+        if getattr(app, 'current_user', None):
+            invalidate_user_progress(app.current_user['id'])
+        
+        # The diagnosis list belongs to the previous patient
+        self.manager.get_screen('diagnosis').invalidate_diagnoses()
+        
         # Update patient screen and return to it
         patient_screen = self.manager.get_screen('patient')
         patient_screen.update_patient_data()
@@ -146,21 +146,21 @@ class LoginScreen(Screen):
             self.status_label.text = "Username and password are required"
             return
         
-        # Authenticate user
-        user = DBManager.authenticate_user(username, password)
+        # Authenticate user, loading their progress in the same query
+        user, progress = DBManager.authenticate_and_load(username, password)
         
         if user:
             # Login successful
             app = App.get_running_app()
             app.current_user = user
             
-            # The authenticate_user method already updates last login time
+            # The authenticate_and_load method already updates last login time
             
             # Update the main menu screen
             self.manager.get_screen('main_menu').update_for_logged_user(user)
             
             # Go to dashboard
-            self.manager.get_screen('dashboard').update_for_user(user)
+            self.manager.get_screen('dashboard').update_for_user(user, progress)
             self.manager.transition.direction = 'left'
             self.manager.current = 'dashboard'
         else:
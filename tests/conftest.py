@@ -0,0 +1,8 @@
+"""
+Shared pytest setup
+"""
+import os
+
+# utils.db_manager connects when it is imported; point it at a private in-memory
+# SQLite database so the tests never touch the configured one
+os.environ['DATABASE_URL'] = 'sqlite://'
@@ -0,0 +1,197 @@
+"""
+Tests for the vectorized Cohort simulation in models.patient
+"""
+import numpy as np
+import pytest
+
+from models.patient import Patient, VitalSigns, Cohort, seed_rng
+
+# Copies of each template simulated per comparison; enough that the sample means
+# of the scalar and vectorized paths agree well inside the tolerances below
+N_COPIES = 4000
+
+VITAL_NAMES = ('pulse', 'systolic_bp', 'diastolic_bp', 'temperature', 'respiratory_rate', 'oxygen_saturation')
+
+# Patient templates chosen so every branch of every treatment is taken by at least one of them
+TEMPLATES = {
+    'cardiac_emergency': dict(symptoms=['Chest Pain', 'Shortness of Breath', 'Cough', 'Fever', 'Headache'],
+                              pulse=110, systolic_bp=160, diastolic_bp=100, temperature=38.5,
+                              respiratory_rate=24, oxygen_saturation=88, severity=9),
+    'low_pressure': dict(symptoms=['Dizziness', 'Pain'],
+                         pulse=75, systolic_bp=100, diastolic_bp=65, temperature=36.8,
+                         respiratory_rate=16, oxygen_saturation=97, severity=4),
+    'hypoxic': dict(symptoms=['Shortness of Breath', 'Abdominal Pain'],
+                    pulse=92, systolic_bp=135, diastolic_bp=88, temperature=37.9,
+                    respiratory_rate=22, oxygen_saturation=82, severity=7),
+    'stable': dict(symptoms=[],
+                   pulse=72, systolic_bp=100, diastolic_bp=70, temperature=36.6,
+                   respiratory_rate=14, oxygen_saturation=98, severity=2),
+}
+
+# Treatments with a vectorized Cohort kernel
+VECTORIZED_TREATMENTS = ("Pain Relief", "Antibiotics", "Beta-blockers", "ACE Inhibitors",
+                         "Oxygen Therapy", "IV Fluids", "Defibrillation", "Intubation")
+
+
+def make_patient(symptoms, systolic_bp=120, diastolic_bp=80, severity=5, pulse=80, oxygen_saturation=98,
+                 temperature=36.6, respiratory_rate=16):
+    """Build a patient with the given symptoms and vitals."""
+    vitals = VitalSigns(pulse=pulse, systolic_bp=systolic_bp, diastolic_bp=diastolic_bp,
+                        temperature=temperature, respiratory_rate=respiratory_rate,
+                        oxygen_saturation=oxygen_saturation)
+    return Patient('P1', 'Test Patient', 50, 'F', [], list(symptoms), vitals, None, severity)
+
+
+def make_copies(template, n=N_COPIES):
+    """Build n identical patients from a template."""
+    return [make_patient(**TEMPLATES[template]) for _ in range(n)]
+
+
+def summarize(patients, changes):
+    """Mean severity change, (mean, min, max) of vitals/severity and symptom frequencies of a group of patients."""
+    columns = {name: [getattr(p.vital_signs, name) for p in patients] for name in VITAL_NAMES}
+    columns['severity'] = [p.condition_severity for p in patients]
+    vitals = {name: (np.mean(values), min(values), max(values)) for name, values in columns.items()}
+    names = {s for p in patients for s in p.current_symptoms}
+    symptoms = {name: np.mean([name in p.current_symptoms for p in patients]) for name in names}
+    return np.mean(changes), set(np.unique(changes).tolist()), vitals, symptoms
+
+
+def assert_vitals_match(cohort_vitals, scalar_vitals):
+    """Compare the vital summaries of the vectorized and scalar paths."""
+    for name, (mean, low, high) in scalar_vitals.items():
+        cohort_mean, cohort_low, cohort_high = cohort_vitals[name]
+        assert cohort_mean == pytest.approx(mean, abs=0.5), name
+        assert cohort_low == pytest.approx(low, abs=0.05), name
+        assert cohort_high == pytest.approx(high, abs=0.05), name
+
+
+def assert_matches_scalar(template, treatment):
+    """Apply a treatment through Cohort and through Patient.apply_treatment and compare the outcomes."""
+    seed_rng(1)
+    scalar_patients = make_copies(template)
+    scalar_changes = [p.apply_treatment(treatment)['severity_change'] for p in scalar_patients]
+
+    cohort_patients = make_copies(template)
+    cohort = Cohort(cohort_patients, seed=1)
+    cohort_changes = cohort.apply_treatment(treatment)
+    cohort.write_back()
+
+    scalar_mean, scalar_values, scalar_vitals, scalar_symptoms = summarize(scalar_patients, scalar_changes)
+    cohort_mean, cohort_values, cohort_vitals, cohort_symptoms = summarize(cohort_patients, cohort_changes)
+
+    assert cohort_values == scalar_values
+    assert cohort_mean == pytest.approx(scalar_mean, abs=0.05)
+    assert_vitals_match(cohort_vitals, scalar_vitals)
+    assert cohort_symptoms.keys() == scalar_symptoms.keys()
+    for name, frequency in scalar_symptoms.items():
+        assert cohort_symptoms[name] == pytest.approx(frequency, abs=0.05), name
+
+
+@pytest.mark.parametrize('template', sorted(TEMPLATES))
+@pytest.mark.parametrize('treatment', VECTORIZED_TREATMENTS)
+def test_kernel_matches_scalar_treatment(treatment, template):
+    assert_matches_scalar(template, treatment)
+
+
+def test_unknown_treatment_falls_back_to_patients():
+    seed_rng(1)
+    patients = make_copies('hypoxic', n=50)
+    cohort = Cohort(patients, seed=1)
+
+    changes = cohort.apply_treatment("Mystery")
+
+    assert set(changes.tolist()) <= {-1, 0}
+    assert all(p.treatments_applied[-1]['treatment'] == "Mystery" for p in patients)
+    # The cohort reloads the state the per-patient handlers left behind
+    assert cohort.severity.tolist() == [p.condition_severity for p in patients]
+    assert cohort.pulse.tolist() == [p.vital_signs.pulse for p in patients]
+
+
+@pytest.mark.parametrize('change', (-2, 1))
+def test_update_condition_matches_scalar(change):
+    seed_rng(1)
+    scalar_patients = make_copies('cardiac_emergency')
+    for patient in scalar_patients:
+        patient.update_condition(change)
+
+    cohort_patients = make_copies('cardiac_emergency')
+    cohort = Cohort(cohort_patients, seed=1)
+    cohort.update_condition(np.full(cohort.size, change, dtype=np.int8))
+    cohort.write_back()
+
+    _, _, scalar_vitals, _ = summarize(scalar_patients, [change])
+    _, _, cohort_vitals, _ = summarize(cohort_patients, [change])
+    assert_vitals_match(cohort_vitals, scalar_vitals)
+
+
+def test_update_condition_clamps_severity():
+    patients = [make_patient([], severity=1), make_patient([], severity=10)]
+    cohort = Cohort(patients, seed=0)
+
+    cohort.update_condition(np.array([-3, 3], dtype=np.int8))
+
+    assert cohort.severity.tolist() == [1, 10]
+
+
+def test_write_back_copies_state_and_keeps_symptom_order():
+    patients = [make_patient(['Headache', 'Cough']), make_patient(['Fever'])]
+    cohort = Cohort(patients, seed=0)
+    cohort.pulse[:] = (101, 55)
+    cohort.temperature[:] = (38.2, 36.9)
+    cohort.severity[:] = (7, 3)
+    cohort.symptoms[0, cohort._symptom_index['Headache']] = False
+    dizziness = cohort._symptom_column('Dizziness')
+    cohort.symptoms[1, dizziness] = True
+
+    cohort.write_back()
+
+    assert [p.vital_signs.pulse for p in patients] == [101, 55]
+    assert [p.vital_signs.temperature for p in patients] == [38.2, 36.9]
+    assert [p.condition_severity for p in patients] == [7, 3]
+    assert patients[0].current_symptoms == ['Cough']
+    assert patients[1].current_symptoms == ['Fever', 'Dizziness']
+
+
+def test_ace_inhibitors_adds_dizziness_column_for_new_symptom():
+    # Normal blood pressure drops below 100 systolic, so every patient becomes hypotensive
+    patients = [make_patient(['Cough'], systolic_bp=100, diastolic_bp=70) for _ in range(3)]
+    cohort = Cohort(patients, seed=0)
+
+    changes = cohort.apply_treatment("ACE Inhibitors")
+
+    assert changes.tolist() == [1, 1, 1]
+    assert cohort.has_symptom('Dizziness').all()
+    cohort.write_back()
+    assert all(patient.current_symptoms == ['Cough', 'Dizziness'] for patient in patients)
+
+
+def test_is_critical_matches_scalar():
+    rng = np.random.default_rng(3)
+    patients = [make_patient([], pulse=int(rng.integers(40, 131)), systolic_bp=int(rng.integers(80, 191)),
+                             diastolic_bp=80, oxygen_saturation=int(rng.integers(85, 100)),
+                             severity=int(rng.integers(1, 11)))
+                for _ in range(2000)]
+    cohort = Cohort(patients, seed=0)
+
+    assert cohort.is_critical().tolist() == [patient.is_critical() for patient in patients]
+
+
+def test_is_critical_boundaries():
+    # Each range bound is inclusive on the non-critical side
+    patients = [make_patient([], pulse=50, systolic_bp=90, oxygen_saturation=90, severity=7),
+                make_patient([], pulse=120, systolic_bp=180, severity=7),
+                make_patient([], pulse=49, severity=1),
+                make_patient([], pulse=121, severity=1),
+                make_patient([], systolic_bp=89, severity=1),
+                make_patient([], systolic_bp=181, severity=1),
+                make_patient([], oxygen_saturation=89, severity=1),
+                make_patient([], severity=8)]
+    cohort = Cohort(patients, seed=0)
+
+    assert cohort.is_critical().tolist() == [False, False, True, True, True, True, True, True]
+    assert cohort.is_critical().tolist() == [patient.is_critical() for patient in patients]
+
+
+def test_every_named_treatment_has_a_kernel():
+    assert set(Cohort._TREATMENT_KERNELS) == set(Patient._TREATMENT_HANDLERS)
@@ -0,0 +1,149 @@
+"""
+Tests for user login and the game progress cache in utils.db_manager, run against in-memory SQLite
+"""
+import itertools
+
+import pytest
+
+from models.database_models import Doctor, GameProgress, User
+from utils import db_manager
+from utils.db_manager import DBManager, Session
+
+_user_numbers = itertools.count()
+
+
+@pytest.fixture
+def user():
+    """A freshly registered user, with the progress cache emptied."""
+    db_manager.invalidate_user_progress()
+    number = next(_user_numbers)
+    user = DBManager.register_user(f'user{number}', f'user{number}@example.com', 'secret')
+    yield user
+    db_manager.invalidate_user_progress()
+
+
+@pytest.fixture
+def doctor_id():
+    """Id of a doctor row to attach progress to."""
+    session = Session()
+    try:
+        doctor = Doctor(name='Dr. Test', specialization='Cardiology')
+        session.add(doctor)
+        session.commit()
+        return doctor.id
+    finally:
+        session.close()
+
+
+def set_score_behind_cache(user_id, score):
+    """Change a user's stored score without going through DBManager."""
+    session = Session()
+    try:
+        session.query(GameProgress).filter_by(user_id=user_id).update({'score': score})
+        session.commit()
+    finally:
+        session.close()
+
+
+def expire_cache_entry(user_id):
+    """Age a cached progress entry past the TTL."""
+    read_time, progress = db_manager._progress_cache[user_id]
+    db_manager._progress_cache[user_id] = (read_time - db_manager._PROGRESS_TTL - 1, progress)
+
+
+def test_get_user_progress_serves_repeat_reads_from_cache(user, doctor_id):
+    DBManager.save_game_progress(user['id'], doctor_id, {'score': 10})
+    assert DBManager.get_user_progress(user['id'])[0]['score'] == 10
+
+    set_score_behind_cache(user['id'], 20)
+
+    assert DBManager.get_user_progress(user['id'])[0]['score'] == 10
+
+
+def test_get_user_progress_rereads_after_expiry(user, doctor_id):
+    DBManager.save_game_progress(user['id'], doctor_id, {'score': 10})
+    DBManager.get_user_progress(user['id'])
+    set_score_behind_cache(user['id'], 20)
+
+    expire_cache_entry(user['id'])
+
+    assert DBManager.get_user_progress(user['id'])[0]['score'] == 20
+
+
+def test_save_game_progress_invalidates_cache(user, doctor_id):
+    DBManager.save_game_progress(user['id'], doctor_id, {'score': 10})
+    DBManager.get_user_progress(user['id'])
+    assert user['id'] in db_manager._progress_cache
+
+    DBManager.save_game_progress(user['id'], doctor_id, {'score': 30})
+
+    assert user['id'] not in db_manager._progress_cache
+    assert DBManager.get_user_progress(user['id'])[0]['score'] == 30
+
+
+def test_invalidate_user_progress(user, doctor_id):
+    DBManager.save_game_progress(user['id'], doctor_id, {'score': 10})
+    DBManager.get_user_progress(user['id'])
+    set_score_behind_cache(user['id'], 40)
+
+    db_manager.invalidate_user_progress(user['id'])
+
+    assert DBManager.get_user_progress(user['id'])[0]['score'] == 40
+
+
+def test_get_user_progress_returns_independent_copies(user, doctor_id):
+    DBManager.save_game_progress(user['id'], doctor_id, {'score': 10, 'unlocked_tests': ['ECG/EKG']})
+    progress = DBManager.get_user_progress(user['id'])
+
+    progress[0]['score'] = 99
+    progress[0]['unlocked_tests'].append('CT Scan')
+    progress.append({})
+
+    cached = DBManager.get_user_progress(user['id'])
+    assert len(cached) == 1
+    assert cached[0]['score'] == 10
+    assert cached[0]['unlocked_tests'] == ['ECG/EKG']
+
+
+def test_authenticate_and_load_returns_user_and_progress(user, doctor_id):
+    DBManager.save_game_progress(user['id'], doctor_id, {'score': 10, 'unlocked_tests': ['ECG/EKG']})
+
+    user_data, progress = DBManager.authenticate_and_load(user['username'], 'secret')
+
+    assert user_data['id'] == user['id']
+    assert user_data['last_login'] is not None
+    assert [(p['user_id'], p['doctor_id'], p['score'], p['unlocked_tests']) for p in progress] == [
+        (user['id'], doctor_id, 10, ['ECG/EKG'])]
+
+
+def test_authenticate_and_load_accepts_email(user):
+    user_data, progress = DBManager.authenticate_and_load(user['email'], 'secret')
+
+    assert user_data['username'] == user['username']
+    assert progress == []
+
+
+def test_authenticate_and_load_records_last_login(user):
+    DBManager.authenticate_and_load(user['username'], 'secret')
+
+    session = Session()
+    try:
+        assert session.get(User, user['id']).last_login is not None
+    finally:
+        session.close()
+
+
+@pytest.mark.parametrize('login, password', (('nobody', 'secret'), (None, 'wrong')))
+def test_authenticate_and_load_rejects_bad_credentials(user, login, password):
+    assert DBManager.authenticate_and_load(login or user['username'], password) == (None, [])
+    assert user['id'] not in db_manager._progress_cache
+
+
+def test_authenticate_and_load_seeds_progress_cache(user, doctor_id):
+    DBManager.save_game_progress(user['id'], doctor_id, {'score': 10})
+    _, progress = DBManager.authenticate_and_load(user['username'], 'secret')
+    set_score_behind_cache(user['id'], 20)
+
+    # Served from the entry stored at login, and independent of the list it returned
+    progress[0]['score'] = 99
+    assert DBManager.get_user_progress(user['id'])[0]['score'] == 10
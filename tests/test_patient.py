@@ -0,0 +1,139 @@
+"""
+Tests for the Patient model in models.patient
+"""
+from models.patient import Patient, VitalSigns, seed_rng, _symptom_mask
+
+
+def make_patient(symptoms, severity=5):
+    """Build a patient with the given symptoms and default vitals."""
+    return Patient('P1', 'Test Patient', 50, 'F', [], list(symptoms), VitalSigns(), None, severity)
+
+
+def assert_sidecars_in_sync(patient):
+    """The symptom set and bitmask must describe the same symptoms as the list."""
+    assert patient._symptom_set == set(patient.current_symptoms)
+    assert patient._symptom_mask == _symptom_mask(patient.current_symptoms)
+
+
+def test_symptom_sidecars_follow_setter():
+    patient = make_patient(['Cough', 'Fever'])
+    assert_sidecars_in_sync(patient)
+
+    patient.current_symptoms = ['Headache']
+    assert_sidecars_in_sync(patient)
+
+    patient.current_symptoms = []
+    assert patient._symptom_mask == 0
+
+
+def test_symptom_sidecars_follow_add_and_remove():
+    patient = make_patient(['Cough'])
+
+    patient.add_symptom('Fever')
+    patient.add_symptom('Fever')
+    assert patient.current_symptoms == ['Cough', 'Fever']
+    assert_sidecars_in_sync(patient)
+
+    patient.remove_symptom('Cough')
+    patient.remove_symptom('Not Present')
+    assert patient.current_symptoms == ['Fever']
+    assert_sidecars_in_sync(patient)
+
+
+def test_symptom_sidecars_keep_duplicates_until_last_removed():
+    patient = make_patient(['Cough', 'Cough'])
+
+    patient.remove_symptom('Cough')
+    assert patient.current_symptoms == ['Cough']
+    assert_sidecars_in_sync(patient)
+
+    patient.remove_symptom('Cough')
+    assert_sidecars_in_sync(patient)
+    assert patient._symptom_mask == 0
+
+
+def test_symptom_sidecars_follow_pain_relief():
+    patient = make_patient(['Headache', 'Chest Pain', 'Pain', 'Cough'])
+
+    result = patient.apply_treatment("Pain Relief")
+
+    assert patient.current_symptoms == ['Chest Pain', 'Cough']
+    assert_sidecars_in_sync(patient)
+    assert "Chest pain partially relieved but not eliminated" in result['effects']
+
+
+def test_symptom_masks_drive_treatment_groups():
+    seed_rng(0)
+    no_targets = make_patient(['Dizziness'])
+    assert no_targets.apply_treatment("Antibiotics")['severity_change'] == 0
+
+    seed_rng(0)
+    targets = make_patient(['Cough'])
+    assert targets.apply_treatment("Antibiotics")['severity_change'] in (-2, -1)
+
+
+# Enough symptoms and severity that the abnormal chance of the blood test reaches 1
+ABNORMAL_FILLER = ['Nausea', 'Dizziness', 'Rash', 'Chills', 'Insomnia']
+
+
+def test_batch_basic_blood_test_empty():
+    assert Patient.batch_basic_blood_test([]) == []
+
+
+def test_batch_basic_blood_test_result_shape():
+    seed_rng(0)
+    patients = [make_patient(['Cough']), make_patient([])]
+
+    results = Patient.batch_basic_blood_test(patients)
+
+    assert len(results) == 2
+    for patient, result in zip(patients, results):
+        assert result['success'] is True
+        assert result['message'] == "Test 'Basic Blood Test' performed successfully."
+        assert set(result['details']) == {'wbc', 'rbc', 'hemoglobin', 'platelets', 'glucose'}
+        assert set(result['full_results']) == {'WBC', 'RBC', 'Hemoglobin', 'Platelets', 'Glucose'}
+        assert patient.tests_performed[-1]['test'] == "Basic Blood Test"
+
+
+def test_batch_basic_blood_test_flags_out_of_range_values():
+    seed_rng(0)
+    patients = [make_patient(symptoms) for symptoms in (['Cough'], ['Fatigue'], []) for _ in range(200)]
+
+    for result in Patient.batch_basic_blood_test(patients):
+        flagged = False
+        for data in result['full_results'].values():
+            low, high = map(float, data['reference_range'].split('-'))
+            assert data['abnormal'] == (not low <= data['value'] <= high)
+            if data['abnormal']:
+                assert data['direction'] == ('low' if data['value'] < low else 'high')
+                flagged = True
+        if flagged:
+            assert result['is_abnormal'] is True
+            assert result['interpretation'].startswith("Abnormal blood test results: ")
+
+
+def test_batch_basic_blood_test_symptom_driven_conditions():
+    seed_rng(0)
+    infected = [make_patient(['Cough'] + ABNORMAL_FILLER, severity=10) for _ in range(50)]
+    anemic = [make_patient(['Fatigue'] + ABNORMAL_FILLER, severity=10) for _ in range(50)]
+
+    results = Patient.batch_basic_blood_test(infected + anemic)
+
+    for result in results[:50]:
+        assert result['full_results']['WBC']['direction'] == 'high'
+        assert "Consider infection workup." in result['recommendations']
+    for result in results[50:]:
+        assert result['full_results']['Hemoglobin']['direction'] == 'low'
+        assert result['full_results']['RBC']['direction'] == 'low'
+        assert "Evaluate for anemia or blood loss." in result['recommendations']
+
+
+def test_batch_basic_blood_test_is_reproducible():
+    patients = [make_patient(['Cough']), make_patient(['Headache'])]
+
+    seed_rng(5)
+    first = Patient.batch_basic_blood_test(patients)
+    seed_rng(5)
+    second = Patient.batch_basic_blood_test(patients)
+
+    assert first == second
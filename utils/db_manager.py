@@ -4,10 +4,12 @@ Uses SQLAlchemy to interact with the PostgreSQL database
 """
 
 import os
+import copy
 import json
+import time
 from datetime import datetime
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker, scoped_session, joinedload
 from sqlalchemy.pool import NullPool
 from models.database_models import Base, Patient, TestResult, ImagingResult, TreatmentRecord, Doctor, MedicalCondition, User, GameProgress, Medication, MedicationRecord
 from models.patient import Patient as PatientModel, VitalSigns
@@ -24,15 +26,56 @@ if DATABASE_URL and 'neon.tech' in DATABASE_URL:
     engine = create_engine(DATABASE_URL, poolclass=NullPool, echo=False)
 else:
     # Fallback for other database connections
-    engine = create_engine(DATABASE_URL or 'sqlite:///data/medical_data.db', poolclass=NullPool, echo=False)
+    database_url = DATABASE_URL or 'sqlite:///data/medical_data.db'
+    if database_url.startswith('sqlite'):
+        # Keep the default pool so the per-connection PRAGMAs below survive between sessions
+        engine = create_engine(database_url, echo=False)
+    else:
+        engine = create_engine(database_url, poolclass=NullPool, echo=False)
+
+if engine.dialect.name == 'sqlite':
+    @event.listens_for(engine, 'connect')
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Tune every new SQLite connection: WAL journal, 64 MB page cache, in-memory temp tables, 256 MB mmap"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
 
 # Create session factory
 session_factory = sessionmaker(bind=engine)
 Session = scoped_session(session_factory)
 
+# Recently read game progress: user_id -> (monotonic read time, progress list).
+# Entries expire after _PROGRESS_TTL seconds and are dropped whenever progress is saved
+_PROGRESS_TTL = 30.0
+_progress_cache = {}
+
+def invalidate_user_progress(user_id=None):
+    """
+    Drop cached game progress so the next read goes to the database
+    
+    Args:
+        user_id: User whose entry to drop; None clears the whole cache
+    """
+    if user_id is None:
+        _progress_cache.clear()
+    else:
+        _progress_cache.pop(user_id, None)
+
+def _copy_progress(progress):
+    """Return a copy of cached progress records that callers can modify freely"""
+    return copy.deepcopy(progress)
+
 def init_db():
     """Initialize the database with tables"""
     Base.metadata.create_all(engine)
+    # create_all skips indexes of tables that already exist, so add new ones explicitly
+    for index in GameProgress.__table__.indexes:
+        index.create(engine, checkfirst=True)
     print("Database initialized with all tables")
 
 class DBManager:
@@ -463,34 +506,37 @@ class DBManager:
         """
         try:
             session = Session()
-            count = 0
+            diagnoses = diagnosis_catalog.get_all_diagnoses()
             
-            # Get all diagnoses from catalog
-            for diagnosis in diagnosis_catalog.get_all_diagnoses():
-                # Check if condition already exists
-                db_condition = session.query(MedicalCondition).filter_by(name=diagnosis.name).first()
-                
-                import json
+            # Fetch all existing conditions in one query instead of one per diagnosis
+            existing = {
+                condition.name: condition
+                for condition in session.query(MedicalCondition).filter(
+                    MedicalCondition.name.in_([d.name for d in diagnoses])
+                )
+            }
+            
+            new_conditions = []
+            for diagnosis in diagnoses:
+                fields = dict(
+                    description=diagnosis.description,
+                    symptoms=json.dumps(diagnosis.primary_symptoms + diagnosis.secondary_symptoms),
+                    recommended_tests=json.dumps(diagnosis.recommended_tests),
+                    recommended_treatments=json.dumps(diagnosis.recommended_treatments),
+                    severity=diagnosis.severity
+                )
+                db_condition = existing.get(diagnosis.name)
                 
                 if db_condition:
                     # Update existing condition
-                    db_condition.description = diagnosis.description
-                    db_condition.symptoms = json.dumps(diagnosis.primary_symptoms + diagnosis.secondary_symptoms)
-                    db_condition.recommended_tests = json.dumps(diagnosis.recommended_tests)
-                    db_condition.recommended_treatments = json.dumps(diagnosis.recommended_treatments)
-                    db_condition.severity = diagnosis.severity
+                    for key, value in fields.items():
+                        setattr(db_condition, key, value)
                 else:
-                    # Create new condition
-                    db_condition = MedicalCondition(
-                        name=diagnosis.name,
-                        description=diagnosis.description,
-                        symptoms=json.dumps(diagnosis.primary_symptoms + diagnosis.secondary_symptoms),
-                        recommended_tests=json.dumps(diagnosis.recommended_tests),
-                        recommended_treatments=json.dumps(diagnosis.recommended_treatments),
-                        severity=diagnosis.severity
-                    )
-                    session.add(db_condition)
-                    count += 1
+                    # Queue new condition for a single batched insert
+                    new_conditions.append(MedicalCondition(name=diagnosis.name, **fields))
+            
+            session.add_all(new_conditions)
+            count = len(new_conditions)
             
             session.commit()
             return count
@@ -631,6 +677,58 @@ class DBManager:
             if 'session' in locals():
                 session.close()
     
+    @staticmethod
+    def authenticate_and_load(username_or_email, password):
+        """
+        Authenticate a user and load their game progress in the same round trip
+        
+        The user row and its progress rows come back from one joined query, and the
+        last-login update is committed in the same session. The progress is also
+        stored in the progress cache, so the dashboard does not query it again.
+        
+        Args:
+            username_or_email: Username or email
+            password: Plain text password
+            
+        Returns:
+            Tuple of (user dict, list of game progress dicts); (None, []) if
+            authentication failed
+        """
+        try:
+            session = Session()
+            
+            # Find user by username or email, with their progress joined in
+            user = session.query(User).options(joinedload(User.game_progress)).filter(
+                (User.username == username_or_email) | (User.email == username_or_email)
+            ).first()
+            
+            if not user:
+                print(f"User not found: {username_or_email}")
+                return None, []
+                
+            # Check password
+            if not user.check_password(str(password)):
+                print("Invalid password")
+                return None, []
+            
+            # Update last login time; serialize before commit expires the loaded rows
+            user.last_login = datetime.now()
+            user_data = user.to_dict()
+            progress = [record.to_dict() for record in user.game_progress]
+            session.commit()
+            
+            _progress_cache[user_data['id']] = (time.monotonic(), progress)
+            print(f"User {user_data['username']} authenticated successfully")
+            return user_data, _copy_progress(progress)
+        except Exception as e:
+            print(f"Error authenticating user: {e}")
+            if 'session' in locals():
+                session.rollback()
+            return None, []
+        finally:
+            if 'session' in locals():
+                session.close()
+    
     @staticmethod
     def update_last_login(user_id):
         """
@@ -704,12 +802,18 @@ class DBManager:
         Returns:
             List of game progress objects
         """
+        cached = _progress_cache.get(user_id)
+        if cached is not None and time.monotonic() - cached[0] < _PROGRESS_TTL:
+            return _copy_progress(cached[1])
+        
         try:
             session = Session()
             
             progress_records = session.query(GameProgress).filter_by(user_id=user_id).all()
             
-            return [progress.to_dict() for progress in progress_records]
+            progress = [progress.to_dict() for progress in progress_records]
+            _progress_cache[user_id] = (time.monotonic(), progress)
+            return _copy_progress(progress)
         except Exception as e:
             print(f"Error getting user progress: {e}")
             return []
@@ -779,6 +883,7 @@ class DBManager:
                 session.add(new_progress)
                 
             session.commit()
+            invalidate_user_progress(user_id)
             print(f"Game progress saved for user {user_id}")
             return True
         except Exception as e:
@@ -813,7 +918,7 @@ def get_specializations():
             catalog = MedicationCatalog()
             
             # Add all medications to the database
-            for med in catalog.get_all_medications():
+            for med in catalog.iter_medications():
                 db_med = Medication(
                     name=med.name,
                     category=med.category,
@@ -828,7 +933,7 @@ def get_specializations():
                 session.add(db_med)
             
             session.commit()
-            print(f"Added {len(catalog.get_all_medications())} medications to database")
+            print(f"Added {len(catalog.iter_medications())} medications to database")
             
         except Exception as e:
             print(f"Error initializing medications: {e}")
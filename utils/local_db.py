@@ -4,7 +4,7 @@ Local SQLite database configuration for VirtualDoctor
 import os
 import json
 from datetime import datetime
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, scoped_session
 from models.database_models import Base, Patient, TestResult, ImagingResult, TreatmentRecord, Doctor, MedicalCondition, User, GameProgress, Medication, MedicationRecord
 
@@ -14,6 +14,16 @@ DATABASE_URL = "sqlite:///virtualdoctor.db"
 # Create SQLite engine
 engine = create_engine(DATABASE_URL)
 
+@event.listens_for(engine, 'connect')
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune every new SQLite connection: WAL journal, 64 MB page cache, in-memory temp tables"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
 # Create session factory
 session_factory = sessionmaker(bind=engine)
 Session = scoped_session(session_factory)
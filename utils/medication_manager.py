@@ -56,7 +56,7 @@ class MedicationManager:
             catalog = MedicationCatalog()
             
             # Add all medications to the database
-            for med in catalog.get_all_medications():
+            for med in catalog.iter_medications():
                 db_med = Medication(
                     name=med.name,
                     category=med.category,
@@ -71,7 +71,7 @@ class MedicationManager:
                 session.add(db_med)
             
             session.commit()
-            print(f"Added {len(catalog.get_all_medications())} medications to database")
+            print(f"Added {len(catalog.iter_medications())} medications to database")
             
         except Exception as e:
             print(f"Error initializing medications: {e}")
@@ -5,27 +5,22 @@ A medical simulation game with graphical interface
 import os
 import sys
 from kivy.app import App
-from kivy.uix.screenmanager import ScreenManager, Screen
+from kivy.uix.screenmanager import ScreenManager, Screen, SlideTransition
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.label import Label
 from kivy.uix.button import Button
 from kivy.uix.image import Image
-from kivy.graphics import Color, Rectangle
+from kivy.graphics import Color, Rectangle, InstructionGroup
 from kivy.core.window import Window
 from kivy.metrics import dp
+from kivy.properties import StringProperty
 
 # Make sure local modules can be imported
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-# Import our screens and game state
-from screens.login_screen import LoginScreen
-from screens.register_screen import RegisterScreen
-from screens.dashboard_screen import DashboardScreen
-from screens.test_screens import TestsScreen, TestResultsScreen
-from screens.treatment_screens import TreatmentsScreen, TreatmentResultsScreen
-from screens.diagnosis_screens import DiagnosisScreen, DiagnosisResultsScreen
-from screens.medications_screen import MedicationsScreen
+# Import game state; screen modules are imported lazily on first navigation
+import importlib
 from utils.game_state import GameState
 
 # Import the local database
@@ -35,16 +30,81 @@ from models.database_models import Base
 # Initialize the local database
 init_db()
 
-class MainMenuScreen(Screen):
+
+def add_background(widget, rgba):
+    """
+    Add a solid background to a widget as one InstructionGroup
+    
+    The group is added to canvas.before exactly once; callers only move and
+    resize the returned Rectangle afterwards, so no instructions pile up.
+    
+    Returns:
+        The background Rectangle
+    """
+    rect = Rectangle(size=widget.size, pos=widget.pos)
+    group = InstructionGroup()
+    group.add(Color(*rgba))
+    group.add(rect)
+    widget.canvas.before.add(group)
+    return rect
+
+
+# Secondary screens: name -> (module, class). A module of None means this file.
+_LAZY_SCREENS = {
+    'about': (None, 'AboutScreen'),
+    'specialization': (None, 'SpecializationScreen'),
+    'patient': (None, 'PatientScreen'),
+    'login': ('screens.login_screen', 'LoginScreen'),
+    'register': ('screens.register_screen', 'RegisterScreen'),
+    'dashboard': ('screens.dashboard_screen', 'DashboardScreen'),
+    'tests': ('screens.test_screens', 'TestsScreen'),
+    'test_results': ('screens.test_screens', 'TestResultsScreen'),
+    'treatments': ('screens.treatment_screens', 'TreatmentsScreen'),
+    'treatment_results': ('screens.treatment_screens', 'TreatmentResultsScreen'),
+    'diagnosis': ('screens.diagnosis_screens', 'DiagnosisScreen'),
+    'diagnosis_results': ('screens.diagnosis_screens', 'DiagnosisResultsScreen'),
+    'medications': ('screens.medications_screen', 'MedicationsScreen'),
+}
+
+
+def _load_screen(name):
+    """Import and instantiate a secondary screen by name"""
+    module_name, class_name = _LAZY_SCREENS[name]
+    namespace = globals() if module_name is None else vars(importlib.import_module(module_name))
+    return namespace[class_name](name=name)
+
+
+class LazyScreenManager(ScreenManager):
+    """ScreenManager that builds secondary screens the first time they are requested"""
+    def get_screen(self, name):
+        if name in _LAZY_SCREENS and name not in self.screen_names:
+            self.add_widget(_load_screen(name))
+        return super(LazyScreenManager, self).get_screen(name)
+
+
+class CachedScreen(Screen):
+    """Screen that remembers the running app and sibling screen lookups"""
+    def __init__(self, **kwargs):
+        super(CachedScreen, self).__init__(**kwargs)
+        self.app = App.get_running_app()
+        self._screen_cache = {}
+    
+    def _get(self, name):
+        """Return a sibling screen by name, looking it up only once"""
+        screen = self._screen_cache.get(name)
+        if screen is None:
+            screen = self._screen_cache[name] = self.manager.get_screen(name)
+        return screen
+
+
+class MainMenuScreen(CachedScreen):
     def __init__(self, **kwargs):
         super(MainMenuScreen, self).__init__(**kwargs)
         self.name = 'main_menu'
         
         # Create a layout with a background color
         self.layout = BoxLayout(orientation='vertical', padding=20, spacing=15)
-        with self.layout.canvas.before:
-            Color(0.1, 0.1, 0.3, 1)  # Dark blue background
-            self.rect = Rectangle(size=self.layout.size, pos=self.layout.pos)
+        self.rect = add_background(self.layout, (0.1, 0.1, 0.3, 1))  # Dark blue background
         self.layout.bind(size=self.update_rect, pos=self.update_rect)
         
         # Add a title
@@ -88,7 +148,7 @@ class MainMenuScreen(Screen):
             size_hint=(1, 0.25),
             background_color=(0.3, 0.5, 0.9, 1)  # Blue
         )
-        self.login_btn.bind(on_release=self.go_to_login)
+        self.login_btn.bind(on_release=self.go_to_login_or_dashboard)
         self.button_layout.add_widget(self.login_btn)
         
         # About button
@@ -129,21 +189,28 @@ class MainMenuScreen(Screen):
     
     def go_to_specialization(self, instance):
         """Go to specialization selection screen"""
-        app = App.get_running_app()
+        app = self.app
         
         if app.current_user:
             # If user is logged in, load their data
             app.game_state.set_current_user(app.current_user)
-            self.manager.get_screen('specialization').reset()
+            self._get('specialization').reset()
             self.manager.transition.direction = 'left'
             self.manager.current = 'specialization'
         else:
             # Start without login
             app.game_state.reset_game()
-            self.manager.get_screen('specialization').reset()
+            self._get('specialization').reset()
             self.manager.transition.direction = 'left'
             self.manager.current = 'specialization'
     
+    def go_to_login_or_dashboard(self, instance):
+        """Go to the dashboard when a user is logged in, otherwise to login"""
+        if self.app.current_user:
+            self.go_to_dashboard(instance)
+        else:
+            self.go_to_login(instance)
+    
     def go_to_login(self, instance):
         """Go to login screen"""
         self.manager.transition.direction = 'left'
@@ -156,7 +223,7 @@ class MainMenuScreen(Screen):
     
     def quit_app(self, instance):
         """Quit the application"""
-        App.get_running_app().stop()
+        self.app.stop()
     
     def update_for_logged_user(self, user):
         """Update the UI when a user is logged in"""
@@ -166,14 +233,10 @@ class MainMenuScreen(Screen):
             self.user_info.text = f'Logged in as: {username}'
             self.login_btn.text = 'Dashboard'
             self.login_btn.background_color = (0.3, 0.7, 0.5, 1)  # Teal
-            self.login_btn.unbind(on_release=self.go_to_login)
-            self.login_btn.bind(on_release=self.go_to_dashboard)
         else:
             self.user_info.text = 'Not logged in'
             self.login_btn.text = 'Login'
             self.login_btn.background_color = (0.3, 0.5, 0.9, 1)  # Blue
-            self.login_btn.unbind(on_release=self.go_to_dashboard)
-            self.login_btn.bind(on_release=self.go_to_login)
     
     def go_to_dashboard(self, instance):
         """Go to user dashboard"""
@@ -188,9 +251,7 @@ class AboutScreen(Screen):
         
         # Main layout
         self.layout = BoxLayout(orientation='vertical', padding=20, spacing=15)
-        with self.layout.canvas.before:
-            Color(0.1, 0.1, 0.3, 1)  # Dark blue background
-            self.rect = Rectangle(size=self.layout.size, pos=self.layout.pos)
+        self.rect = add_background(self.layout, (0.1, 0.1, 0.3, 1))  # Dark blue background
         self.layout.bind(size=self.update_rect, pos=self.update_rect)
         
         # Add a title
@@ -247,17 +308,25 @@ class AboutScreen(Screen):
 
 from kivy_doctor import VirtualDoctorApp
 
-class SpecializationScreen(Screen):
+# Specializations offered on the selection screen
+_SPECIALIZATIONS = (
+    {'name': 'Cardiology', 'description': 'Heart and circulatory system'},
+    {'name': 'Neurology', 'description': 'Brain and nervous system'},
+    {'name': 'Pulmonology', 'description': 'Lungs and respiratory system'},
+    {'name': 'Gastroenterology', 'description': 'Digestive system'},
+    {'name': 'Orthopedics', 'description': 'Bones and joints'},
+    {'name': 'Emergency Medicine', 'description': 'Acute care'}
+)
+
+class SpecializationScreen(CachedScreen):
     def __init__(self, **kwargs):
         super(SpecializationScreen, self).__init__(**kwargs)
         self.name = 'specialization'
-        self.game_state = App.get_running_app().game_state
+        self.game_state = self.app.game_state
         
         # Main layout
         self.layout = BoxLayout(orientation='vertical', padding=20, spacing=15)
-        with self.layout.canvas.before:
-            Color(0.1, 0.1, 0.3, 1)  # Dark blue background
-            self.rect = Rectangle(size=self.layout.size, pos=self.layout.pos)
+        self.rect = add_background(self.layout, (0.1, 0.1, 0.3, 1))  # Dark blue background
         self.layout.bind(size=self.update_rect, pos=self.update_rect)
         
         # Title
@@ -270,12 +339,17 @@ class SpecializationScreen(Screen):
         self.layout.add_widget(self.title)
         
         # Specialization grid
+        # Forced cell sizes let the grid lay out in one pass without measuring children;
+        # they are derived from the grid's own size and recomputed whenever it changes
         self.specialization_grid = GridLayout(
             cols=2,
             spacing=10,
             padding=10,
-            size_hint=(1, 0.7)
+            size_hint=(1, 0.7),
+            row_force_default=True,
+            col_force_default=True
         )
+        self.specialization_grid.bind(size=self._fit_specialization_cells)
         self.layout.add_widget(self.specialization_grid)
         
         # Back button
@@ -297,22 +371,18 @@ class SpecializationScreen(Screen):
         self.rect.pos = instance.pos
         self.rect.size = instance.size
     
+    def _fit_specialization_cells(self, grid, size):
+        """Split the grid's area evenly between its columns and rows"""
+        width, height = size
+        pad_left, pad_top, pad_right, pad_bottom = grid.padding
+        spacing_x, spacing_y = grid.spacing
+        rows = -(-len(_SPECIALIZATIONS) // grid.cols)
+        grid.col_default_width = max(0, (width - pad_left - pad_right - spacing_x * (grid.cols - 1)) / grid.cols)
+        grid.row_default_height = max(0, (height - pad_top - pad_bottom - spacing_y * (rows - 1)) / rows)
+    
     def populate_specializations(self):
-        """Populate the specialization grid with buttons"""
-        # Clear existing buttons
-        self.specialization_grid.clear_widgets()
-        
-        # Add specialization buttons
-        specializations = [
-            {'name': 'Cardiology', 'description': 'Heart and circulatory system'},
-            {'name': 'Neurology', 'description': 'Brain and nervous system'},
-            {'name': 'Pulmonology', 'description': 'Lungs and respiratory system'},
-            {'name': 'Gastroenterology', 'description': 'Digestive system'},
-            {'name': 'Orthopedics', 'description': 'Bones and joints'},
-            {'name': 'Emergency Medicine', 'description': 'Acute care'}
-        ]
-        
-        for spec in specializations:
+        """Populate the specialization grid with buttons (called once from __init__)"""
+        for spec in _SPECIALIZATIONS:
             # Create a box for each specialization
             box = BoxLayout(orientation='vertical')
             
@@ -349,7 +419,7 @@ class SpecializationScreen(Screen):
             # Go to patient screen
             self.manager.transition.direction = 'left'
             self.manager.current = 'patient'
-            self.manager.get_screen('patient').update_patient_data()
+            self._get('patient').update_patient_data()
     
     def go_to_main(self, instance):
         """Go back to main menu"""
@@ -357,15 +427,38 @@ class SpecializationScreen(Screen):
         self.manager.current = 'main_menu'
     
     def reset(self):
-        """Reset the specialization screen"""
-        self.populate_specializations()
+        """Nothing to reset: the buttons are built once in __init__ and hold no state"""
+        pass
+
+
+# Condition text indexed by severity level
+_CONDITION_TEXT = ("Unknown", "Stable", "Fair", "Serious", "Critical")
+
+# Vitals panel text, filled from one tuple of vital sign values
+_VITALS_TEMPLATE = (
+    "Heart Rate: %s BPM\n"
+    "Blood Pressure: %s/%s mmHg\n"
+    "Temperature: %.1f°C\n"
+    "Respiratory Rate: %s breaths/min\n"
+    "O2 Saturation: %s%%"
+)
 
 
-class PatientScreen(Screen):
+class PatientScreen(CachedScreen):
+    # Display text for each label; a property only dispatches when its value
+    # actually changes, so unchanged labels skip their texture update
+    patient_name_text = StringProperty('')
+    patient_details_text = StringProperty('')
+    patient_history_text = StringProperty('')
+    vitals_text = StringProperty(
+        "Heart Rate: --\nBlood Pressure: --\nTemperature: --\nRespiratory Rate: --\nO2 Saturation: --"
+    )
+    symptoms_text = StringProperty('')
+    
     def __init__(self, **kwargs):
         super(PatientScreen, self).__init__(**kwargs)
         self.name = 'patient'
-        self.game_state = App.get_running_app().game_state
+        self.game_state = self.app.game_state
         
         # Main layout
         layout = BoxLayout(orientation='vertical', spacing=10, padding=10)
@@ -377,16 +470,18 @@ class PatientScreen(Screen):
         self.patient_info = BoxLayout(orientation='vertical', size_hint_x=0.5)
         #Updated colotr
         # self.patient_name = Label(font_size=20, halign='left', valign='top', text_size=(Window.width/2 - dp(20), None), color=(0.2, 0.2, 0.2, 1))
-        self.patient_name = Label(font_size=10, halign='left', valign='top', text_size=(Window.width/2 - dp(20), None), color=(0, 0, 0, 1))
+        info_width = Window.width / 2 - dp(20)
+        self.patient_name = Label(font_size=10, halign='left', valign='top', text_size=(info_width, None), color=(0, 0, 0, 1))
 
         self.patient_info.add_widget(self.patient_name)
         # Updated color
-        self.patient_details = Label(font_size=14, halign='left', valign='top', text_size=(Window.width/2 - dp(20), None), color=(0, 0, 0, 1))
+        self.patient_details = Label(font_size=14, halign='left', valign='top', text_size=(info_width, None), color=(0, 0, 0, 1))
         self.patient_info.add_widget(self.patient_details)
         #Updated color of history
         #self.patient_history = Label(font_size=14, halign='left', valign='top', text_size=(Window.width/2 - dp(20), None), color=(0.2, 0.2, 0.2, 1))
-        self.patient_history = Label(font_size=14, halign='left', valign='top', text_size=(Window.width/2 - dp(20), None), color=(0, 0, 0, 1))
+        self.patient_history = Label(font_size=14, halign='left', valign='top', text_size=(info_width, None), color=(0, 0, 0, 1))
         self.patient_info.add_widget(self.patient_history)
+        Window.bind(on_resize=self._on_resize)
         
         top_panel.add_widget(self.patient_info)
         
@@ -395,20 +490,17 @@ class PatientScreen(Screen):
         vitals_title = Label(text="Vital Signs", font_size=18, size_hint_y=0.2, color=(0.2, 0.2, 0.2, 1))
         vitals_panel.add_widget(vitals_title)
         
-        vitals_grid = GridLayout(cols=2, size_hint_y=0.8)
-        
-        # Create labels for vital signs
-        vital_signs = ["Heart Rate", "Blood Pressure", "Temperature", "Respiratory Rate", "O2 Saturation"]
-        self.vital_labels = {}
-        
-        for vital in vital_signs:
-            name_label = Label(text=vital, halign='left', font_size=14, color=(0.2, 0.2, 0.2, 1))
-            value_label = Label(text="--", halign='left', font_size=14, color=(0.2, 0.2, 0.2, 1))
-            vitals_grid.add_widget(name_label)
-            vitals_grid.add_widget(value_label)
-            self.vital_labels[vital] = value_label
-        
-        vitals_panel.add_widget(vitals_grid)
+        # All vital signs share one multi-line label so an update renders a single texture
+        self.vitals_label = Label(
+            text=self.vitals_text,
+            halign='left',
+            valign='middle',
+            font_size=14,
+            size_hint_y=0.8,
+            color=(0.2, 0.2, 0.2, 1)
+        )
+        self.vitals_label.bind(size=self.vitals_label.setter('text_size'))
+        vitals_panel.add_widget(self.vitals_label)
         top_panel.add_widget(vitals_panel)
         
         layout.add_widget(top_panel)
@@ -477,72 +569,81 @@ class PatientScreen(Screen):
         layout.add_widget(bottom_panel)
         
         self.add_widget(layout)
+        
+        # Labels follow their text properties
+        self.bind(
+            patient_name_text=self.patient_name.setter('text'),
+            patient_details_text=self.patient_details.setter('text'),
+            patient_history_text=self.patient_history.setter('text'),
+            vitals_text=self.vitals_label.setter('text'),
+            symptoms_text=self.symptoms_label.setter('text')
+        )
     
     def update_patient_data(self):
         if not self.game_state.current_patient:
-            self.patient_name.text = "No patient loaded"
+            self.patient_name_text = "No patient loaded"
             return
         
         patient = self.game_state.current_patient
         
         # Update patient info
-        self.patient_name.text = f"Patient: {patient.name}"
-        self.patient_details.text = f"Age/Gender: {patient.age} years, {patient.gender}\nCondition: {self.get_condition_text(patient.condition_severity)}"
+        self.patient_name_text = f"Patient: {patient.name}"
+        self.patient_details_text = f"Age/Gender: {patient.age} years, {patient.gender}\nCondition: {self.get_condition_text(patient.condition_severity)}"
         
         history_text = "Medical History: "
         if patient.medical_history:
             history_text += ", ".join(patient.medical_history)
         else:
             history_text += "None"
-        self.patient_history.text = history_text
+        self.patient_history_text = history_text
         
         # Update vital signs
-        if patient.vital_signs:
-            self.vital_labels["Heart Rate"].text = f"{patient.vital_signs.pulse} BPM"
-            self.vital_labels["Blood Pressure"].text = f"{patient.vital_signs.systolic_bp}/{patient.vital_signs.diastolic_bp} mmHg"
-            self.vital_labels["Temperature"].text = f"{patient.vital_signs.temperature:.1f}°C"
-            self.vital_labels["Respiratory Rate"].text = f"{patient.vital_signs.respiratory_rate} breaths/min"
-            self.vital_labels["O2 Saturation"].text = f"{patient.vital_signs.oxygen_saturation}%"
+        vs = patient.vital_signs
+        if vs:
+            self.vitals_text = _VITALS_TEMPLATE % (
+                vs.pulse, vs.systolic_bp, vs.diastolic_bp,
+                vs.temperature, vs.respiratory_rate, vs.oxygen_saturation
+            )
         
         # Update symptoms
         if patient.current_symptoms:
-            self.symptoms_label.text = ", ".join(patient.current_symptoms)
+            self.symptoms_text = ", ".join(patient.current_symptoms)
         else:
-            self.symptoms_label.text = "No visible symptoms"
+            self.symptoms_text = "No visible symptoms"
+    
+    def _on_resize(self, window, width, height):
+        """Recompute the patient info wrap width once for all three labels"""
+        text_size = (width / 2 - dp(20), None)
+        self.patient_name.text_size = text_size
+        self.patient_details.text_size = text_size
+        self.patient_history.text_size = text_size
     
     def get_condition_text(self, severity):
-        if severity == 1:
-            return "Stable"
-        elif severity == 2:
-            return "Fair"
-        elif severity == 3:
-            return "Serious"
-        elif severity == 4:
-            return "Critical"
-        else:
-            return "Unknown"
+        if isinstance(severity, int) and 0 <= severity < len(_CONDITION_TEXT):
+            return _CONDITION_TEXT[severity]
+        return "Unknown"
     
     def show_tests(self, instance):
         if self.game_state.doctor and self.game_state.doctor.specialization:
             self.manager.transition.direction = 'left'
-            self.manager.get_screen('tests').update_tests()
+            self._get('tests').update_tests()
             self.manager.current = 'tests'
     
     def show_treatments(self, instance):
         if self.game_state.doctor and self.game_state.doctor.specialization:
             self.manager.transition.direction = 'left'
-            self.manager.get_screen('treatments').update_treatments()
+            self._get('treatments').update_treatments()
             self.manager.current = 'treatments'
     
     def show_medications(self, instance):
         if self.game_state.doctor and self.game_state.doctor.specialization:
             self.manager.transition.direction = 'left'
-            self.manager.get_screen('medications').update_for_patient()
+            self._get('medications').update_for_patient()
             self.manager.current = 'medications'
     
     def show_diagnosis(self, instance):
         self.manager.transition.direction = 'left'
-        self.manager.get_screen('diagnosis').update_diagnoses()
+        self._get('diagnosis').update_diagnoses()
         self.manager.current = 'diagnosis'
     
     def go_to_main(self, instance):
@@ -570,24 +671,11 @@ class VirtualDoctorApp(App):
         from utils.medication_manager import MedicationManager
         MedicationManager.initialize_medications()
     def build(self):
-        # Create the screen manager
-        sm = ScreenManager()
-        
-        # Add all screens with explicit names
+        # Create the screen manager; only the main menu is built up front,
+        # the rest are created by LazyScreenManager on first navigation
+        # Explicit short SlideTransition: no FBO-backed fade and fewer transition frames
+        sm = LazyScreenManager(transition=SlideTransition(duration=0.15))
         sm.add_widget(MainMenuScreen(name='main_menu'))
-        sm.add_widget(AboutScreen(name='about'))
-        sm.add_widget(SpecializationScreen(name='specialization'))
-        sm.add_widget(PatientScreen(name='patient'))
-        sm.add_widget(TestsScreen(name='tests'))
-        sm.add_widget(TestResultsScreen(name='test_results'))
-        sm.add_widget(TreatmentsScreen(name='treatments'))
-        sm.add_widget(TreatmentResultsScreen(name='treatment_results'))
-        sm.add_widget(DiagnosisScreen(name='diagnosis'))
-        sm.add_widget(DiagnosisResultsScreen(name='diagnosis_results'))
-        sm.add_widget(LoginScreen(name='login'))
-        sm.add_widget(RegisterScreen(name='register'))
-        sm.add_widget(DashboardScreen(name='dashboard'))
-        sm.add_widget(MedicationsScreen(name='medications'))
         
         # Store reference to screen manager
         self.screen_manager = sm